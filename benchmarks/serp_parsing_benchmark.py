@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Benchmark de Parsing de SERP
+Compara BeautifulSoup(html.parser) com lxml + XPaths pré-compilados sobre SERPs salvas
+e confirma que os resultados extraídos são idênticos
+
+Uso: python benchmarks/serp_parsing_benchmark.py [iterações]
+"""
+
+import os
+import sys
+import time
+
+# Adiciona src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.serp_parser import HAS_LXML, parse_serp
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+CASES = [
+    ('bing', 'bing_serp.html'),
+    ('duckduckgo', 'duckduckgo_serp.html')
+]
+
+def measure(engine: str, markup: bytes, use_lxml: bool, iterations: int):
+    """Retorna (resultados, parses por segundo)"""
+    results = parse_serp(engine, markup, max_results=10, validate=False, use_lxml=use_lxml)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse_serp(engine, markup, max_results=10, validate=False, use_lxml=use_lxml)
+    elapsed = time.perf_counter() - start
+    return results, iterations / elapsed
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    if not HAS_LXML:
+        print("❌ lxml não instalado - nada a comparar")
+        return 1
+
+    print("=" * 72)
+    print(f"🏁 PARSING DE SERP - {iterations} iterações por caso")
+    print("=" * 72)
+
+    all_identical = True
+    for engine, filename in CASES:
+        with open(os.path.join(FIXTURES, filename), 'rb') as f:
+            markup = f.read()
+
+        bs4_results, bs4_rate = measure(engine, markup, False, iterations)
+        lxml_results, lxml_rate = measure(engine, markup, True, iterations)
+        identical = bs4_results == lxml_results
+        all_identical = all_identical and identical
+
+        print(f"\n📄 {engine} ({len(markup) / 1024:.0f} KB, {len(lxml_results)} resultados)")
+        print(f"   BeautifulSoup/html.parser: {bs4_rate:8.1f} parses/s ({1000 / bs4_rate:6.2f} ms)")
+        print(f"   lxml + XPath compilado:    {lxml_rate:8.1f} parses/s ({1000 / lxml_rate:6.2f} ms)")
+        print(f"   Ganho: {lxml_rate / bs4_rate:.1f}x | Resultados idênticos: {'✅' if identical else '❌'}")
+
+        if not identical:
+            for old, new in zip(bs4_results, lxml_results):
+                if old != new:
+                    print(f"   ≠ antes: {old}\n     depois: {new}")
+
+    return 0 if all_identical else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
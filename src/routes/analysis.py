@@ -259,7 +259,7 @@ def get_analysis_status():
         
         # Status geral
         total_ai_available = len([p for p in ai_status.values() if p['available']])
-        total_search_available = len([p for p in search_status.values() if p['available']])
+        total_search_available = len([name for name, p in search_status.items() if name != 'cache' and p.get('enabled')])
         
         overall_status = "healthy" if (total_ai_available > 0 and total_search_available > 0 and db_status) else "degraded"
         
@@ -276,7 +276,7 @@ def get_analysis_status():
                 'search_providers': {
                     'status': 'healthy' if total_search_available > 0 else 'error',
                     'available_count': total_search_available,
-                    'total_count': len(search_status),
+                    'total_count': len([name for name in search_status if name != 'cache']),
                     'providers': search_status
                 },
                 'database': {
@@ -634,7 +634,7 @@ def get_stats():
             'search_providers': search_status,
             'system_health': {
                 'ai_available': len([p for p in ai_status.values() if p['available']]),
-                'search_available': len([p for p in search_status.values() if p['available']]),
+                'search_available': len([name for name, p in search_status.items() if name != 'cache' and p.get('enabled')]),
                 'database_connected': db_manager.test_connection()
             },
             'timestamp': datetime.now().isoformat()
@@ -31,6 +31,77 @@ def get_extractor_stats():
         }), 500
 
 
+@monitoring_bp.route('/api/ai_token_stats', methods=['GET'])
+def get_ai_token_stats():
+    """Retorna estatísticas de tokens gerados por tipo de tarefa de IA"""
+    try:
+        from services.ai_manager import ai_manager
+        return jsonify({
+            'success': True,
+            'token_stats': ai_manager.get_token_stats()
+        })
+    except Exception as e:
+        logger.error(f"❌ Erro ao obter estatísticas de tokens: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@monitoring_bp.route('/api/search_plan', methods=['POST'])
+def preview_search_plan():
+    """Mostra o plano de busca e o uso projetado de quota sem executar as buscas"""
+    try:
+        from services.production_search_manager import search_planner
+        from services.ultra_detailed_analysis_engine import ultra_detailed_analysis_engine
+
+        data = request.get_json() or {}
+        queries = data.get('queries') or ultra_detailed_analysis_engine._generate_expanded_intelligent_queries(data)
+        plan = search_planner.plan(queries, data.get('target_results'))
+
+        return jsonify({
+            'success': True,
+            'plan': plan.to_dict()
+        })
+    except Exception as e:
+        logger.error(f"❌ Erro ao planejar buscas: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@monitoring_bp.route('/api/cache_warming', methods=['GET', 'POST'])
+def cache_warming():
+    """Status do aquecimento de cache; POST antecipa a próxima verificação em background.
+
+    O ciclo roda na thread do aquecedor e só executa dentro da janela fora de pico e uma
+    vez por intervalo entre workers (a rota não força gasto de quota das APIs pagas).
+    """
+    try:
+        from services.cache_warmer import cache_warmer
+
+        if request.method == 'POST':
+            scheduled = cache_warmer.request_cycle()
+            return jsonify({
+                'success': True,
+                'scheduled': scheduled,
+                'off_peak_now': cache_warmer.is_off_peak()
+            }), 202 if scheduled else 200
+
+        return jsonify({
+            'success': True,
+            'cache_warming': cache_warmer.get_status(),
+            'popular_combinations': cache_warmer.popular_combinations()
+        })
+    except Exception as e:
+        logger.error(f"❌ Erro no aquecimento de cache: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @monitoring_bp.route('/api/test_extraction', methods=['GET'])
 def test_extraction():
     """Testa extração para uma URL específica"""
@@ -102,7 +173,7 @@ def health_check():
         # Verifica status de busca
         from services.production_search_manager import production_search_manager
         search_status = production_search_manager.get_provider_status()
-        available_search = sum(1 for provider in search_status.values() if provider.get('enabled', False))
+        available_search = sum(1 for name, provider in search_status.items() if name != 'cache' and provider.get('enabled', False))
         
         overall_health = 'healthy'
         if available_extractors == 0 or available_ai == 0:
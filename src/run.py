@@ -57,6 +57,7 @@ from routes.progress import progress_bp
 from routes.files import files_bp
 from services.production_search_manager import production_search_manager
 from services.production_content_extractor import production_content_extractor
+from services.cache_warmer import cache_warmer
 
 def create_app():
     """Cria e configura a aplicação Flask"""
@@ -104,6 +105,11 @@ def create_app():
         except ImportError:
             logger.warning("⚠️ Flask-Compress não instalado - compressão desabilitada")
 
+    # Aquecimento de cache: thread iniciada no worker (após o fork do gunicorn)
+    @app.before_request
+    def start_background_services():
+        cache_warmer.ensure_started()
+
     # Registra blueprints
     app.register_blueprint(analysis_bp, url_prefix='/api')
     app.register_blueprint(pdf_bp, url_prefix='/api')
@@ -9,8 +9,15 @@ import os
 import logging
 import time
 import json
+import threading
 from typing import Dict, List, Optional, Any
-import requests
+from services.token_budget_manager import token_budget_manager
+from services.http_pool import get_provider_session
+from services.huggingface_warmup import huggingface_warmup
+from services.provider_state import ProviderRegistry, ProviderState
+from services.structured_output import (
+    SchemaValidationError, parse_json_strict, parse_json_tolerant, validate_schema
+)
 
 # Imports condicionais para os clientes de IA
 try:
@@ -38,52 +45,25 @@ class AIManager:
 
     def __init__(self):
         """Inicializa o gerenciador de IAs"""
-        self.providers = {
-            'gemini': {
-                'client': None,
-                'available': False,
-                'priority': 1,
-                'error_count': 0,
-                'model': 'gemini-1.5-flash',
-                'max_errors': 2,
-                'last_success': None,
-                'consecutive_failures': 0
-            },
-            'groq': {
-                'client': None,
-                'available': False,
-                'priority': 2,
-                'error_count': 0,
-                'model': 'llama3-70b-8192',
-                'max_errors': 2,
-                'last_success': None,
-                'consecutive_failures': 0
-            },
-            'openai': {
-                'client': None,
-                'available': False,
-                'priority': 3,
-                'error_count': 0,
-                'model': 'gpt-3.5-turbo',
-                'max_errors': 2,
-                'last_success': None,
-                'consecutive_failures': 0
-            },
-            'huggingface': {
-                'client': None,
-                'available': False,
-                'priority': 4,
-                'error_count': 0,
-                'models': ["HuggingFaceH4/zephyr-7b-beta", "google/flan-t5-base"],
-                'current_model_index': 0,
-                'max_errors': 3,
-                'last_success': None,
-                'consecutive_failures': 0
-            }
-        }
+        self.providers = ProviderRegistry([
+            ProviderState('gemini', priority=1, max_errors=2, model='gemini-1.5-flash',
+                          max_output_tokens=8192, json_mode=True),
+            ProviderState('groq', priority=2, max_errors=2, model='llama3-70b-8192',
+                          max_output_tokens=8192, json_mode=True),
+            ProviderState('openai', priority=3, max_errors=2, model='gpt-3.5-turbo',
+                          max_output_tokens=4096, json_mode=True),
+            ProviderState('huggingface', priority=4, max_errors=3,
+                          models=["HuggingFaceH4/zephyr-7b-beta", "google/flan-t5-base"],
+                          max_output_tokens=1024, json_mode=False)
+        ], cooldown=float(os.getenv('AI_PROVIDER_COOLDOWN', 300)))
+
+        # Metadados da última chamada (tokens gerados / truncamento) por thread
+        self._call_meta = threading.local()
+        # Modo JSON recusado pelo SDK/modelo: parser tolerante por este tempo, depois tenta de novo
+        self.json_mode_cooldown = float(os.getenv('AI_JSON_MODE_COOLDOWN', 1800))
 
         self.initialize_providers()
-        available_count = len([p for p in self.providers.values() if p['available']])
+        available_count = len([p for p in self.providers.values() if p.available])
         logger.info(f"🤖 AI Manager inicializado com {available_count} provedores disponíveis.")
 
     def initialize_providers(self):
@@ -95,8 +75,7 @@ class AIManager:
                 gemini_key = os.getenv('GEMINI_API_KEY')
                 if gemini_key:
                     genai.configure(api_key=gemini_key)
-                    self.providers['gemini']['client'] = genai.GenerativeModel("gemini-1.5-flash")
-                    self.providers['gemini']['available'] = True
+                    self.providers['gemini'].configure(genai.GenerativeModel("gemini-1.5-flash"))
                     logger.info("✅ Gemini (gemini-1.5-flash) inicializado com sucesso")
             except Exception as e:
                 logger.warning(f"⚠️ Falha ao inicializar Gemini: {str(e)}")
@@ -108,8 +87,7 @@ class AIManager:
             try:
                 openai_key = os.getenv('OPENAI_API_KEY')
                 if openai_key:
-                    self.providers["openai"]["client"] = openai.OpenAI(api_key=openai_key)
-                    self.providers["openai"]["available"] = True
+                    self.providers["openai"].configure(openai.OpenAI(api_key=openai_key))
                     logger.info("✅ OpenAI (gpt-3.5-turbo) inicializado com sucesso")
             except Exception as e:
                 logger.warning(f"⚠️ Falha ao inicializar OpenAI: {str(e)}")
@@ -119,8 +97,7 @@ class AIManager:
         # Inicializa Groq
         try:
             if HAS_GROQ_CLIENT and groq_client and groq_client.is_enabled():
-                self.providers['groq']['client'] = groq_client
-                self.providers['groq']['available'] = True
+                self.providers['groq'].configure(groq_client)
                 logger.info("✅ Groq (llama3-70b-8192) inicializado com sucesso")
             else:
                 logger.warning("⚠️ Groq client não está habilitado")
@@ -131,66 +108,64 @@ class AIManager:
         try:
             hf_key = os.getenv('HUGGINGFACE_API_KEY')
             if hf_key:
-                self.providers['huggingface']['client'] = {
+                self.providers['huggingface'].configure({
                     'api_key': hf_key,
                     'base_url': 'https://api-inference.huggingface.co/models/'
-                }
-                self.providers['huggingface']['available'] = True
+                })
+
+                # Mantém os modelos configurados carregados em background
+                huggingface_warmup.configure(hf_key, self.providers['huggingface'].client['base_url'])
+                huggingface_warmup.register_models(self.providers['huggingface'].models)
+                huggingface_warmup.ensure_started()
                 logger.info("✅ HuggingFace inicializado com sucesso")
         except Exception as e:
             logger.warning(f"⚠️ Falha ao inicializar HuggingFace: {str(e)}")
 
-    def get_best_provider(self) -> Optional[str]:
-        """Retorna o melhor provedor disponível com base na prioridade e contagem de erros."""
-        current_time = time.time()
-        
-        # Primeiro, tenta reabilitar provedores que podem ter se recuperado
-        for name, provider in self.providers.items():
-            if (not provider['available'] and 
-                provider.get('last_success') and 
-                current_time - provider['last_success'] > 300):  # 5 minutos
-                logger.info(f"🔄 Tentando reabilitar provedor {name} após cooldown")
-                provider['error_count'] = 0
-                provider['consecutive_failures'] = 0
-                if name == 'gemini' and HAS_GEMINI:
-                    provider['available'] = True
-                elif name == 'groq' and HAS_GROQ_CLIENT:
-                    provider['available'] = True
-                elif name == 'openai' and HAS_OPENAI:
-                    provider['available'] = True
-                elif name == 'huggingface':
-                    provider['available'] = True
-        
-        available_providers = [
-            (name, provider) for name, provider in self.providers.items() 
-            if provider['available'] and provider['consecutive_failures'] < provider.get('max_errors', 2)
-        ]
+    def get_best_provider(self, exclude: Optional[List[str]] = None) -> Optional[str]:
+        """Retorna o melhor provedor disponível com base na prioridade e contagem de erros.
+
+        Lê o snapshot imutável de roteamento sem lock; só há escrita quando um provedor
+        em cooldown precisa ser reabilitado.
+        """
+        candidates = self.providers.routing_candidates(exclude)
 
-        if not available_providers:
+        if not candidates and not exclude:
             logger.warning("🔄 Nenhum provedor saudável disponível. Resetando contadores.")
-            for provider in self.providers.values():
-                provider['error_count'] = 0
-                provider['consecutive_failures'] = 0
-            available_providers = [(name, p) for name, p in self.providers.items() if p['available']]
+            self.providers.reset_all()
+            candidates = self.providers.routing_candidates()
 
-        if available_providers:
-            # Ordena por prioridade e falhas consecutivas
-            available_providers.sort(key=lambda x: (x[1]['priority'], x[1]['consecutive_failures']))
-            return available_providers[0][0]
+        for entry in candidates:
+            if entry.available or self.providers[entry.name].try_reenable(self.providers.cooldown):
+                return entry.name
 
         return None
 
-    def generate_analysis(self, prompt: str, max_tokens: int = 8192, provider: Optional[str] = None) -> Optional[str]:
-        """Gera análise usando um provedor específico ou o melhor disponível com fallback."""
+    def generate_analysis(
+        self,
+        prompt: str,
+        max_tokens: int = 8192,
+        provider: Optional[str] = None,
+        task_type: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """Gera análise usando um provedor específico ou o melhor disponível com fallback.
+
+        Quando task_type é informado, max_tokens passa a ser o teto e o orçamento efetivo
+        vem do histórico de saída da tarefa (com retry ampliado em caso de truncamento).
+
+        Quando response_schema é informado (use {} para apenas JSON), a saída estruturada é
+        solicitada no modo JSON nativo do provedor, validada contra o schema e retornada como
+        JSON normalizado. Saída inválida conta como falha do provedor e aciona o fallback.
+        """
         
         start_time = time.time()
         
         # Se um provedor específico for solicitado
         if provider:
-            if self.providers.get(provider) and self.providers[provider]['available']:
+            if self.providers.get(provider) and self.providers[provider].available:
                 logger.info(f"🤖 Usando provedor solicitado: {provider.upper()}")
                 try:
-                    result = self._call_provider(provider, prompt, max_tokens)
+                    result = self._call_with_budget(provider, prompt, max_tokens, task_type, response_schema)
                     if result:
                         self._record_success(provider)
                         return result
@@ -210,7 +185,7 @@ class AIManager:
             raise Exception("❌ NENHUM PROVEDOR DE IA DISPONÍVEL: Configure pelo menos uma API de IA (Gemini, Groq, OpenAI ou HuggingFace)")
 
         try:
-            result = self._call_provider(provider_name, prompt, max_tokens)
+            result = self._call_with_budget(provider_name, prompt, max_tokens, task_type, response_schema)
             if result:
                 self._record_success(provider_name)
                 return result
@@ -219,7 +194,9 @@ class AIManager:
         except Exception as e:
             logger.error(f"❌ Erro no provedor {provider_name}: {e}")
             self._record_failure(provider_name, str(e))
-            return self._try_fallback(prompt, max_tokens, exclude=[provider_name])
+            return self._try_fallback(
+                prompt, max_tokens, exclude=[provider_name], task_type=task_type, response_schema=response_schema
+            )
     
     def generate_parallel_analysis(self, prompts: List[Dict[str, Any]], max_tokens: int = 8192) -> Dict[str, Any]:
         """Gera múltiplas análises em paralelo usando diferentes provedores"""
@@ -240,7 +217,9 @@ class AIManager:
                     self.generate_analysis, 
                     prompt_text, 
                     max_tokens, 
-                    preferred_provider
+                    preferred_provider,
+                    prompt_data.get('task_type', prompt_id),
+                    prompt_data.get('response_schema')
                 )
                 future_to_prompt[future] = prompt_id
             
@@ -266,94 +245,235 @@ class AIManager:
     def _record_success(self, provider_name: str):
         """Registra sucesso do provedor"""
         if provider_name in self.providers:
-            self.providers[provider_name]['consecutive_failures'] = 0
-            self.providers[provider_name]['last_success'] = time.time()
+            self.providers[provider_name].record_success()
             logger.info(f"✅ Sucesso registrado para {provider_name}")
     
     def _record_failure(self, provider_name: str, error_msg: str):
         """Registra falha do provedor"""
         if provider_name in self.providers:
-            self.providers[provider_name]['error_count'] += 1
-            self.providers[provider_name]['consecutive_failures'] += 1
-            
-            # Desabilita temporariamente se muitas falhas consecutivas
-            if self.providers[provider_name]['consecutive_failures'] >= self.providers[provider_name]['max_errors']:
-                logger.warning(f"⚠️ Desabilitando {provider_name} temporariamente após {self.providers[provider_name]['consecutive_failures']} falhas consecutivas")
-                self.providers[provider_name]['available'] = False
+            provider = self.providers[provider_name]
+            if provider.record_failure():
+                # Desabilita temporariamente se muitas falhas consecutivas
+                logger.warning(f"⚠️ Desabilitando {provider_name} temporariamente após {provider.consecutive_failures} falhas consecutivas")
             
             logger.error(f"❌ Falha registrada para {provider_name}: {error_msg}")
 
-    def _call_provider(self, provider_name: str, prompt: str, max_tokens: int) -> Optional[str]:
+    def _call_with_budget(
+        self,
+        provider_name: str,
+        prompt: str,
+        max_tokens: int,
+        task_type: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """Chama o provedor com orçamento adaptativo e retry ampliado em caso de truncamento."""
+        json_mode = response_schema is not None and self.providers[provider_name].json_mode
+
+        if not task_type:
+            result = self._call_provider(provider_name, prompt, max_tokens, json_mode)
+            return self._finalize_output(provider_name, result, response_schema, json_mode)
+
+        # O teto efetivo respeita o limite de saída do provedor
+        ceiling = min(max_tokens, self.providers[provider_name].max_output_tokens)
+        budget = token_budget_manager.get_budget(task_type, ceiling, provider_name)
+
+        while True:
+            self._call_meta.output_tokens = None
+            self._call_meta.truncated = False
+
+            result = self._call_provider(provider_name, prompt, budget, json_mode)
+
+            output_tokens = getattr(self._call_meta, 'output_tokens', None)
+            if output_tokens is None:
+                output_tokens = token_budget_manager.estimate_tokens(result)
+            truncated = bool(getattr(self._call_meta, 'truncated', False))
+
+            next_budget = token_budget_manager.next_budget(budget, ceiling) if truncated else None
+            if next_budget:
+                logger.warning(f"✂️ Resposta truncada ({task_type}, {provider_name}) com {budget} tokens - tentando novamente com {next_budget}")
+                token_budget_manager.record_retry(task_type, provider_name)
+                budget = next_budget
+                continue
+
+            token_budget_manager.record_output(task_type, output_tokens, budget, truncated, provider_name)
+            return self._finalize_output(provider_name, result, response_schema, json_mode)
+
+    def _finalize_output(
+        self,
+        provider_name: str,
+        result: Optional[str],
+        response_schema: Optional[Dict[str, Any]],
+        json_mode: bool
+    ) -> Optional[str]:
+        """Valida saída estruturada: parse estrito no modo JSON nativo, tolerante nos demais."""
+        if response_schema is None or not result:
+            return result
+
+        # A chamada pode ter caído para JSON só pelo prompt (parâmetro de modo JSON recusado)
+        if json_mode and not getattr(self._call_meta, 'json_fallback', False):
+            try:
+                parsed = parse_json_strict(result)
+            except ValueError as e:
+                raise Exception(f"JSON inválido no modo nativo de {provider_name}: {e}")
+        else:
+            parsed = parse_json_tolerant(result)
+            if parsed is None:
+                raise Exception(f"Não foi possível extrair JSON da resposta de {provider_name}")
+
+        errors = validate_schema(parsed, response_schema)
+        if errors:
+            raise SchemaValidationError(errors)
+
+        return json.dumps(parsed, ensure_ascii=False)
+
+    def _set_call_meta(self, output_tokens: Optional[int], truncated: bool):
+        """Registra metadados da chamada corrente (thread-local)"""
+        self._call_meta.output_tokens = output_tokens
+        self._call_meta.truncated = truncated
+
+    def _call_provider(self, provider_name: str, prompt: str, max_tokens: int, json_mode: bool = False) -> Optional[str]:
         """Chama a função de geração do provedor especificado."""
+        self._call_meta.json_fallback = False
         if provider_name == 'gemini':
-            return self._generate_with_gemini(prompt, max_tokens)
+            return self._generate_with_gemini(prompt, max_tokens, json_mode)
         elif provider_name == 'groq':
-            return self._generate_with_groq(prompt, max_tokens)
+            return self._generate_with_groq(prompt, max_tokens, json_mode)
         elif provider_name == 'openai':
-            return self._generate_with_openai(prompt, max_tokens)
+            return self._generate_with_openai(prompt, max_tokens, json_mode)
         elif provider_name == 'huggingface':
             return self._generate_with_huggingface(prompt, max_tokens)
         return None
 
-    def _generate_with_gemini(self, prompt: str, max_tokens: int) -> Optional[str]:
+    def _generate_with_gemini(self, prompt: str, max_tokens: int, json_mode: bool = False) -> Optional[str]:
         """Gera conteúdo usando Gemini."""
-        client = self.providers['gemini']['client']
+        client = self.providers['gemini'].client
         config = {"temperature": 0.7, "max_output_tokens": min(max_tokens, 8192)}
+        if json_mode:
+            config["response_mime_type"] = "application/json"
         safety = [
             {"category": c, "threshold": "BLOCK_NONE"} 
             for c in ["HARM_CATEGORY_HARASSMENT", "HARM_CATEGORY_HATE_SPEECH", "HARM_CATEGORY_SEXUALLY_EXPLICIT", "HARM_CATEGORY_DANGEROUS_CONTENT"]
         ]
-        response = client.generate_content(prompt, generation_config=config, safety_settings=safety)
+        try:
+            response = client.generate_content(prompt, generation_config=config, safety_settings=safety)
+        except Exception as e:
+            # Versões antigas do SDK (ou o modelo) não aceitam response_mime_type
+            if not json_mode or not self._rejects_json_param(e, 'response_mime_type'):
+                raise
+            return self._fallback_without_json_mode('gemini', e, self._generate_with_gemini, prompt, max_tokens)
+
+        finish_reason = None
+        if getattr(response, 'candidates', None):
+            finish_reason = getattr(response.candidates[0], 'finish_reason', None)
+        usage = getattr(response, 'usage_metadata', None)
+        self._set_call_meta(
+            getattr(usage, 'candidates_token_count', None) if usage else None,
+            getattr(finish_reason, 'name', str(finish_reason)) == 'MAX_TOKENS'
+        )
+
         if response.text:
             logger.info(f"✅ Gemini gerou {len(response.text)} caracteres")
             return response.text
         raise Exception("Resposta vazia do Gemini")
 
-    def _generate_with_groq(self, prompt: str, max_tokens: int) -> Optional[str]:
+    def _generate_with_groq(self, prompt: str, max_tokens: int, json_mode: bool = False) -> Optional[str]:
         """Gera conteúdo usando Groq."""
-        client = self.providers['groq']['client']
-        content = client.generate(prompt, max_tokens=min(max_tokens, 8192))
+        client = self.providers['groq'].client
+        try:
+            generation = client.generate_with_metadata(prompt, max_tokens=min(max_tokens, 8192), json_mode=json_mode)
+        except Exception as e:
+            # SDK ou modelo sem response_format json_object (400 da API ou TypeError do SDK)
+            if not json_mode or not self._rejects_json_param(e, 'response_format'):
+                raise
+            return self._fallback_without_json_mode('groq', e, self._generate_with_groq, prompt, max_tokens)
+        content = generation['content']
+        self._set_call_meta(generation.get('output_tokens'), generation.get('finish_reason') == 'length')
         if content:
             logger.info(f"✅ Groq gerou {len(content)} caracteres")
             return content
         raise Exception("Resposta vazia do Groq")
 
-    def _generate_with_openai(self, prompt: str, max_tokens: int) -> Optional[str]:
+    @staticmethod
+    def _rejects_json_param(error: Exception, param: str) -> bool:
+        """O erro recusa o parâmetro de modo JSON em si (e não o prompt, o tamanho do
+        contexto ou uma geração que saiu com JSON inválido)"""
+        message = str(error)
+        return param in message and 'json_validate_failed' not in message
+
+    def _fallback_without_json_mode(self, provider_name: str, error: Exception, generate, prompt: str,
+                                    max_tokens: int) -> Optional[str]:
+        """Refaz a chamada com JSON só pelo prompt (parser tolerante em _finalize_output) e
+        suspende o modo JSON nativo do provedor por json_mode_cooldown segundos"""
+        logger.warning(f"⚠️ {provider_name} recusou o modo JSON ({error}) - usando parser tolerante")
+        self.providers[provider_name].disable_json_mode(self.json_mode_cooldown)
+        result = generate(prompt, max_tokens, json_mode=False)
+        self._call_meta.json_fallback = True
+        return result
+
+    def _generate_with_openai(self, prompt: str, max_tokens: int, json_mode: bool = False) -> Optional[str]:
         """Gera conteúdo usando OpenAI."""
-        client = self.providers['openai']['client']
+        client = self.providers['openai'].client
+        system_prompt = "Você é um especialista em análise de mercado ultra-detalhada."
+        extra_args = {}
+        if json_mode:
+            # O modo JSON da OpenAI exige menção explícita a JSON nas mensagens
+            system_prompt += " Responda apenas com um objeto JSON válido."
+            extra_args['response_format'] = {"type": "json_object"}
         response = client.chat.completions.create(
-            model=self.providers['openai']['model'],
+            model=self.providers['openai'].model,
             messages=[
-                {"role": "system", "content": "Você é um especialista em análise de mercado ultra-detalhada."},
+                {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=min(max_tokens, 4096),
-            temperature=0.7
+            temperature=0.7,
+            **extra_args
         )
         content = response.choices[0].message.content
+        usage = getattr(response, 'usage', None)
+        self._set_call_meta(
+            getattr(usage, 'completion_tokens', None) if usage else None,
+            response.choices[0].finish_reason == 'length'
+        )
         if content:
             logger.info(f"✅ OpenAI gerou {len(content)} caracteres")
             return content
         raise Exception("Resposta vazia do OpenAI")
 
     def _generate_with_huggingface(self, prompt: str, max_tokens: int) -> Optional[str]:
-        """Gera conteúdo usando HuggingFace com rotação de modelos."""
-        config = self.providers['huggingface']
-        for _ in range(len(config['models'])):
-            model_index = config['current_model_index']
-            model = config['models'][model_index]
-            config['current_model_index'] = (model_index + 1) % len(config['models']) # Rotaciona para a próxima vez
-            
+        """Gera conteúdo usando HuggingFace com rotação de modelos (priorizando modelos warm)."""
+        provider = self.providers['huggingface']
+        client_config = provider.client
+        session = get_provider_session('huggingface')
+        huggingface_warmup.ensure_started()
+
+        # Rotaciona para a próxima vez (índice avançado atomicamente)
+        rotation = provider.next_model_rotation()
+
+        for model in huggingface_warmup.order_models(rotation):
             try:
-                url = f"{config['client']['base_url']}{model}"
-                headers = {"Authorization": f"Bearer {config['client']['api_key']}"}
-                payload = {"inputs": prompt, "parameters": {"max_new_tokens": min(max_tokens, 1024)}}
-                response = requests.post(url, headers=headers, json=payload, timeout=60)
+                url = f"{client_config['base_url']}{model}"
+                headers = {"Authorization": f"Bearer {client_config['api_key']}"}
+                max_new_tokens = min(max_tokens, 1024)
+                # return_full_text=False: sem isso a API devolve prompt + continuação
+                payload = {
+                    "inputs": prompt,
+                    "parameters": {"max_new_tokens": max_new_tokens, "return_full_text": False}
+                }
+                request_start = time.time()
+                response = session.post(url, headers=headers, json=payload, timeout=60)
+                huggingface_warmup.mark(model, response.status_code, time.time() - request_start)
                 
                 if response.status_code == 200:
                     res_json = response.json()
                     content = res_json[0].get("generated_text", "")
+                    if content.startswith(prompt):
+                        # Modelos/endpoints que ignoram return_full_text
+                        content = content[len(prompt):].lstrip()
                     if content:
+                        # API de inferência não informa finish_reason - estima pelo tamanho da saída
+                        output_tokens = token_budget_manager.estimate_tokens(content)
+                        self._set_call_meta(output_tokens, output_tokens >= max_new_tokens * 0.95)
                         logger.info(f"✅ HuggingFace ({model}) gerou {len(content)} caracteres")
                         return content
                 elif response.status_code == 503:
@@ -363,6 +483,7 @@ class AIManager:
                     logger.warning(f"⚠️ Erro {response.status_code} no modelo {model}")
                     continue
             except Exception as e:
+                huggingface_warmup.mark(model, 0)
                 logger.warning(f"⚠️ Erro no modelo {model}: {e}")
                 continue
         raise Exception("Todos os modelos HuggingFace falharam")
@@ -371,42 +492,35 @@ class AIManager:
         """Reset contadores de erro dos provedores"""
         if provider_name:
             if provider_name in self.providers:
-                self.providers[provider_name]['error_count'] = 0
-                self.providers[provider_name]['consecutive_failures'] = 0
-                self.providers[provider_name]['available'] = True
+                self.providers[provider_name].reset()
                 logger.info(f"🔄 Reset erros do provedor: {provider_name}")
         else:
-            for provider in self.providers.values():
-                provider['error_count'] = 0
-                provider['consecutive_failures'] = 0
-                if provider.get('client'):  # Só reabilita se tem cliente configurado
-                    provider['available'] = True
+            # Só reabilita provedores com cliente configurado
+            self.providers.reset_all()
             logger.info("🔄 Reset erros de todos os provedores")
 
-    def _try_fallback(self, prompt: str, max_tokens: int, exclude: List[str]) -> Optional[str]:
+    def _try_fallback(
+        self,
+        prompt: str,
+        max_tokens: int,
+        exclude: List[str],
+        task_type: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
         """Tenta usar o próximo provedor disponível como fallback."""
         logger.info(f"🔄 Acionando fallback, excluindo: {', '.join(exclude)}")
         
-        # Ordena provedores por prioridade, excluindo os que já falharam
-        available_providers = [
-            (name, provider) for name, provider in self.providers.items()
-            if (provider['available'] and 
-                name not in exclude and 
-                provider['consecutive_failures'] < provider.get('max_errors', 2))
-        ]
+        # Próximo provedor por prioridade, excluindo os que já falharam
+        next_provider = self.get_best_provider(exclude=exclude)
         
-        if not available_providers:
+        if not next_provider:
             logger.critical("❌ Todos os provedores de fallback falharam.")
             return None
         
-        # Ordena por prioridade
-        available_providers.sort(key=lambda x: (x[1]['priority'], x[1]['consecutive_failures']))
-        next_provider = available_providers[0][0]
-        
         logger.info(f"🔄 Tentando fallback para: {next_provider.upper()}")
         
         try:
-            result = self._call_provider(next_provider, prompt, max_tokens)
+            result = self._call_with_budget(next_provider, prompt, max_tokens, task_type, response_schema)
             if result:
                 self._record_success(next_provider)
                 return result
@@ -415,24 +529,22 @@ class AIManager:
         except Exception as e:
             logger.error(f"❌ Fallback para {next_provider} também falhou: {e}")
             self._record_failure(next_provider, str(e))
-            return self._try_fallback(prompt, max_tokens, exclude + [next_provider])
+            return self._try_fallback(prompt, max_tokens, exclude + [next_provider], task_type, response_schema)
     
     def get_provider_status(self) -> Dict[str, Any]:
         """Retorna status detalhado dos provedores"""
         status = {}
         
         for name, provider in self.providers.items():
-            status[name] = {
-                'available': provider['available'],
-                'priority': provider['priority'],
-                'error_count': provider['error_count'],
-                'consecutive_failures': provider['consecutive_failures'],
-                'last_success': provider.get('last_success'),
-                'max_errors': provider['max_errors'],
-                'model': provider.get('model', 'N/A')
-            }
+            status[name] = provider.to_status()
+
+        status['huggingface']['warmup'] = huggingface_warmup.get_status()
         
         return status
 
+    def get_token_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas de tokens gerados por tipo de tarefa"""
+        return token_budget_manager.get_stats()
+
 # Instância global
 ai_manager = AIManager()
@@ -446,7 +446,7 @@ RETORNE APENAS JSON VÁLIDO:
 ```
 """
             
-            response = ai_manager.generate_analysis(prompt, max_tokens=1500)
+            response = ai_manager.generate_analysis(prompt, max_tokens=1500, task_type='anti_objection_scripts')
             
             if response:
                 clean_response = response.strip()
@@ -11,12 +11,13 @@ import mimetypes
 import re
 from typing import Dict, List, Optional, Any, Tuple
 from werkzeug.datastructures import FileStorage
-import PyPDF2
 import pandas as pd
 from docx import Document
 import json
 from datetime import datetime
 
+from services.pdf_extractor import attachment_pdf_extractor
+
 logger = logging.getLogger(__name__)
 
 class AttachmentService:
@@ -27,6 +28,11 @@ class AttachmentService:
         self.upload_folder = os.path.join(os.path.dirname(__file__), '..', 'uploads')
         os.makedirs(self.upload_folder, exist_ok=True)
 
+        # Anexos são enviados pelo usuário para análise: limite de páginas maior que o da web,
+        # com tempo abaixo do timeout do gunicorn (60s) - a extração roda na requisição do upload
+        self.pdf_max_pages = int(os.getenv('ATTACHMENT_PDF_MAX_PAGES', 200))
+        self.pdf_timeout = float(os.getenv('ATTACHMENT_PDF_TIMEOUT', 30))
+
         # Tipos de arquivo suportados
         self.supported_types = {
             'application/pdf': 'pdf',
@@ -173,17 +179,22 @@ class AttachmentService:
             return None
 
     def _extract_pdf_content(self, file_path: str) -> Optional[str]:
-        """Extrai texto de arquivo PDF"""
+        """Extrai texto de arquivo PDF (em memória, no pool de processos dos anexos)"""
         try:
-            content = ""
             with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+                pdf_bytes = file.read()
 
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    content += page.extract_text() + "\n"
+            result = attachment_pdf_extractor.extract(pdf_bytes, max_pages=self.pdf_max_pages, timeout=self.pdf_timeout)
+            if result['error'] and not result['text']:
+                logger.error(f"Erro ao extrair PDF: {result['error']}")
+                return None
+            if result['stop_reason'] in ('page_limit', 'time_limit'):
+                logger.warning(
+                    f"⚠️ PDF extraído parcialmente ({result['stop_reason']}): "
+                    f"{result['pages_read']}/{result['total_pages']} páginas"
+                )
 
-            return content.strip()
+            return result['text'].strip()
 
         except Exception as e:
             logger.error(f"Erro ao extrair PDF: {str(e)}")
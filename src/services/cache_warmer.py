@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Cache Warmer
+Pré-executa, fora do horário de pico, as buscas e extrações dos segmentos mais
+analisados para que análises interativas encontrem o cache quente
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
+
+from services.sqlite_store import SQLiteStore
+from services.single_flight import COORDINATION_DB
+
+logger = logging.getLogger(__name__)
+
+def _parse_hours(spec: str) -> Tuple[int, int]:
+    """'1-6' → (1, 6); janela pode atravessar a meia-noite ('22-5')"""
+    start, _, end = spec.partition('-')
+    return int(start) % 24, int(end or start) % 24
+
+class CacheWarmer:
+    """Aquece o cache de busca para as combinações segmento/produto mais frequentes.
+
+    A cada ciclo (CACHE_WARMING_INTERVAL), dentro da janela fora de pico
+    (CACHE_WARMING_HOURS, hora local), um único worker — reservado no banco de
+    coordenação — aprende as CACHE_WARMING_TOP_N combinações mais analisadas nos
+    últimos CACHE_WARMING_LOOKBACK_DAYS dias e executa as queries de
+    _generate_expanded_intelligent_queries que ainda não estão em cache. O plano de
+    busca usa só CACHE_WARMING_QUOTA_SHARE da quota restante das APIs pagas (provedor
+    cuja fatia arredonda para zero fica de fora) e no máximo CACHE_WARMING_MAX_QUERIES
+    queries por ciclo.
+    """
+
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS cache_warming (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_run REAL NOT NULL
+        )
+        """
+    ]
+
+    def __init__(self, db_path: str = COORDINATION_DB):
+        """Inicializa o aquecedor de cache"""
+        self.enabled = os.getenv('CACHE_WARMING_ENABLED', 'true').lower() == 'true'
+        self.interval = int(os.getenv('CACHE_WARMING_INTERVAL', 3600))
+        self.hours = _parse_hours(os.getenv('CACHE_WARMING_HOURS', '1-6'))
+        self.top_n = int(os.getenv('CACHE_WARMING_TOP_N', 5))
+        self.lookback_days = int(os.getenv('CACHE_WARMING_LOOKBACK_DAYS', 30))
+        self.max_queries = int(os.getenv('CACHE_WARMING_MAX_QUERIES', 40))
+        self.quota_share = float(os.getenv('CACHE_WARMING_QUOTA_SHARE', 0.05))
+
+        self.store: Optional[SQLiteStore] = None
+        try:
+            self.store = SQLiteStore(db_path, self.SCHEMA)
+        except Exception as e:
+            logger.warning(f"⚠️ Aquecimento de cache sem coordenação entre workers: {e}")
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_pid: Optional[int] = None
+        self._stats = {
+            'cycles': 0,
+            'last_cycle': None,
+            'last_combinations': [],
+            'queries_warmed': 0,
+            'queries_already_cached': 0,
+            'pages_extracted': 0
+        }
+
+    def ensure_started(self):
+        """Inicia a thread de aquecimento no processo atual (seguro após fork)"""
+        if not self.enabled:
+            return
+        if self._thread and self._thread.is_alive() and self._thread_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._thread_pid == os.getpid():
+                return
+            self._stop.clear()
+            self._thread_pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='cache-warmer', daemon=True)
+            self._thread.start()
+        logger.info(f"🔥 Aquecimento de cache agendado (janela {self.hours[0]}h-{self.hours[1]}h, top {self.top_n})")
+
+    def stop(self):
+        """Interrompe a thread de aquecimento"""
+        self._stop.set()
+        self._wake.set()
+
+    def request_cycle(self) -> bool:
+        """Antecipa a próxima verificação na thread de background (sem bloquear o chamador).
+
+        O ciclo continua sujeito à janela fora de pico e à reserva entre workers.
+        """
+        if not self.enabled:
+            return False
+        self.ensure_started()
+        self._wake.set()
+        return True
+
+    def is_off_peak(self, now: Optional[datetime] = None) -> bool:
+        """Hora local dentro da janela CACHE_WARMING_HOURS"""
+        hour = (now or datetime.now()).hour
+        start, end = self.hours
+        if start <= end:
+            return start <= hour < end
+        return hour >= start or hour < end
+
+    def popular_combinations(self) -> List[Dict[str, Any]]:
+        """Top-N combinações segmento/produto das análises salvas no período"""
+        from services.local_file_manager import local_file_manager
+
+        cutoff = (datetime.now() - timedelta(days=self.lookback_days)).isoformat()
+        counts: Counter = Counter()
+        latest: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+        # Mais recentes primeiro: o público da análise mais recente representa a combinação
+        for analysis in local_file_manager.list_local_analyses():
+            if (analysis.get('created_at') or '') < cutoff:
+                continue
+            segmento = (analysis.get('segmento') or '').strip()
+            if not segmento:
+                continue
+            produto = (analysis.get('produto') or '').strip()
+            key = (segmento.lower(), produto.lower())
+            counts[key] += 1
+            latest.setdefault(key, {'segmento': segmento, 'produto': produto, 'publico': analysis.get('publico') or ''})
+
+        return [
+            {**latest[key], 'analyses': count}
+            for key, count in counts.most_common(self.top_n)
+        ]
+
+    def run_cycle(self, force: bool = False) -> Dict[str, Any]:
+        """Executa um ciclo de aquecimento (force ignora janela e reserva entre workers)"""
+        if not force and not (self.is_off_peak() and self._claim_cycle()):
+            return {'skipped': True}
+
+        from services.production_search_manager import production_search_manager, search_planner
+        from services.ultra_detailed_analysis_engine import ultra_detailed_analysis_engine
+
+        start = time.time()
+        combinations = self.popular_combinations()
+
+        queries: List[str] = []
+        for combination in combinations:
+            for query in ultra_detailed_analysis_engine._generate_expanded_intelligent_queries(combination):
+                if query not in queries:
+                    queries.append(query)
+
+        # Queries já quentes em algum provedor não gastam orçamento
+        plannable = production_search_manager.get_plannable_providers()
+        cold = [
+            query for query in queries
+            if not any(production_search_manager.has_cached_results(query, name) for name in plannable)
+        ]
+        already_cached = len(queries) - len(cold)
+        cold = cold[:self.max_queries]
+
+        plan = search_planner.plan(cold, max_share=self.quota_share, interactive=False)
+        warmed = 0
+        pages = 0
+        for assignment in plan.assignments:
+            if self._stop.is_set():
+                break
+            if not assignment.providers:
+                continue
+            result = ultra_detailed_analysis_engine._execute_single_query_research(
+                assignment.query, providers=assignment.providers
+            )
+            if result:
+                warmed += 1
+                pages += len(result.get('extracted_content', []))
+
+        summary = {
+            'skipped': False,
+            'combinations': combinations,
+            'queries': len(queries),
+            'already_cached': already_cached,
+            'planned': len(cold),
+            'warmed': warmed,
+            'pages_extracted': pages,
+            'projected_usage': plan.projected_usage,
+            'elapsed': round(time.time() - start, 1)
+        }
+
+        with self._lock:
+            self._stats['cycles'] += 1
+            self._stats['last_cycle'] = datetime.now().isoformat()
+            self._stats['last_combinations'] = [
+                f"{c['segmento']}/{c['produto']}" if c['produto'] else c['segmento'] for c in combinations
+            ]
+            self._stats['queries_warmed'] += warmed
+            self._stats['queries_already_cached'] += summary['already_cached']
+            self._stats['pages_extracted'] += pages
+
+        logger.info(
+            f"🔥 Cache aquecido: {warmed}/{len(cold)} queries frias de {len(combinations)} combinações, "
+            f"{pages} páginas ({summary['elapsed']}s)"
+        )
+        return summary
+
+    def get_status(self) -> Dict[str, Any]:
+        """Configuração e estatísticas acumuladas"""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'running': bool(self._thread and self._thread.is_alive()),
+                'interval': self.interval,
+                'off_peak_hours': f"{self.hours[0]}-{self.hours[1]}",
+                'off_peak_now': self.is_off_peak(),
+                'top_n': self.top_n,
+                'max_queries': self.max_queries,
+                'quota_share': self.quota_share,
+                **self._stats
+            }
+
+    def _run(self):
+        """Loop em background: verifica a janela a cada intervalo"""
+        while not self._stop.is_set():
+            self._wake.wait(min(self.interval, 600))
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.run_cycle()
+            except Exception as e:
+                logger.error(f"❌ Erro no aquecimento de cache: {e}")
+
+    def _claim_cycle(self) -> bool:
+        """Reserva o ciclo para este worker (um aquecimento por intervalo entre processos)"""
+        if self.store is None:
+            return True
+        now = time.time()
+        try:
+            with self.store.transaction(immediate=True) as conn:
+                row = conn.execute("SELECT last_run FROM cache_warming WHERE id = 1").fetchone()
+                if row and now - row[0] < self.interval * 0.9:
+                    return False
+                conn.execute("INSERT OR REPLACE INTO cache_warming (id, last_run) VALUES (1, ?)", (now,))
+            return True
+        except Exception as e:
+            logger.debug(f"Ciclo de aquecimento não reservado: {e}")
+            return False
+
+# Instância global
+cache_warmer = CacheWarmer()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Content Cache
+Cache persistente do texto extraído por URL canônica, com revalidação condicional
+(ETag / Last-Modified)
+"""
+
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from services.sqlite_store import CACHE_DIR, SQLiteStore
+from services.result_ranker import url_key
+
+logger = logging.getLogger(__name__)
+
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid', 'igshid', '_ga', 'ref_src'}
+
+def canonical_url(url: str) -> str:
+    """Chave canônica: url_key sem parâmetros de rastreamento e com a query ordenada"""
+    parsed = urlparse(url)
+    params = sorted(
+        (name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not name.lower().startswith('utm_') and name.lower() not in TRACKING_PARAMS
+    )
+    return url_key(parsed._replace(query=urlencode(params), fragment='').geturl())
+
+@dataclass
+class CachedContent:
+    """Entrada do cache de conteúdo"""
+    url: str
+    content: str
+    extractor: str
+    quality_ok: bool
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    expires_at: float
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Cabeçalhos para GET condicional (304 reaproveita o texto sem re-extrair)"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class ContentCache:
+    """Texto limpo por URL canônica em SQLite (compartilhado entre workers).
+
+    Entradas dentro de CONTENT_CACHE_TTL são servidas sem rede. Depois disso ficam
+    obsoletas mas são mantidas até CONTENT_CACHE_MAX_AGE para revalidação condicional;
+    um 304 renova a validade sem baixar nem re-extrair. Acima de CONTENT_CACHE_MAX_ROWS
+    as entradas mais antigas são descartadas.
+    """
+
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS extracted_content (
+            url_key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            content TEXT NOT NULL,
+            extractor TEXT NOT NULL,
+            quality_ok INTEGER NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_extracted_content_fetched ON extracted_content(fetched_at)"
+    ]
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.enabled = os.getenv('CONTENT_CACHE_ENABLED', 'true').lower() == 'true'
+        self.ttl = int(os.getenv('CONTENT_CACHE_TTL', 86400))
+        self.max_age = int(os.getenv('CONTENT_CACHE_MAX_AGE', 30 * 86400))
+        self.max_rows = int(os.getenv('CONTENT_CACHE_MAX_ROWS', 20000))
+        self.prune_every = int(os.getenv('CONTENT_CACHE_PRUNE_EVERY', 200))
+
+        self.store: Optional[SQLiteStore] = None
+        try:
+            self.store = SQLiteStore(
+                db_path or os.getenv('CONTENT_CACHE_DB_PATH', os.path.join(CACHE_DIR, 'content_cache.db')),
+                self.SCHEMA
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Cache de conteúdo extraído indisponível: {e}")
+
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.stats = {'fresh_hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0}
+
+    def get(self, url: str) -> Optional[CachedContent]:
+        """Entrada para a URL (fresca ou obsoleta); None se ausente"""
+        if not self.enabled or self.store is None:
+            return None
+        try:
+            row = self.store.execute(
+                "SELECT url, content, extractor, quality_ok, etag, last_modified, fetched_at, expires_at "
+                "FROM extracted_content WHERE url_key = ?",
+                (canonical_url(url),)
+            ).fetchone()
+        except Exception as e:
+            logger.debug(f"Falha ao ler cache de conteúdo para {url}: {e}")
+            return None
+        if row is None:
+            return None
+        return CachedContent(row[0], row[1], row[2], bool(row[3]), row[4], row[5], row[6], row[7])
+
+    def set(self, url: str, content: str, extractor: str, quality_ok: bool,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Grava o texto extraído e os validadores HTTP da resposta"""
+        if not self.enabled or self.store is None or not content:
+            return
+        now = time.time()
+        try:
+            self.store.execute(
+                "INSERT OR REPLACE INTO extracted_content "
+                "(url_key, url, content, extractor, quality_ok, etag, last_modified, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (canonical_url(url), url, content, extractor, int(quality_ok), etag, last_modified, now, now + self.ttl)
+            )
+        except Exception as e:
+            logger.debug(f"Falha ao gravar cache de conteúdo para {url}: {e}")
+            return
+
+        with self._lock:
+            self.stats['stores'] += 1
+            self._writes += 1
+            prune = self._writes % self.prune_every == 0
+        if prune:
+            self.prune()
+
+    def revalidated(self, entry: CachedContent, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Renova a validade após 304 (servidor pode enviar validadores novos)"""
+        if self.store is None:
+            return
+        now = time.time()
+        entry.etag = etag or entry.etag
+        entry.last_modified = last_modified or entry.last_modified
+        entry.expires_at = now + self.ttl
+        try:
+            self.store.execute(
+                "UPDATE extracted_content SET etag = ?, last_modified = ?, expires_at = ? WHERE url_key = ?",
+                (entry.etag, entry.last_modified, entry.expires_at, canonical_url(entry.url))
+            )
+        except Exception as e:
+            logger.debug(f"Falha ao renovar cache de conteúdo para {entry.url}: {e}")
+
+    def count(self, outcome: str):
+        """Contabiliza fresh_hits / revalidated / misses"""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def prune(self) -> int:
+        """Remove entradas além de CONTENT_CACHE_MAX_AGE e o excedente de CONTENT_CACHE_MAX_ROWS"""
+        if self.store is None:
+            return 0
+        try:
+            removed = self.store.execute(
+                "DELETE FROM extracted_content WHERE fetched_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+            removed += self.store.execute(
+                "DELETE FROM extracted_content WHERE url_key IN ("
+                "SELECT url_key FROM extracted_content ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,)
+            ).rowcount
+        except Exception as e:
+            logger.debug(f"Falha na limpeza do cache de conteúdo: {e}")
+            return 0
+        if removed:
+            logger.info(f"🧹 Cache de conteúdo: {removed} entradas removidas")
+        return removed
+
+    def invalidate(self, url: str):
+        """Remove a entrada de uma URL"""
+        if self.store is None:
+            return
+        try:
+            self.store.execute("DELETE FROM extracted_content WHERE url_key = ?", (canonical_url(url),))
+        except Exception as e:
+            logger.debug(f"Falha ao invalidar cache de conteúdo para {url}: {e}")
+
+    def clear(self):
+        """Remove todas as entradas"""
+        if self.store is None:
+            return
+        try:
+            self.store.execute("DELETE FROM extracted_content")
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao limpar cache de conteúdo: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Configuração, tamanho e contadores"""
+        entries = 0
+        if self.store is not None:
+            try:
+                entries = self.store.execute("SELECT COUNT(*) FROM extracted_content").fetchone()[0]
+            except Exception:
+                pass
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['fresh_hits'] + stats['revalidated'] + stats['misses']
+        return {
+            'enabled': self.enabled,
+            'ttl': self.ttl,
+            'max_age': self.max_age,
+            'entries': entries,
+            'hit_rate': round((stats['fresh_hits'] + stats['revalidated']) / lookups, 3) if lookups else 0.0,
+            **stats
+        }
+
+# Instância global
+content_cache = ContentCache()
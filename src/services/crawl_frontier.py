@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Crawl Frontier
+Fronteira de crawl com prioridade por relevância esperada, politeness por domínio e
+orçamentos de páginas/profundidade
+"""
+
+import time
+import heapq
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.domain_yield import url_domain
+from services.politeness_scheduler import PolitenessScheduler
+from services.result_ranker import url_key
+
+logger = logging.getLogger(__name__)
+
+@dataclass(order=True)
+class CrawlTask:
+    """URL na fronteira; sai do heap pela maior relevância esperada"""
+    priority: float
+    seq: int
+    url: str = field(compare=False)
+    depth: int = field(compare=False)
+    expected_relevance: float = field(compare=False)
+    meta: Dict[str, Any] = field(compare=False, default_factory=dict)
+
+class CrawlFrontier:
+    """Fila de prioridade de URLs com pool de fetch limitado.
+
+    - Ordem: maior relevância esperada primeiro (empate: ordem de inserção).
+    - Politeness: fetches passam pelo PolitenessScheduler com o domínio como chave;
+      a fronteira mantém no máximo per_domain fetches em andamento por domínio,
+      pulando para o próximo domínio em vez de ocupar vagas esperando.
+    - Orçamentos: max_pages páginas aceitas, max_fetches tentativas, max_depth níveis
+      de links e deadline em segundos. Ao esgotar, o que está pendente é cancelado.
+
+    fetch(url) roda no pool do agendador; on_result(task, resultado) roda na thread de
+    run(), retorna True se a página conta no orçamento e pode chamar add() com links.
+    """
+
+    def __init__(
+        self,
+        scheduler: PolitenessScheduler,
+        fetch: Callable[[CrawlTask], Any],
+        max_pages: int,
+        max_depth: int,
+        max_fetches: Optional[int] = None,
+        max_in_flight: int = 6,
+        per_domain: int = 1,
+        timeout: float = 180.0
+    ):
+        self.scheduler = scheduler
+        self.fetch = fetch
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.max_fetches = max_fetches if max_fetches is not None else max_pages * 3
+        self.max_in_flight = max_in_flight
+        self.per_domain = per_domain
+        self.timeout = timeout
+
+        self._heap: List[CrawlTask] = []
+        self._seen = set()
+        self._seq = 0
+        self._domain_in_flight: Dict[str, int] = {}
+        self.pages = 0
+        self.fetches = 0
+        self.skipped_depth = 0
+
+    def add(self, url: str, expected_relevance: float, depth: int = 0, **meta) -> bool:
+        """Enfileira URL inédita dentro do orçamento de profundidade"""
+        if not url or not url.startswith('http'):
+            return False
+        if depth > self.max_depth:
+            self.skipped_depth += 1
+            return False
+        key = url_key(url)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self._seq += 1
+        heapq.heappush(self._heap, CrawlTask(-expected_relevance, self._seq, url, depth, expected_relevance, meta))
+        return True
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def run(self, on_result: Callable[[CrawlTask, Any], bool]) -> Dict[str, Any]:
+        """Processa a fronteira até esvaziar ou esgotar um orçamento; retorna estatísticas"""
+        start = time.time()
+        deadline = start + self.timeout
+        in_flight: Dict[Future, Tuple[CrawlTask, str]] = {}
+        stop_reason = 'frontier_empty'
+
+        while True:
+            if self.pages >= self.max_pages:
+                stop_reason = 'page_budget'
+                break
+            if time.time() >= deadline:
+                stop_reason = 'deadline'
+                break
+
+            self._fill(in_flight)
+            if not in_flight:
+                if self.fetches >= self.max_fetches and self._heap:
+                    stop_reason = 'fetch_budget'
+                break
+
+            done, _ = wait(list(in_flight), timeout=max(deadline - time.time(), 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                task, domain = in_flight.pop(future)
+                self._domain_in_flight[domain] -= 1
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.debug(f"Fetch falhou para {task.url}: {e}")
+                    continue
+                if on_result(task, result):
+                    self.pages += 1
+
+        for future in in_flight:
+            future.cancel()
+
+        stats = {
+            'pages': self.pages,
+            'fetches': self.fetches,
+            'remaining_frontier': len(self._heap),
+            'skipped_depth': self.skipped_depth,
+            'stop_reason': stop_reason,
+            'elapsed': round(time.time() - start, 2)
+        }
+        logger.info(f"🕸️ Crawl: {self.pages} páginas em {self.fetches} fetches ({stop_reason}, {stats['elapsed']}s)")
+        return stats
+
+    def _fill(self, in_flight: Dict[Future, Tuple[CrawlTask, str]]):
+        """Despacha as tarefas mais promissoras cujo domínio tem vaga"""
+        deferred = []
+        while self._heap and len(in_flight) < self.max_in_flight and self.fetches < self.max_fetches:
+            task = heapq.heappop(self._heap)
+            domain = url_domain(task.url)
+            if self._domain_in_flight.get(domain, 0) >= self.per_domain:
+                deferred.append(task)
+                continue
+            self._domain_in_flight[domain] = self._domain_in_flight.get(domain, 0) + 1
+            self.fetches += 1
+            in_flight[self.scheduler.submit(domain, self.fetch, task)] = (task, domain)
+
+        for task in deferred:
+            heapq.heappush(self._heap, task)
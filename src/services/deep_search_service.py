@@ -10,12 +10,17 @@ import logging
 import time
 import requests
 from typing import Dict, List, Optional, Any
-from urllib.parse import quote_plus
 import json
 from datetime import datetime
 from bs4 import BeautifulSoup
 import re
 
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+
+from services.search_providers import search_provider_registry
+from services.politeness_scheduler import PolitenessScheduler
+from services.domain_yield import url_domain
+
 logger = logging.getLogger(__name__)
 
 class DeepSearchService:
@@ -27,10 +32,18 @@ class DeepSearchService:
         self.jina_api_key = os.getenv('JINA_API_KEY')
         self.google_cse_id = os.getenv('GOOGLE_CSE_ID')
         
-        # URLs das APIs REAIS
-        self.google_search_url = "https://www.googleapis.com/customsearch/v1"
+        # Buscas passam pela camada de provedores (sessão, cache e rate limit compartilhados)
         self.jina_reader_url = "https://r.jina.ai/"
         
+        # Extração concorrente: pool limitado e intervalo mínimo por domínio
+        self.extraction_scheduler = PolitenessScheduler(
+            'deep_search',
+            max_workers=int(os.getenv('DEEP_SEARCH_EXTRACTION_WORKERS', 6)),
+            min_interval=float(os.getenv('DEEP_SEARCH_DOMAIN_INTERVAL', 1.0)),
+            max_in_flight=1
+        )
+        self.extraction_timeout = float(os.getenv('DEEP_SEARCH_TIMEOUT', 120))
+        
         # Headers REAIS para requisições
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -54,36 +67,51 @@ class DeepSearchService:
         try:
             logger.info(f"🔍 INICIANDO BUSCA PROFUNDA REAL para: {query}")
             start_time = time.time()
+            deadline = start_time + self.extraction_timeout
             
-            # Resultados consolidados REAIS
-            search_results = []
+            # 1-3. BUSCA REAL EM PARALELO (GOOGLE, BING, DUCKDUCKGO): o ritmo de cada
+            # motor é aplicado pelo agendador da camada de provedores, não por sleeps
+            engines = []
+            if search_provider_registry.is_available('google'):
+                engines.append(("🌐 Google Custom Search", self._google_search_real, max_results // 2))
+            engines.append(("🔍 Bing Search", self._bing_search_real, max_results // 3))
+            engines.append(("🦆 DuckDuckGo Search", self._duckduckgo_search_real, max_results // 3))
             
-            # 1. BUSCA REAL COM GOOGLE CUSTOM SEARCH
-            if self.google_search_key and self.google_cse_id:
-                logger.info("🌐 Executando Google Custom Search REAL...")
-                google_results = self._google_search_real(query, max_results // 2)
-                search_results.extend(google_results)
-                time.sleep(1)  # Rate limiting
+            logger.info(f"Executando {', '.join(label for label, _, _ in engines)} REAL em paralelo...")
+            with ThreadPoolExecutor(max_workers=len(engines)) as executor:
+                futures = [executor.submit(engine, query, limit) for _, engine, limit in engines]
             
-            # 2. BUSCA REAL COM BING
-            logger.info("🔍 Executando Bing Search REAL...")
-            bing_results = self._bing_search_real(query, max_results // 3)
-            search_results.extend(bing_results)
-            time.sleep(1)
+            # Resultados consolidados REAIS (na ordem dos motores)
+            search_results = []
+            for (label, _, _), future in zip(engines, futures):
+                try:
+                    search_results.extend(future.result() or [])
+                except Exception as e:
+                    logger.error(f"❌ Erro em {label}: {str(e)}")
             
-            # 3. BUSCA REAL COM DUCKDUCKGO
-            logger.info("🦆 Executando DuckDuckGo Search REAL...")
-            ddg_results = self._duckduckgo_search_real(query, max_results // 3)
-            search_results.extend(ddg_results)
-            time.sleep(1)
+            # 4. EXTRAI CONTEÚDO REAL DAS PÁGINAS ENCONTRADAS (pool limitado, ritmo por domínio)
+            top_results = search_results[:15]  # Top 15 páginas
+            logger.info(f"📄 Extraindo conteúdo REAL de {len(top_results)} páginas...")
             
-            # 4. EXTRAI CONTEÚDO REAL DAS PÁGINAS ENCONTRADAS
-            content_results = []
-            logger.info(f"📄 Extraindo conteúdo REAL de {len(search_results)} páginas...")
+            extractions = [
+                self.extraction_scheduler.submit(url_domain(result.get('url', '')), self._extract_real_page_content, result.get('url', ''))
+                for result in top_results
+            ]
             
-            for i, result in enumerate(search_results[:15]):  # Top 15 páginas
-                logger.info(f"📖 Extraindo página {i+1}/15: {result.get('title', 'Sem título')}")
-                content = self._extract_real_page_content(result.get('url', ''))
+            content_results = []
+            for i, (result, future) in enumerate(zip(top_results, extractions)):
+                try:
+                    content = future.result(timeout=max(deadline - time.time(), 0))
+                except FuturesTimeoutError:
+                    logger.warning(f"⏰ Tempo de extração esgotado; {len(top_results) - i} páginas ignoradas")
+                    for pending in extractions[i:]:
+                        pending.cancel()
+                    break
+                except Exception as e:
+                    logger.warning(f"⚠️ Falha ao extrair {result.get('url', '')}: {str(e)}")
+                    continue
+                
+                logger.info(f"📖 Página {i+1}/{len(top_results)}: {result.get('title', 'Sem título')}")
                 if content and len(content) > 200:  # Só conteúdo substancial
                     content_results.append({
                         'title': result.get('title', ''),
@@ -92,7 +120,6 @@ class DeepSearchService:
                         'relevance_score': self._calculate_real_relevance(content, query, context_data),
                         'source_engine': result.get('source', 'unknown')
                     })
-                    time.sleep(0.5)  # Rate limiting
             
             # 5. PROCESSA COM ANÁLISE REAL
             processed_content = self._process_real_content(query, context_data, content_results)
@@ -109,138 +136,16 @@ class DeepSearchService:
     
     def _google_search_real(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Busca REAL usando Google Custom Search API"""
-        
-        try:
-            enhanced_query = self._enhance_query_real(query)
-            
-            params = {
-                'key': self.google_search_key,
-                'cx': self.google_cse_id,
-                'q': enhanced_query,
-                'num': min(max_results, 10),
-                'lr': 'lang_pt',
-                'gl': 'br',
-                'safe': 'off',
-                'dateRestrict': 'm6',  # Últimos 6 meses
-                'sort': 'date'
-            }
-            
-            response = requests.get(
-                self.google_search_url, 
-                params=params, 
-                headers=self.headers,
-                timeout=15
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                results = []
-                
-                for item in data.get('items', []):
-                    results.append({
-                        'title': item.get('title', ''),
-                        'url': item.get('link', ''),
-                        'snippet': item.get('snippet', ''),
-                        'source': 'google_real'
-                    })
-                
-                logger.info(f"✅ Google Search REAL: {len(results)} resultados")
-                return results
-            else:
-                logger.warning(f"⚠️ Google Search falhou: {response.status_code}")
-                return []
-                
-        except Exception as e:
-            logger.error(f"❌ Erro no Google Search REAL: {str(e)}")
-            return []
-    
+        return search_provider_registry.search('google', self._enhance_query_real(query), max_results)
+
     def _bing_search_real(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Busca REAL usando Bing"""
-        
-        try:
-            search_url = f"https://www.bing.com/search?q={quote_plus(query)}&cc=br&setlang=pt-br&count={max_results}"
-            
-            response = requests.get(
-                search_url,
-                headers=self.headers,
-                timeout=15
-            )
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                results = []
-                
-                # Extrai resultados REAIS do Bing
-                result_items = soup.find_all('li', class_='b_algo')
-                
-                for item in result_items[:max_results]:
-                    title_elem = item.find('h2')
-                    if title_elem:
-                        link_elem = title_elem.find('a')
-                        if link_elem:
-                            title = title_elem.get_text(strip=True)
-                            url = link_elem.get('href', '')
-                            
-                            snippet_elem = item.find('p')
-                            snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-                            
-                            if url and title and url.startswith('http'):
-                                results.append({
-                                    'title': title,
-                                    'url': url,
-                                    'snippet': snippet,
-                                    'source': 'bing_real'
-                                })
-                
-                logger.info(f"✅ Bing Search REAL: {len(results)} resultados")
-                return results
-                
-        except Exception as e:
-            logger.error(f"❌ Erro no Bing Search REAL: {str(e)}")
-            return []
-    
+        return search_provider_registry.search('bing', query, max_results)
+
     def _duckduckgo_search_real(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Busca REAL usando DuckDuckGo"""
-        
-        try:
-            search_url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
-            
-            response = requests.get(
-                search_url,
-                headers=self.headers,
-                timeout=15
-            )
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                results = []
-                
-                result_divs = soup.find_all('div', class_='result')
-                
-                for div in result_divs[:max_results]:
-                    title_elem = div.find('a', class_='result__a')
-                    snippet_elem = div.find('a', class_='result__snippet')
-                    
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
-                        url = title_elem.get('href', '')
-                        snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-                        
-                        if url and title and url.startswith('http'):
-                            results.append({
-                                'title': title,
-                                'url': url,
-                                'snippet': snippet,
-                                'source': 'duckduckgo_real'
-                            })
-                
-                logger.info(f"✅ DuckDuckGo Search REAL: {len(results)} resultados")
-                return results
-                
-        except Exception as e:
-            logger.error(f"❌ Erro no DuckDuckGo Search REAL: {str(e)}")
-            return []
-    
+        return search_provider_registry.search('duckduckgo', query, max_results)
+
     def _extract_real_page_content(self, url: str) -> Optional[str]:
         """Extrai conteúdo REAL de uma página web"""
         
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Domain Yield
+Histórico de extrações por domínio (quantas tentativas geraram conteúdo válido)
+"""
+
+import os
+import time
+import logging
+from typing import Dict, Iterable, Optional, Any
+from urllib.parse import urlparse
+
+from services.sqlite_store import SQLiteStore
+from services.single_flight import COORDINATION_DB
+
+logger = logging.getLogger(__name__)
+
+def url_domain(url: str) -> str:
+    """Domínio normalizado (minúsculas, sem www. e sem porta)"""
+    netloc = urlparse(url).netloc.lower().split('@')[-1].split(':')[0]
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+class DomainYieldTracker:
+    """Taxa de sucesso de extração por domínio, compartilhada entre workers via SQLite"""
+
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS domain_yield (
+            domain TEXT PRIMARY KEY,
+            attempts INTEGER NOT NULL,
+            successes INTEGER NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        """
+    ]
+
+    def __init__(self, db_path: str = COORDINATION_DB):
+        # Domínio com histórico suficiente e rendimento baixo é pulado até ficar
+        # DOMAIN_SKIP_WINDOW segundos sem tentativas (então recebe uma nova chance)
+        self.skip_min_attempts = int(os.getenv('DOMAIN_SKIP_MIN_ATTEMPTS', 8))
+        self.skip_max_yield = float(os.getenv('DOMAIN_SKIP_MAX_YIELD', 0.15))
+        self.skip_window = float(os.getenv('DOMAIN_SKIP_WINDOW', 6 * 3600))
+
+        self.store: Optional[SQLiteStore] = None
+        try:
+            self.store = SQLiteStore(db_path, self.SCHEMA)
+        except Exception as e:
+            logger.warning(f"⚠️ Histórico de domínios indisponível: {e}")
+
+    def record(self, url: str, success: bool):
+        """Registra o resultado de uma extração"""
+        domain = url_domain(url)
+        if not domain or self.store is None:
+            return
+        try:
+            self.store.execute(
+                "INSERT INTO domain_yield (domain, attempts, successes, updated_at) VALUES (?, 1, ?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET attempts = attempts + 1, "
+                "successes = successes + excluded.successes, updated_at = excluded.updated_at",
+                (domain, int(success), time.time())
+            )
+        except Exception as e:
+            logger.debug(f"Falha ao registrar rendimento de {domain}: {e}")
+
+    def get_yields(self, urls: Iterable[str]) -> Dict[str, float]:
+        """Taxa de sucesso suavizada por domínio: (sucessos + 1) / (tentativas + 2).
+
+        Domínios sem histórico ficam em 0.5 (neutro)."""
+        domains = {url_domain(url) for url in urls} - {''}
+        yields = {domain: 0.5 for domain in domains}
+        if not domains or self.store is None:
+            return yields
+
+        try:
+            placeholders = ','.join('?' * len(domains))
+            rows = self.store.execute(
+                f"SELECT domain, attempts, successes FROM domain_yield WHERE domain IN ({placeholders})",
+                tuple(domains)
+            ).fetchall()
+        except Exception as e:
+            logger.debug(f"Falha ao ler rendimento de domínios: {e}")
+            return yields
+
+        for domain, attempts, successes in rows:
+            yields[domain] = (successes + 1) / (attempts + 2)
+        return yields
+
+    def should_skip(self, url: str) -> bool:
+        """Domínio sabidamente ruim: não vale gastar download nem extração"""
+        domain = url_domain(url)
+        if not domain or self.store is None or self.skip_min_attempts <= 0:
+            return False
+        try:
+            row = self.store.execute(
+                "SELECT attempts, successes, updated_at FROM domain_yield WHERE domain = ?", (domain,)
+            ).fetchone()
+        except Exception as e:
+            logger.debug(f"Falha ao ler rendimento de {domain}: {e}")
+            return False
+        if row is None:
+            return False
+        attempts, successes, updated_at = row
+        return (
+            attempts >= self.skip_min_attempts
+            and (successes + 1) / (attempts + 2) <= self.skip_max_yield
+            and time.time() - updated_at < self.skip_window
+        )
+
+    def get_stats(self, limit: int = 20) -> Dict[str, Any]:
+        """Domínios com mais tentativas"""
+        if self.store is None:
+            return {'available': False}
+        rows = self.store.execute(
+            "SELECT domain, attempts, successes FROM domain_yield ORDER BY attempts DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+        return {
+            'available': True,
+            'domains': [
+                {'domain': d, 'attempts': a, 'successes': s, 'yield': round((s + 1) / (a + 2), 3)}
+                for d, a, s in rows
+            ],
+            'skip_rule': {
+                'min_attempts': self.skip_min_attempts,
+                'max_yield': self.skip_max_yield,
+                'window': self.skip_window
+            }
+        }
+
+# Instância global
+domain_yield_tracker = DomainYieldTracker()
@@ -209,7 +209,8 @@ class EnhancedAnalysisEngine:
             logger.info("🤖 Executando análise com AI Manager...")
             ai_response = ai_manager.generate_analysis(
                 prompt,
-                max_tokens=8192
+                max_tokens=8192,
+                task_type='enhanced_analysis'
             )
             
             if ai_response:
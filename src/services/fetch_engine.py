@@ -0,0 +1,660 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Fetch Engine
+Motor assíncrono de download de páginas (httpx, HTTP/2 quando disponível) com pool
+de conexões dimensionado, keep-alive e cache de DNS, com fachada síncrona
+"""
+
+import os
+import re
+import time
+import random
+import asyncio
+import logging
+import threading
+import importlib.util
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from services.domain_yield import url_domain
+from services.http_pool import create_pooled_session
+from services.politeness_scheduler import PolitenessScheduler
+
+# Imports condicionais: sem httpx, o motor usa uma sessão requests com pool
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+# O httpx importa o h2 sozinho quando http2=True; aqui só é preciso saber se está instalado
+HAS_H2 = importlib.util.find_spec('h2') is not None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+_CHARSET_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+@dataclass
+class FetchResponse:
+    """Resposta já lida, com a mesma interface usada do requests.Response"""
+    url: str
+    status_code: int
+    headers: CaseInsensitiveDict
+    content: bytes
+    encoding: Optional[str] = None
+    http_version: str = 'HTTP/1.1'
+    elapsed: float = 0.0
+    truncated: bool = False
+    kind: str = 'html'
+    _text: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.content.decode(self.encoding or 'utf-8', errors='replace')
+        return self._text
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def raise_for_status(self):
+        """Mesmas exceções do requests (a classificação de erros do cache negativo depende delas)"""
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+class FetchRejected(requests.exceptions.RequestException):
+    """Download abortado sem ler o corpo (tipo não suportado, acima do limite ou host em
+    espera no próprio motor - 'host_busy', que não diz nada sobre a URL nem o domínio)"""
+
+    def __init__(self, message: str, error_class: str):
+        super().__init__(message)
+        self.error_class = error_class
+
+def content_kind(content_type: str) -> str:
+    """Categoria do Content-Type: html, pdf, text ou binary (ausente conta como html)"""
+    mime = content_type.split(';')[0].strip().lower()
+    if not mime or mime in ('text/html', 'application/xhtml+xml') or mime.endswith('/xml') or mime.endswith('+xml'):
+        return 'html'
+    if mime in ('application/pdf', 'application/x-pdf'):
+        return 'pdf'
+    if mime.startswith('text/') or mime.endswith('/json') or mime.endswith('+json'):
+        return 'text'
+    return 'binary'
+
+def sniff_kind(content_type: str, head: bytes) -> str:
+    """Categoria efetiva pelo Content-Type e pelos primeiros bytes do corpo.
+
+    A assinatura %PDF- prevalece sobre o cabeçalho (PDFs servidos como octet-stream ou
+    text/html); um "PDF" cujo corpo é marcação é tratado como HTML (página de erro/login).
+    """
+    if b'%PDF-' in head[:1024]:
+        return 'pdf'
+    declared = content_kind(content_type)
+    looks_like_markup = head.lstrip()[:1] == b'<'
+    if declared == 'pdf' and looks_like_markup:
+        return 'html'
+    if declared == 'binary' and looks_like_markup and any(
+        tag in head[:1024].lower() for tag in (b'<html', b'<!doctype html', b'<head', b'<body')
+    ):
+        return 'html'
+    return declared
+
+def _charset(headers: CaseInsensitiveDict) -> Optional[str]:
+    """Charset declarado no Content-Type (None se ausente)"""
+    match = _CHARSET_RE.search(headers.get('Content-Type', ''))
+    return match.group(1) if match else None
+
+def _parse_host_limits(spec: str) -> List[Tuple[str, int, float]]:
+    """'g1.globo.com=1/1.0,statista.com=1/2' → [(host, máx. simultâneas, intervalo)]"""
+    limits = []
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        try:
+            host, _, value = item.partition('=')
+            max_in_flight, _, interval = value.partition('/')
+            host = host.strip().lower()
+            limits.append((host[4:] if host.startswith('www.') else host, int(max_in_flight), float(interval or 0)))
+        except ValueError:
+            logger.warning(f"⚠️ FETCH_HOST_LIMITS inválido ignorado: {item}")
+    return limits
+
+class DNSCache:
+    """Resultados de getaddrinfo por TTL (LRU), compartilhados por todas as conexões do motor"""
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.time():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Tuple, infos: Any):
+        with self._lock:
+            self._entries[key] = (infos, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class _HostGate:
+    """Vagas e espaçamento de um host dentro do event loop do motor.
+
+    O semáforo limita as requisições simultâneas; cada requisição que obtém vaga reserva o
+    próximo horário de início (intervalo mínimo + jitter) e aguarda com asyncio.sleep, sem
+    ocupar thread. Backoff (429/Retry-After) bloqueia novos inícios até o prazo.
+    """
+
+    def __init__(self, host: str, max_in_flight: int, min_interval: float, jitter: float):
+        self.host = host
+        self.max_in_flight = max(1, max_in_flight)
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.next_allowed = 0.0
+        self.blocked_until = 0.0
+        self.waiting = 0
+        self.in_flight = 0
+        self.dispatched = 0
+        self.last_used = time.time()
+
+    async def acquire(self):
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+            try:
+                while True:
+                    now = time.time()
+                    start = max(now, self.next_allowed, self.blocked_until)
+                    self.next_allowed = start + self.min_interval + random.uniform(0, self.jitter)
+                    if start <= now:
+                        break
+                    await asyncio.sleep(start - now)
+                    if time.time() >= self.blocked_until:
+                        break  # backoff aplicado durante a espera exige nova reserva
+            except BaseException:
+                self.semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.dispatched += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self.semaphore.release()
+
+    def is_idle(self, now: float) -> bool:
+        """Sem uso no último minuto, sem fila, sem requisição em curso e sem backoff pendente"""
+        return (not self.waiting and not self.in_flight and now - self.last_used >= 60
+                and max(self.next_allowed, self.blocked_until) <= now)
+
+    def backoff(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.time() + seconds)
+        logger.info(f"⏸️ fetch/{self.host}: próxima requisição adiada {seconds:.1f}s")
+
+    def to_status(self) -> Dict[str, Any]:
+        return {
+            'queued': self.waiting,
+            'in_flight': self.in_flight,
+            'max_in_flight': self.max_in_flight,
+            'min_interval': self.min_interval,
+            'jitter': self.jitter,
+            'next_allowed_in': round(max(self.next_allowed, self.blocked_until, time.time()) - time.time(), 2),
+            'dispatched': self.dispatched
+        }
+
+class _DNSCachingEventLoop(asyncio.SelectorEventLoop):
+    """Loop do motor: getaddrinfo (usado pelo httpx ao abrir conexões) passa pelo DNSCache"""
+
+    def __init__(self, dns_cache: DNSCache):
+        super().__init__()
+        self.dns_cache = dns_cache
+
+    async def getaddrinfo(self, host, port, *, family=0, type=0, proto=0, flags=0):
+        key = (host, port, family, type, proto, flags)
+        infos = self.dns_cache.get(key)
+        if infos is None:
+            infos = await super().getaddrinfo(host, port, family=family, type=type, proto=proto, flags=flags)
+            self.dns_cache.set(key, infos)
+        return infos
+
+class FetchEngine:
+    """Downloads concorrentes sem ocupar uma thread por requisição.
+
+    Com httpx: um AsyncClient por processo roda num event loop em thread de background
+    (iniciado sob demanda e recriado após fork), com FETCH_MAX_CONNECTIONS conexões,
+    FETCH_MAX_KEEPALIVE conexões ociosas reaproveitadas, HTTP/2 se o pacote h2 estiver
+    instalado e cache de DNS de FETCH_DNS_TTL segundos. afetch() é a API assíncrona;
+    fetch() é a fachada síncrona para o código baseado em threads.
+
+    Toda requisição respeita o limite por host: no máximo FETCH_HOST_MAX_IN_FLIGHT
+    simultâneas e FETCH_HOST_INTERVAL (+ jitter) entre inícios no mesmo domínio, com recuo
+    após 429. Com httpx isso é feito dentro do loop (_HostGate), então a concorrência total
+    só é limitada pelo pool de conexões; sem httpx, pela sessão requests com pool e o
+    agendador por host em threads (PolitenessScheduler 'fetch').
+    Erros são sempre exceções do requests (Timeout, ConnectionError, HTTPError); fila do
+    host acima de FETCH_HOST_QUEUE_TIMEOUT ou backoff além desse prazo viram
+    FetchRejected('host_busy') na hora, não timeout de rede.
+    """
+
+    def __init__(self):
+        self.max_connections = int(os.getenv('FETCH_MAX_CONNECTIONS', 100))
+        self.max_keepalive = int(os.getenv('FETCH_MAX_KEEPALIVE', 40))
+        self.keepalive_expiry = float(os.getenv('FETCH_KEEPALIVE_EXPIRY', 30))
+        self.connect_timeout = float(os.getenv('FETCH_CONNECT_TIMEOUT', 10))
+        self.default_timeout = float(os.getenv('FETCH_TIMEOUT', 30))
+        self.verify_ssl = os.getenv('FETCH_VERIFY_SSL', 'false').lower() == 'true'
+        self.http2 = HAS_HTTPX and HAS_H2 and os.getenv('FETCH_HTTP2', 'true').lower() == 'true'
+        self.dns_cache = DNSCache(float(os.getenv('FETCH_DNS_TTL', 300)))
+        # Corpo lido em streaming até o limite do tipo: HTML/texto acima disso é truncado
+        # (parsers lidam com documento parcial); PDF acima disso é abortado (inutilizável
+        # sem o fim do arquivo); tipos binários são recusados antes de ler o corpo
+        self.byte_limits = {
+            'html': int(os.getenv('FETCH_MAX_HTML_BYTES', 2 * 1024 * 1024)),
+            'text': int(os.getenv('FETCH_MAX_TEXT_BYTES', 1024 * 1024)),
+            'pdf': int(os.getenv('FETCH_MAX_PDF_BYTES', 20 * 1024 * 1024))
+        }
+        self.chunk_size = 64 * 1024
+
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client = None
+        self._session: Optional[requests.Session] = None
+
+        # Ritmo por host (padrão + exceções de FETCH_HOST_LIMITS); um domínio lento ou
+        # espaçado não trava os demais
+        self.host_backoff = float(os.getenv('FETCH_HOST_BACKOFF', 30))
+        self.host_queue_timeout = float(os.getenv('FETCH_HOST_QUEUE_TIMEOUT', 30))
+        self.host_defaults = (
+            int(os.getenv('FETCH_HOST_MAX_IN_FLIGHT', 2)),
+            float(os.getenv('FETCH_HOST_INTERVAL', 0.5)),
+            float(os.getenv('FETCH_HOST_JITTER', 0.25))
+        )
+        self.host_limits = {
+            host: (max_in_flight, min_interval)
+            for host, max_in_flight, min_interval in _parse_host_limits(os.getenv('FETCH_HOST_LIMITS', ''))
+        }
+        self._gates: Dict[str, _HostGate] = {}
+        self._gates_swept_at = 0.0
+
+        # Fallback sem httpx: mesmo ritmo, aplicado pelo agendador em threads
+        self.host_scheduler: Optional[PolitenessScheduler] = None
+        if not HAS_HTTPX:
+            max_in_flight, min_interval, jitter = self.host_defaults
+            self.host_scheduler = PolitenessScheduler(
+                'fetch',
+                max_workers=int(os.getenv('FETCH_SCHEDULER_WORKERS', 32)),
+                min_interval=min_interval,
+                jitter=jitter,
+                max_in_flight=max_in_flight
+            )
+            for host, (host_max_in_flight, host_interval) in self.host_limits.items():
+                self.host_scheduler.configure(host, min_interval=host_interval, max_in_flight=host_max_in_flight)
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'requests': 0, 'errors': 0, 'http2_responses': 0, 'bytes': 0, 'total_time': 0.0,
+            'truncated': 0, 'rejected': 0, 'host_busy': 0
+        }
+
+        backend = f"httpx{' + HTTP/2' if self.http2 else ''}" if HAS_HTTPX else 'requests (httpx não instalado)'
+        logger.info(f"🌐 Fetch Engine: {backend}, {self.max_connections} conexões")
+
+    async def afetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+                     timeout: Optional[float] = None) -> FetchResponse:
+        """GET assíncrono; retorna a resposta lida (qualquer status) ou levanta erro de rede"""
+        if not HAS_HTTPX:
+            return await asyncio.wrap_future(self._submit_requests(url, headers, timeout))
+        loop = self._ensure_loop()
+        coro = self._fetch_gated(url, headers, timeout)
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+              timeout: Optional[float] = None) -> FetchResponse:
+        """Fachada síncrona de afetch (segura para chamar de qualquer thread)"""
+        if not HAS_HTTPX:
+            return self._submit_requests(url, headers, timeout).result()
+
+        future = asyncio.run_coroutine_threadsafe(self._fetch_gated(url, headers, timeout), self._ensure_loop())
+        try:
+            # Fila do host + download; margem além dos limites aplicados dentro do loop
+            return future.result(self.host_queue_timeout + self._total_timeout(timeout) + 5)
+        except FutureTimeoutError:
+            future.cancel()
+            self._count_error()
+            raise requests.exceptions.Timeout(f"Timeout ao baixar {url}")
+
+    def _total_timeout(self, timeout: Optional[float]) -> float:
+        """Tempo máximo do download em si (o timeout do httpx vale por operação de leitura)"""
+        return self.connect_timeout + (timeout or self.default_timeout)
+
+    async def _fetch_gated(self, url: str, headers: Optional[Dict[str, str]],
+                           timeout: Optional[float]) -> FetchResponse:
+        """Aguarda a vaga do host no loop, baixa e respeita 429 do host"""
+        host = url_domain(url)
+        gate = self._gate(host)
+        # Backoff (Retry-After) além do prazo da fila: falha já, sem ocupar a fila à toa
+        blocked_for = gate.blocked_until - time.time()
+        if blocked_for > self.host_queue_timeout:
+            self._count_host_busy()
+            raise FetchRejected(f"Host {host} em backoff por mais {blocked_for:.0f}s: {url}", 'host_busy')
+        try:
+            await asyncio.wait_for(gate.acquire(), self.host_queue_timeout)
+        except asyncio.TimeoutError:
+            self._count_host_busy()
+            raise FetchRejected(f"Fila do host {host} excedeu {self.host_queue_timeout:.0f}s: {url}", 'host_busy')
+
+        try:
+            response = await asyncio.wait_for(
+                self._fetch_with_httpx(url, headers, timeout), self._total_timeout(timeout)
+            )
+        except asyncio.TimeoutError:
+            self._count_error()
+            raise requests.exceptions.Timeout(f"Timeout ao baixar {url}")
+        finally:
+            gate.release()
+
+        self._apply_backoff(response, gate.backoff)
+        return response
+
+    def _gate(self, host: str) -> _HostGate:
+        """Vagas do host (criadas no loop do motor; ociosas são descartadas a cada minuto)"""
+        gate = self._gates.get(host)
+        if gate is None:
+            self._sweep_gates()
+            max_in_flight, min_interval, jitter = self.host_defaults
+            max_in_flight, min_interval = self.host_limits.get(host, (max_in_flight, min_interval))
+            gate = self._gates[host] = _HostGate(host, max_in_flight, min_interval, jitter)
+        gate.last_used = time.time()
+        return gate
+
+    def _sweep_gates(self):
+        """Remove gates ociosos: quem crawleia muitos domínios não acumula um por host para sempre"""
+        now = time.time()
+        if now - self._gates_swept_at < 60:
+            return
+        self._gates_swept_at = now
+        for host in [host for host, gate in self._gates.items() if gate.is_idle(now)]:
+            del self._gates[host]
+
+    def _submit_requests(self, url: str, headers: Optional[Dict[str, str]], timeout: Optional[float]) -> Future:
+        """Enfileira o GET no agendador por host (fallback sem httpx)"""
+        return self.host_scheduler.submit(url_domain(url), self._fetch_now, url, headers, timeout)
+
+    def _fetch_now(self, url: str, headers: Optional[Dict[str, str]], timeout: Optional[float]) -> FetchResponse:
+        """Executa o GET pela sessão requests (na vaga liberada pelo agendador)"""
+        response = self._fetch_with_requests(url, headers, timeout)
+        host = url_domain(url)
+        self._apply_backoff(response, lambda seconds: self.host_scheduler.backoff(host, seconds))
+        return response
+
+    def _apply_backoff(self, response: FetchResponse, backoff):
+        """Recua o host após 429 (ou 503 com Retry-After)"""
+        if response.status_code in (429, 503) and 'Retry-After' in response.headers:
+            backoff(self._retry_after(response))
+        elif response.status_code == 429:
+            backoff(self.host_backoff)
+
+    def _retry_after(self, response: FetchResponse) -> float:
+        """Retry-After em segundos (data HTTP ou valor inválido usam FETCH_HOST_BACKOFF), limitado a 5 min"""
+        try:
+            return min(max(float(response.headers['Retry-After']), 1.0), 300.0)
+        except ValueError:
+            return self.host_backoff
+
+    async def _fetch_with_httpx(self, url: str, headers: Optional[Dict[str, str]],
+                                timeout: Optional[float]) -> FetchResponse:
+        """GET em streaming no loop do motor, com erros do httpx traduzidos para os do requests"""
+        start = time.time()
+        client = self._get_client()
+        try:
+            async with client.stream(
+                'GET',
+                url,
+                headers=headers,
+                timeout=httpx.Timeout(timeout or self.default_timeout, connect=self.connect_timeout)
+            ) as response:
+                result_headers = CaseInsensitiveDict(response.headers.items())
+                body = bytearray()
+                kind, limit, truncated = None, 0, False
+                async for chunk in response.aiter_bytes(self.chunk_size):
+                    if kind is None:
+                        kind, limit = self._byte_limit(url, response.status_code, result_headers, chunk)
+                    body += chunk
+                    if len(body) >= limit:
+                        truncated = self._over_limit(url, kind, limit)
+                        break
+                if kind is None:
+                    kind, limit = self._byte_limit(url, response.status_code, result_headers, b'')
+        except httpx.TimeoutException as e:
+            self._count_error()
+            raise requests.exceptions.Timeout(str(e) or f"Timeout ao baixar {url}")
+        except httpx.HTTPError as e:
+            self._count_error()
+            raise requests.exceptions.ConnectionError(str(e) or f"Erro de conexão com {url}")
+
+        result = FetchResponse(
+            url=str(response.url),
+            status_code=response.status_code,
+            headers=result_headers,
+            content=bytes(body[:limit]),
+            encoding=_charset(result_headers),
+            http_version=response.http_version,
+            elapsed=time.time() - start,
+            truncated=truncated,
+            kind=kind
+        )
+        self._count(result)
+        return result
+
+    def _fetch_with_requests(self, url: str, headers: Optional[Dict[str, str]],
+                             timeout: Optional[float]) -> FetchResponse:
+        """GET em streaming pela sessão requests com pool (fallback sem httpx)"""
+        start = time.time()
+        try:
+            response = self._get_session().get(
+                url,
+                headers=headers,
+                timeout=(self.connect_timeout, timeout or self.default_timeout),
+                verify=self.verify_ssl,
+                allow_redirects=True,
+                stream=True
+            )
+            try:
+                result_headers = CaseInsensitiveDict(response.headers)
+                body = bytearray()
+                kind, limit, truncated = None, 0, False
+                for chunk in response.iter_content(self.chunk_size):
+                    if kind is None:
+                        kind, limit = self._byte_limit(url, response.status_code, result_headers, chunk)
+                    body += chunk
+                    if len(body) >= limit:
+                        truncated = self._over_limit(url, kind, limit)
+                        break
+                if kind is None:
+                    kind, limit = self._byte_limit(url, response.status_code, result_headers, b'')
+            finally:
+                # Fechar sem consumir o resto descarta a conexão em vez de baixar o excedente
+                response.close()
+        except FetchRejected:
+            raise
+        except requests.exceptions.RequestException:
+            self._count_error()
+            raise
+
+        result = FetchResponse(
+            url=response.url,
+            status_code=response.status_code,
+            headers=result_headers,
+            content=bytes(body[:limit]),
+            encoding=_charset(result_headers),
+            elapsed=time.time() - start,
+            truncated=truncated,
+            kind=kind
+        )
+        self._count(result)
+        return result
+
+    def _byte_limit(self, url: str, status_code: int, headers: CaseInsensitiveDict,
+                    head: bytes) -> Tuple[str, int]:
+        """Categoria (sniffing do primeiro chunk) e limite de bytes; recusa o que não vale baixar"""
+        if status_code >= 300:
+            return 'text', self.byte_limits['text']  # corpo de erro/redirect não é usado
+        kind = sniff_kind(headers.get('Content-Type', ''), head)
+        if kind == 'binary':
+            self._count_rejected()
+            raise FetchRejected(f"Tipo não suportado ({headers.get('Content-Type')}): {url}", 'unsupported_content')
+        limit = self.byte_limits[kind]
+        declared = headers.get('Content-Length', '')
+        if kind == 'pdf' and declared.isdigit() and int(declared) > limit:
+            self._count_rejected()
+            raise FetchRejected(f"PDF de {int(declared) // 1024} KB acima do limite: {url}", 'too_large')
+        return kind, limit
+
+    def _over_limit(self, url: str, kind: str, limit: int) -> bool:
+        """Corpo atingiu o limite: HTML/texto seguem truncados, PDF é abortado"""
+        if kind == 'pdf':
+            self._count_rejected()
+            raise FetchRejected(f"PDF acima de {limit // 1024} KB: {url}", 'too_large')
+        logger.info(f"✂️ Download truncado em {limit // 1024} KB: {url}")
+        return True
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop do processo atual em thread de background (seguro após fork)"""
+        if self._loop is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return self._loop
+
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return self._loop
+            # Loop, cliente, conexões e vagas herdados do processo pai não são utilizáveis
+            self._client = None
+            self._gates = {}
+            self.dns_cache.clear()
+            self._loop = _DNSCachingEventLoop(self.dns_cache)
+            self._thread = threading.Thread(target=self._loop.run_forever, name='fetch-engine', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+            return self._loop
+
+    def _get_client(self):
+        """AsyncClient do loop do motor (criado dentro do próprio loop)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                    keepalive_expiry=self.keepalive_expiry
+                ),
+                headers=DEFAULT_HEADERS,
+                follow_redirects=True,
+                verify=self.verify_ssl
+            )
+        return self._client
+
+    def _get_session(self) -> requests.Session:
+        """Sessão requests do processo atual (fallback)"""
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                self._session = create_pooled_session(
+                    pool_connections=self.max_connections,
+                    pool_maxsize=self.max_keepalive,
+                    headers=DEFAULT_HEADERS
+                )
+                self._pid = os.getpid()
+            return self._session
+
+    def close(self):
+        """Fecha as conexões do processo atual (recriadas no próximo fetch)"""
+        with self._lock:
+            client, loop = self._client, self._loop
+            self._client = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            self.dns_cache.clear()
+        if client is not None and loop is not None and self._pid == os.getpid() and loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(5)
+            except Exception as e:
+                logger.debug(f"Falha ao fechar cliente httpx: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Configuração e contadores do motor"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        if self.host_scheduler is not None:
+            hosts = self.host_scheduler.get_status()
+        else:
+            hosts = {host: gate.to_status() for host, gate in list(self._gates.items())}
+        return {
+            'hosts_tracked': len(hosts),
+            'busy_hosts': {host: state for host, state in hosts.items() if state['queued'] or state['in_flight']},
+            'backend': 'httpx' if HAS_HTTPX else 'requests',
+            'http2': self.http2,
+            'max_connections': self.max_connections,
+            'max_keepalive': self.max_keepalive,
+            'byte_limits': self.byte_limits,
+            'dns_cache': {'hits': self.dns_cache.hits, 'misses': self.dns_cache.misses},
+            'avg_response_time': round(stats['total_time'] / stats['requests'], 3) if stats['requests'] else 0.0,
+            **stats
+        }
+
+    def _count(self, response: FetchResponse):
+        with self._stats_lock:
+            self._stats['requests'] += 1
+            self._stats['bytes'] += len(response.content)
+            self._stats['total_time'] += response.elapsed
+            self._stats['truncated'] += int(response.truncated)
+            if response.http_version == 'HTTP/2':
+                self._stats['http2_responses'] += 1
+
+    def _count_rejected(self):
+        with self._stats_lock:
+            self._stats['rejected'] += 1
+
+    def _count_host_busy(self):
+        with self._stats_lock:
+            self._stats['host_busy'] += 1
+
+    def _count_error(self):
+        with self._stats_lock:
+            self._stats['requests'] += 1
+            self._stats['errors'] += 1
+
+# Instância global
+fetch_engine = FetchEngine()
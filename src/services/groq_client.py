@@ -7,7 +7,7 @@ Cliente para interagir com a API da Groq, servindo como um provedor de IA de alt
 import os
 import logging
 import time
-from typing import Optional
+from typing import Optional, Dict, Any
 
 try:
     from groq import Groq
@@ -53,6 +53,20 @@ class GroqClient:
         Returns:
             Optional[str]: O texto gerado ou None em caso de falha.
         """
+        return self.generate_with_metadata(prompt, max_tokens=max_tokens)['content']
+
+    def generate_with_metadata(self, prompt: str, max_tokens: int = 8192, json_mode: bool = False) -> Dict[str, Any]:
+        """
+        Gera texto usando um modelo da Groq e retorna metadados da geração.
+
+        Args:
+            prompt (str): O prompt para a geração de texto.
+            max_tokens (int): O número máximo de tokens a serem gerados.
+            json_mode (bool): Solicita saída em JSON válido (response_format json_object).
+
+        Returns:
+            Dict[str, Any]: 'content', 'finish_reason' e 'output_tokens' (quando informado pela API).
+        """
         if not self.is_enabled():
             raise Exception("Cliente Groq não está habilitado ou configurado corretamente.")
 
@@ -69,11 +83,18 @@ class GroqClient:
                 model="llama3-70b-8192",
                 max_tokens=max_tokens,
                 temperature=0.4, # Temperatura um pouco mais baixa para consistência
+                **({"response_format": {"type": "json_object"}} if json_mode else {})
             )
-            response_text = chat_completion.choices[0].message.content
+            choice = chat_completion.choices[0]
+            response_text = choice.message.content
+            usage = getattr(chat_completion, 'usage', None)
             processing_time = time.time() - start_time
             logger.info(f"✅ Groq gerou {len(response_text)} caracteres em {processing_time:.2f}s")
-            return response_text
+            return {
+                'content': response_text,
+                'finish_reason': getattr(choice, 'finish_reason', None),
+                'output_tokens': getattr(usage, 'completion_tokens', None) if usage else None
+            }
         except Exception as e:
             logger.error(f"❌ Erro na chamada da API Groq: {e}", exc_info=True)
             raise
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - HTTP Pool
+Sessões HTTP keep-alive com pool de conexões, uma por provedor
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_pid: Optional[int] = None
+_lock = threading.Lock()
+
+def create_pooled_session(
+    pool_connections: int = None,
+    pool_maxsize: int = None,
+    headers: Optional[Dict[str, str]] = None
+) -> requests.Session:
+    """Cria sessão requests com pool de conexões dimensionado para uso concorrente"""
+    pool_connections = pool_connections or int(os.getenv('HTTP_POOL_CONNECTIONS', 10))
+    pool_maxsize = pool_maxsize or int(os.getenv('HTTP_POOL_MAXSIZE', 20))
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+def get_provider_session(provider: str, headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """Retorna a sessão keep-alive compartilhada do provedor (uma por processo)"""
+    global _sessions_pid
+
+    with _lock:
+        # Conexões não podem ser herdadas entre processos (gunicorn com preload_app)
+        if _sessions_pid != os.getpid():
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+
+        session = _sessions.get(provider)
+        if session is None:
+            session = create_pooled_session(headers=headers)
+            _sessions[provider] = session
+            logger.info(f"🔌 Sessão HTTP com pool criada para {provider}")
+        return session
+
+def close_provider_sessions():
+    """Fecha todas as sessões do processo atual"""
+    with _lock:
+        for session in _sessions.values():
+            try:
+                session.close()
+            except Exception:
+                pass
+        _sessions.clear()
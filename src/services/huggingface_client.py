@@ -7,9 +7,11 @@ Cliente REAL para integração com HuggingFace API - SEM SIMULAÇÃO
 
 import os
 import logging
-import requests
+import time
 import json
 from typing import Optional, Dict, Any
+from services.http_pool import get_provider_session
+from services.huggingface_warmup import huggingface_warmup
 
 logger = logging.getLogger(__name__)
 
@@ -64,8 +66,8 @@ class HuggingFaceClient:
             return None
         
         try:
-            # Tenta diferentes modelos se o principal falhar
-            for model in self.available_models:
+            # Tenta diferentes modelos se o principal falhar (modelos warm primeiro)
+            for model in huggingface_warmup.order_models(self.available_models):
                 try:
                     model_url = f"https://api-inference.huggingface.co/models/{model}"
                     
@@ -84,12 +86,14 @@ class HuggingFaceClient:
                         }
                     }
                     
-                    response = requests.post(
+                    request_start = time.time()
+                    response = get_provider_session('huggingface').post(
                         model_url,
                         headers=self.headers,
                         json=payload,
                         timeout=timeout
                     )
+                    huggingface_warmup.mark(model, response.status_code, time.time() - request_start)
                     
                     if response.status_code == 200:
                         data = response.json()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - HuggingFace Warm-up Scheduler
+Mantém os modelos configurados carregados e informa quais estão prontos (warm)
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Any
+
+from services.http_pool import get_provider_session
+
+logger = logging.getLogger(__name__)
+
+class HuggingFaceWarmupScheduler:
+    """Sonda periodicamente os modelos HuggingFace para mantê-los carregados"""
+
+    STATUS_ORDER = {'warm': 0, 'unknown': 1, 'loading': 2, 'error': 3}
+
+    def __init__(self):
+        """Inicializa o agendador de warm-up"""
+        self.enabled = os.getenv('HUGGINGFACE_WARMUP_ENABLED', 'true').lower() == 'true'
+        self.interval = int(os.getenv('HUGGINGFACE_WARMUP_INTERVAL', 240))
+        self.warm_ttl = int(os.getenv('HUGGINGFACE_WARM_TTL', 600))
+        self.base_url = 'https://api-inference.huggingface.co/models/'
+        self.api_key: Optional[str] = None
+
+        self.models: List[str] = []
+        self.model_state: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_pid: Optional[int] = None
+
+    def configure(self, api_key: str, base_url: Optional[str] = None):
+        """Define credenciais usadas nas sondagens"""
+        self.api_key = api_key
+        if base_url:
+            self.base_url = base_url
+
+    def register_models(self, models: List[str]):
+        """Registra modelos a serem mantidos carregados"""
+        with self._lock:
+            for model in models:
+                if model not in self.models:
+                    self.models.append(model)
+                self.model_state.setdefault(model, self._new_state())
+
+    def ensure_started(self):
+        """Inicia a thread de warm-up no processo atual (seguro após fork)"""
+        if not self.enabled or not self.api_key or not self.models:
+            return
+
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._thread_pid == os.getpid():
+                return
+            self._stop.clear()
+            self._thread_pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='hf-warmup', daemon=True)
+            self._thread.start()
+        logger.info(f"🔥 Warm-up HuggingFace iniciado para {len(self.models)} modelos (intervalo {self.interval}s)")
+
+    def stop(self):
+        """Interrompe a thread de warm-up"""
+        self._stop.set()
+
+    def mark(self, model: str, status_code: int, latency: Optional[float] = None, estimated_time: Optional[float] = None):
+        """Atualiza o estado do modelo a partir de uma resposta real ou de sondagem"""
+        with self._lock:
+            state = self.model_state.setdefault(model, self._new_state())
+            state['last_checked'] = time.time()
+            state['last_status_code'] = status_code
+
+            if status_code == 200:
+                state['status'] = 'warm'
+                state['warm_since'] = state.get('warm_since') or time.time()
+                if latency is not None:
+                    state['last_latency'] = latency
+            elif status_code == 503:
+                state['status'] = 'loading'
+                state['warm_since'] = None
+                state['estimated_time'] = estimated_time
+            else:
+                state['status'] = 'error'
+                state['warm_since'] = None
+
+    def is_warm(self, model: str) -> bool:
+        """Modelo respondeu 200 recentemente"""
+        state = self.model_state.get(model)
+        return bool(state and state['status'] == 'warm' and time.time() - state['last_checked'] < self.warm_ttl)
+
+    def order_models(self, models: List[str]) -> List[str]:
+        """Ordena modelos priorizando os warm (ordem estável para empates)"""
+        def sort_key(item):
+            index, model = item
+            state = self.model_state.get(model) or self._new_state()
+            status = state['status']
+            if status == 'warm' and not self.is_warm(model):
+                status = 'unknown'
+            return (self.STATUS_ORDER.get(status, 1), index)
+
+        return [model for _, model in sorted(enumerate(models), key=sort_key)]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Retorna estado dos modelos monitorados"""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'running': bool(self._thread and self._thread.is_alive()),
+                'interval': self.interval,
+                'models': {name: dict(state) for name, state in self.model_state.items()}
+            }
+
+    def _new_state(self) -> Dict[str, Any]:
+        return {
+            'status': 'unknown',
+            'last_checked': 0.0,
+            'last_status_code': None,
+            'last_latency': None,
+            'estimated_time': None,
+            'warm_since': None
+        }
+
+    def _run(self):
+        """Loop de sondagem em background"""
+        while not self._stop.is_set():
+            for model in list(self.models):
+                if self._stop.is_set():
+                    break
+                self._probe(model)
+            self._stop.wait(self.interval)
+
+    def _probe(self, model: str):
+        """Sonda leve: 1 token, sem esperar o carregamento (o 503 já dispara o load)"""
+        session = get_provider_session('huggingface')
+        payload = {
+            "inputs": "ping",
+            "parameters": {"max_new_tokens": 1},
+            "options": {"wait_for_model": False, "use_cache": True}
+        }
+
+        start = time.time()
+        try:
+            response = session.post(
+                f"{self.base_url}{model}",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                json=payload,
+                timeout=30
+            )
+            estimated_time = None
+            if response.status_code == 503:
+                try:
+                    estimated_time = response.json().get('estimated_time')
+                except ValueError:
+                    pass
+            self.mark(model, response.status_code, time.time() - start, estimated_time)
+            logger.debug(f"🔥 Sondagem {model}: {response.status_code}")
+        except Exception as e:
+            self.mark(model, 0)
+            logger.debug(f"⚠️ Falha na sondagem de {model}: {e}")
+
+# Instância global
+huggingface_warmup = HuggingFaceWarmupScheduler()
@@ -227,6 +227,7 @@ class LocalFileManager:
                             'created_at': metadata.get('created_at'),
                             'segmento': metadata.get('project_data', {}).get('segmento'),
                             'produto': metadata.get('project_data', {}).get('produto'),
+                            'publico': metadata.get('project_data', {}).get('publico'),
                             'total_files': metadata.get('total_files', 0),
                             'quality_score': metadata.get('quality_score', 0),
                             'processing_time': metadata.get('processing_time', 0)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Negative Cache
+Lembra URLs cuja extração falhou, com validade por classe de erro, para não repetir
+downloads e cascatas de extratores que já se sabe que vão falhar
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+
+from services.sqlite_store import SQLiteStore
+from services.single_flight import COORDINATION_DB
+from services.content_cache import canonical_url
+
+logger = logging.getLogger(__name__)
+
+# Classe de erro → validade padrão (segundos); sobrescrita por NEGATIVE_CACHE_TTL_<CLASSE>
+DEFAULT_TTLS = {
+    'not_found': 7 * 86400,        # 404 / 410
+    'forbidden': 3 * 86400,        # 401 / 403
+    'paywall': 3 * 86400,
+    'client_error': 86400,         # demais 4xx
+    'unsupported_content': 7 * 86400,  # imagem, vídeo, zip...
+    'too_large': 7 * 86400,        # PDF acima de FETCH_MAX_PDF_BYTES
+    'extraction_failed': 86400,    # baixou, mas nenhum extrator produziu conteúdo
+    'server_error': 1800,          # 5xx
+    'connection': 1800,            # DNS, recusa, SSL
+    'rate_limited': 600,           # 429
+    'timeout': 600
+}
+
+# Erros transitórios: só estes justificam retry imediato
+RETRYABLE_CLASSES = {'timeout', 'connection', 'server_error'}
+
+# Recusas do próprio motor (fila/backoff do host): não entram no cache negativo nem no
+# rendimento do domínio, e repetir logo só volta para a mesma fila
+LOCAL_CLASSES = {'host_busy'}
+
+PAYWALL_MARKERS = [
+    'paywall', 'conteúdo exclusivo para assinantes', 'exclusivo para assinantes',
+    'assine para continuar', 'assine para ler', 'já é assinante', 'faça login para continuar',
+    'subscribe to continue', 'subscribe to read', 'subscribers only', 'already a subscriber'
+]
+
+def classify_status(status_code: int) -> Optional[str]:
+    """Classe de erro de uma resposta HTTP (None para status de sucesso)"""
+    if status_code in (404, 410):
+        return 'not_found'
+    if status_code in (401, 403):
+        return 'forbidden'
+    if status_code == 402:
+        return 'paywall'
+    if status_code == 429:
+        return 'rate_limited'
+    if status_code >= 500:
+        return 'server_error'
+    if status_code >= 400:
+        return 'client_error'
+    return None
+
+def classify_exception(error: Exception) -> str:
+    """Classe de erro de uma exceção de download"""
+    if getattr(error, 'error_class', None):
+        return error.error_class  # FetchRejected (fetch_engine)
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return classify_status(error.response.status_code) or 'server_error'
+    if isinstance(error, requests.exceptions.Timeout):
+        return 'timeout'
+    return 'connection'
+
+def looks_paywalled(html: str) -> bool:
+    """Página contém avisos típicos de paywall"""
+    html_lower = html.lower()
+    return any(marker in html_lower for marker in PAYWALL_MARKERS)
+
+class NegativeCache:
+    """Falhas recentes por URL canônica, compartilhadas entre workers via SQLite"""
+
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS negative_cache (
+            url_key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            error_class TEXT NOT NULL,
+            detail TEXT,
+            failures INTEGER NOT NULL,
+            expires_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_negative_cache_expires ON negative_cache(expires_at)"
+    ]
+
+    def __init__(self, db_path: str = COORDINATION_DB):
+        self.enabled = os.getenv('NEGATIVE_CACHE_ENABLED', 'true').lower() == 'true'
+        self.ttls = {
+            error_class: int(os.getenv(f'NEGATIVE_CACHE_TTL_{error_class.upper()}', ttl))
+            for error_class, ttl in DEFAULT_TTLS.items()
+        }
+
+        self.store: Optional[SQLiteStore] = None
+        try:
+            self.store = SQLiteStore(db_path, self.SCHEMA)
+        except Exception as e:
+            logger.warning(f"⚠️ Cache negativo indisponível: {e}")
+
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self.stats = {'hits': 0, 'recorded': 0, 'domain_skips': 0}
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Falha ainda válida para a URL ({'error_class', 'detail', 'expires_at'}) ou None"""
+        if not self.enabled or self.store is None:
+            return None
+        try:
+            row = self.store.execute(
+                "SELECT error_class, detail, failures, expires_at FROM negative_cache "
+                "WHERE url_key = ? AND expires_at > ?",
+                (canonical_url(url), time.time())
+            ).fetchone()
+        except Exception as e:
+            logger.debug(f"Falha ao ler cache negativo para {url}: {e}")
+            return None
+        if row is None:
+            return None
+        return {'error_class': row[0], 'detail': row[1], 'failures': row[2], 'expires_at': row[3]}
+
+    def record(self, url: str, error_class: str, detail: str = ''):
+        """Registra a falha com a validade da classe de erro"""
+        if not self.enabled or self.store is None:
+            return
+        now = time.time()
+        ttl = self.ttls.get(error_class, self.ttls['connection'])
+        try:
+            self.store.execute(
+                "INSERT INTO negative_cache (url_key, url, error_class, detail, failures, expires_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT(url_key) DO UPDATE SET error_class = excluded.error_class, detail = excluded.detail, "
+                "failures = failures + 1, expires_at = excluded.expires_at, updated_at = excluded.updated_at",
+                (canonical_url(url), url, error_class, detail[:200], now + ttl, now)
+            )
+        except Exception as e:
+            logger.debug(f"Falha ao gravar cache negativo para {url}: {e}")
+            return
+
+        logger.info(f"🚫 {url} em cache negativo por {ttl // 60} min ({error_class})")
+        with self._lock:
+            self.stats['recorded'] += 1
+            purge = now - self._last_purge > 3600
+            if purge:
+                self._last_purge = now
+        if purge:
+            self.purge_expired()
+
+    def count(self, outcome: str):
+        """Contabiliza hits / domain_skips"""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def purge_expired(self) -> int:
+        """Remove falhas vencidas"""
+        if self.store is None:
+            return 0
+        try:
+            return self.store.execute("DELETE FROM negative_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+        except Exception as e:
+            logger.debug(f"Falha na limpeza do cache negativo: {e}")
+            return 0
+
+    def clear(self, url: Optional[str] = None):
+        """Esquece a falha de uma URL (ou todas)"""
+        if self.store is None:
+            return
+        try:
+            if url:
+                self.store.execute("DELETE FROM negative_cache WHERE url_key = ?", (canonical_url(url),))
+            else:
+                self.store.execute("DELETE FROM negative_cache")
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao limpar cache negativo: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Validades, entradas ativas por classe e contadores"""
+        active: Dict[str, int] = {}
+        if self.store is not None:
+            try:
+                active = dict(self.store.execute(
+                    "SELECT error_class, COUNT(*) FROM negative_cache WHERE expires_at > ? GROUP BY error_class",
+                    (time.time(),)
+                ).fetchall())
+            except Exception:
+                pass
+        with self._lock:
+            stats = dict(self.stats)
+        return {'enabled': self.enabled, 'ttls': self.ttls, 'active': active, **stats}
+
+# Instância global
+negative_cache = NegativeCache()
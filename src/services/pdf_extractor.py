@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - PDF Extractor
+Extração de texto de PDFs em memória, num pool de processos, com limite de páginas,
+caracteres e tempo por documento (pypdf primeiro, pdfplumber só quando necessário)
+"""
+
+import io
+import os
+import time
+import signal
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Optional
+
+# Imports condicionais (pypdf é o sucessor do PyPDF2, com a mesma API de leitura)
+try:
+    from pypdf import PdfReader
+    HAS_PYPDF = True
+except ImportError:
+    try:
+        from PyPDF2 import PdfReader
+        HAS_PYPDF = True
+    except ImportError:
+        HAS_PYPDF = False
+
+try:
+    import pdfplumber
+    HAS_PDFPLUMBER = True
+except ImportError:
+    HAS_PDFPLUMBER = False
+
+logger = logging.getLogger(__name__)
+
+class _HardTimeout(Exception):
+    """Tempo do documento esgotado no meio de uma página (SIGALRM no processo do pool)"""
+
+def _on_alarm(signum, frame):
+    raise _HardTimeout()
+
+def _text_is_usable(text: str, pages_read: int, min_chars_per_page: int) -> bool:
+    """Texto do pypdf basta: volume por página e maioria de caracteres legíveis"""
+    stripped = ''.join(text.split())
+    if not stripped or len(stripped) < min_chars_per_page * max(pages_read, 1):
+        return False
+    readable = sum(1 for char in stripped if char.isalnum())
+    return readable / len(stripped) >= 0.6 and '(cid:' not in text
+
+def _read_pages(pages, max_pages: int, max_chars: Optional[int], deadline: float) -> Dict[str, Any]:
+    """Concatena o texto das páginas até o limite de páginas, caracteres ou tempo"""
+    parts = []
+    chars = 0
+    pages_read = 0
+    stop_reason = None
+    try:
+        for page in pages:
+            if pages_read >= max_pages:
+                stop_reason = 'page_limit'
+                break
+            if time.time() >= deadline:
+                stop_reason = 'time_limit'
+                break
+            page_text = page.extract_text() or ''
+            pages_read += 1
+            if page_text:
+                parts.append(page_text)
+                chars += len(page_text) + 1
+            if max_chars and chars >= max_chars:
+                stop_reason = 'char_limit'
+                break
+    except _HardTimeout:
+        stop_reason = 'time_limit'
+    return {'text': '\n'.join(parts), 'pages_read': pages_read, 'stop_reason': stop_reason}
+
+def extract_pdf_text(pdf_bytes: bytes, max_pages: int, max_chars: Optional[int], time_limit: float,
+                     min_chars_per_page: int = 100) -> Dict[str, Any]:
+    """Extrai o texto de um PDF em memória (roda no processo do pool).
+
+    pypdf primeiro (rápido); se o texto for pouco ou ilegível, pdfplumber com o tempo que
+    sobrar. Retorna {'text', 'extractor', 'pages_read', 'total_pages', 'stop_reason', 'error'}.
+    """
+    start = time.time()
+    deadline = start + time_limit
+    result: Dict[str, Any] = {
+        'text': '', 'extractor': None, 'pages_read': 0, 'total_pages': None, 'stop_reason': None, 'error': None
+    }
+
+    # Limite duro: SIGALRM interrompe uma página que trave (só no thread principal, i.e.
+    # no processo do pool; em modo thread vale só o limite entre páginas)
+    use_alarm = hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+
+    try:
+        return _extract_with_fallback(pdf_bytes, max_pages, max_chars, deadline, min_chars_per_page, result)
+    except _HardTimeout:
+        result['stop_reason'] = 'time_limit'
+        return result
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+def _extract_with_fallback(pdf_bytes: bytes, max_pages: int, max_chars: Optional[int], deadline: float,
+                           min_chars_per_page: int, result: Dict[str, Any]) -> Dict[str, Any]:
+    """pypdf e, se o texto não bastar, pdfplumber (ver extract_pdf_text)"""
+    if HAS_PYPDF:
+        try:
+            reader = PdfReader(io.BytesIO(pdf_bytes))
+            result['total_pages'] = len(reader.pages)
+            read = _read_pages(reader.pages, max_pages, max_chars, deadline)
+            result.update(read, extractor='pypdf')
+            if read['stop_reason'] == 'time_limit' or _text_is_usable(read['text'], read['pages_read'], min_chars_per_page):
+                return result
+        except _HardTimeout:
+            raise
+        except Exception as e:
+            result['error'] = f"pypdf: {e}"
+
+    if HAS_PDFPLUMBER and time.time() < deadline:
+        try:
+            with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+                total_pages = len(pdf.pages)
+                read = _read_pages(pdf.pages, max_pages, max_chars, deadline)
+            # Fica com o melhor dos dois (pdfplumber também pode falhar em PDFs escaneados)
+            if len(read['text'].strip()) > len(result['text'].strip()):
+                result.update(read, extractor='pdfplumber', total_pages=total_pages)
+        except _HardTimeout:
+            raise
+        except Exception as e:
+            result['error'] = f"{result['error']}; pdfplumber: {e}" if result['error'] else f"pdfplumber: {e}"
+    return result
+
+class PDFExtractor:
+    """Pool de processos dedicado à extração de PDFs.
+
+    pdfplumber é Python puro e segura o GIL: extraído no thread da requisição, um relatório
+    de 300 páginas congela todas as outras threads do worker. Aqui cada documento vai para
+    um dos PDF_WORKERS processos (criados sob demanda no processo atual, reciclados a cada
+    PDF_MAX_TASKS_PER_CHILD documentos), com no máximo PDF_MAX_PAGES páginas e PDF_TIMEOUT
+    segundos. O chamador espera no máximo o limite do documento + PDF_QUEUE_MARGIN; com
+    PDF_MAX_QUEUED documentos já aguardando vaga, falha na hora em vez de enfileirar
+    (a requisição HTTP não pode passar do timeout do gunicorn). Sem pool
+    (PDF_PROCESS_POOL=false ou falha ao criar), extrai no thread atual.
+
+    Anexos enviados pelo usuário usam uma instância própria (attachment_pdf_extractor,
+    PDF_ATTACHMENT_WORKERS / PDF_ATTACHMENT_MAX_QUEUED): a extração de páginas em segundo
+    plano nunca ocupa a vaga de um upload.
+    """
+
+    def __init__(self, name: str = 'web', workers: Optional[int] = None, max_queued: Optional[int] = None):
+        self.name = name
+        self.enabled = HAS_PYPDF or HAS_PDFPLUMBER
+        self.use_pool = os.getenv('PDF_PROCESS_POOL', 'true').lower() == 'true'
+        self.workers = workers or int(os.getenv('PDF_WORKERS', 2))
+        self.max_pages = int(os.getenv('PDF_MAX_PAGES', 50))
+        self.timeout = float(os.getenv('PDF_TIMEOUT', 20))
+        self.max_tasks_per_child = int(os.getenv('PDF_MAX_TASKS_PER_CHILD', 50))
+        self.min_chars_per_page = int(os.getenv('PDF_MIN_CHARS_PER_PAGE', 100))
+        self.queue_margin = float(os.getenv('PDF_QUEUE_MARGIN', 5))
+        self.max_queued = int(os.getenv('PDF_MAX_QUEUED', self.workers)) if max_queued is None else max_queued
+
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_pid: Optional[int] = None
+        self._pending = 0
+        self._stats = {
+            'documents': 0, 'pypdf': 0, 'pdfplumber': 0, 'failed': 0, 'timeouts': 0, 'rejected_busy': 0,
+            'total_time': 0.0
+        }
+
+    def extract(self, pdf_bytes: bytes, max_chars: Optional[int] = None, max_pages: Optional[int] = None,
+                timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Texto do PDF (ver extract_pdf_text) respeitando os limites do documento"""
+        if not self.enabled:
+            return {'text': '', 'extractor': None, 'pages_read': 0, 'total_pages': None,
+                    'stop_reason': None, 'error': 'pypdf/pdfplumber não instalados'}
+
+        start = time.time()
+        timeout = timeout or self.timeout
+        args = (pdf_bytes, max_pages or self.max_pages, max_chars, timeout, self.min_chars_per_page)
+
+        pool = self._get_pool()
+        if pool is None:
+            result = extract_pdf_text(*args)
+        elif not self._reserve():
+            logger.warning(f"⚠️ Pool de PDF '{self.name}' ocupado ({self._pending} documentos pendentes), PDF ignorado")
+            return {'text': '', 'extractor': None, 'pages_read': 0, 'total_pages': None,
+                    'stop_reason': None, 'error': 'pool de PDF ocupado'}
+        else:
+            future = None
+            try:
+                future = pool.submit(extract_pdf_text, *args)
+                future.add_done_callback(self._release)
+                # O limite por documento é aplicado dentro do processo; a margem cobre a espera
+                # curta por vaga (fila limitada por PDF_MAX_QUEUED) e a troca de processos
+                result = future.result(timeout + self.queue_margin)
+            except FutureTimeoutError:
+                future.cancel()
+                logger.warning(f"⏰ PDF excedeu {timeout + self.queue_margin:.0f}s no pool '{self.name}'")
+                result = {'text': '', 'extractor': None, 'pages_read': 0, 'total_pages': None,
+                          'stop_reason': 'time_limit', 'error': 'tempo limite do PDF excedido'}
+            except Exception as e:
+                # Processo do pool morreu (memória, PDF malicioso): recria no próximo uso
+                if future is None:
+                    self._release(None)
+                logger.error(f"❌ Pool de PDF '{self.name}' falhou: {e}")
+                self._reset_pool()
+                result = {'text': '', 'extractor': None, 'pages_read': 0, 'total_pages': None,
+                          'stop_reason': None, 'error': str(e)}
+
+        self._count(result, time.time() - start)
+        if result['stop_reason'] in ('page_limit', 'time_limit'):
+            logger.info(
+                f"✂️ PDF limitado ({result['stop_reason']}): {result['pages_read']}/{result['total_pages']} páginas"
+            )
+        return result
+
+    def _reserve(self) -> bool:
+        """Reserva lugar no pool: documentos em extração + no máximo PDF_MAX_QUEUED na fila"""
+        with self._lock:
+            if self._pending >= self.workers + self.max_queued:
+                self._stats['rejected_busy'] += 1
+                return False
+            self._pending += 1
+            return True
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending = max(self._pending - 1, 0)
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Pool do processo atual (recriado após fork)"""
+        if not self.use_pool:
+            return None
+        with self._lock:
+            if self._pool is not None and self._pool_pid == os.getpid():
+                return self._pool
+            try:
+                # forkserver/spawn: fork de um processo com threads pode herdar locks travados
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                context = multiprocessing.get_context(method)
+                if method == 'forkserver':
+                    # Módulo principal importado uma vez no servidor, não a cada processo do pool
+                    context.set_forkserver_preload(['__main__', 'services.pdf_extractor'])
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    max_tasks_per_child=self.max_tasks_per_child
+                )
+                self._pool_pid = os.getpid()
+                logger.info(f"📄 Pool de extração de PDF '{self.name}': {self.workers} processos ({method})")
+            except Exception as e:
+                logger.warning(f"⚠️ Pool de PDF indisponível, extraindo no thread atual: {e}")
+                self.use_pool = False
+                self._pool = None
+            return self._pool
+
+    def _reset_pool(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None and self._pool_pid == os.getpid():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Encerra os processos do pool"""
+        self._reset_pool()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Configuração e contadores"""
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            'name': self.name,
+            'enabled': self.enabled,
+            'has_pypdf': HAS_PYPDF,
+            'has_pdfplumber': HAS_PDFPLUMBER,
+            'process_pool': self.use_pool,
+            'workers': self.workers,
+            'max_pages': self.max_pages,
+            'timeout': self.timeout,
+            'pending': self._pending,
+            'avg_time': round(stats['total_time'] / stats['documents'], 3) if stats['documents'] else 0.0,
+            **stats
+        }
+
+    def _count(self, result: Dict[str, Any], elapsed: float):
+        with self._lock:
+            self._stats['documents'] += 1
+            self._stats['total_time'] += elapsed
+            if result['stop_reason'] == 'time_limit':
+                self._stats['timeouts'] += 1
+            if result['extractor'] and result['text'].strip():
+                self._stats[result['extractor']] += 1
+            else:
+                self._stats['failed'] += 1
+
+# Instâncias globais: páginas da web e anexos enviados pelo usuário
+pdf_extractor = PDFExtractor()
+attachment_pdf_extractor = PDFExtractor(
+    'anexos',
+    workers=int(os.getenv('PDF_ATTACHMENT_WORKERS', 2)),
+    # Na fila, um upload esperaria outro anexo inteiro e passaria do próprio limite de tempo
+    max_queued=int(os.getenv('PDF_ATTACHMENT_MAX_QUEUED', 0))
+)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Politeness Scheduler
+Agenda requisições por chave (provedor ou host) respeitando intervalo mínimo, jitter e
+limite de requisições simultâneas, sem manter threads dormindo enquanto esperam
+"""
+
+import os
+import time
+import heapq
+import random
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class _Slot:
+    """Fila e ritmo de uma chave"""
+
+    def __init__(self, min_interval: float, jitter: float, max_in_flight: int):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.max_in_flight = max_in_flight
+        self.queue: deque = deque()
+        self.next_allowed = 0.0
+        self.in_flight = 0
+        self.scheduled = False
+        self.dispatched = 0
+
+    def reset(self):
+        """Descarta o estado de execução, preservando a configuração"""
+        self.queue = deque()
+        self.next_allowed = 0.0
+        self.in_flight = 0
+        self.scheduled = False
+        self.dispatched = 0
+
+class PolitenessScheduler:
+    """Heap de temporizadores com um único despachante por processo.
+
+    Cada chave tem um próximo horário permitido (intervalo mínimo + jitter aleatório) e
+    um teto de requisições em andamento. Jobs enfileirados esperam no heap, não em
+    threads: o pool de execução só é ocupado durante a requisição em si. Chaves prontas
+    saem do heap por ordem de horário, o que alterna naturalmente entre chaves.
+    """
+
+    def __init__(self, name: str, max_workers: int = 8, min_interval: float = 0.0,
+                 jitter: float = 0.0, max_in_flight: int = 2):
+        self.name = name
+        self.max_workers = max_workers
+        self.defaults = (min_interval, jitter, max_in_flight)
+
+        self._slots: Dict[str, _Slot] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = 0
+        self._cond = threading.Condition()
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def configure(self, key: str, min_interval: Optional[float] = None, jitter: Optional[float] = None,
+                  max_in_flight: Optional[int] = None):
+        """Define o ritmo de uma chave (valores omitidos usam os padrões do agendador)"""
+        with self._cond:
+            slot = self._slot(key)
+            if min_interval is not None:
+                slot.min_interval = min_interval
+            if jitter is not None:
+                slot.jitter = jitter
+            if max_in_flight is not None:
+                slot.max_in_flight = max(1, max_in_flight)
+
+    def submit(self, key: str, fn: Callable, *args, **kwargs) -> Future:
+        """Enfileira fn para a chave; retorna Future resolvido quando fn terminar"""
+        self._ensure_started()
+        future: Future = Future()
+
+        with self._cond:
+            slot = self._slot(key)
+            slot.queue.append((future, fn, args, kwargs))
+            if not slot.scheduled and slot.in_flight < slot.max_in_flight:
+                self._schedule(key, slot, max(time.time(), slot.next_allowed))
+            self._cond.notify()
+
+        return future
+
+    def backoff(self, key: str, seconds: float):
+        """Adia a próxima liberação da chave (ex.: após HTTP 429) sem bloquear o chamador"""
+        with self._cond:
+            slot = self._slot(key)
+            slot.next_allowed = max(slot.next_allowed, time.time() + seconds)
+        logger.info(f"⏸️ {self.name}/{key}: próxima requisição adiada {seconds:.1f}s")
+
+    def delay_until_ready(self, key: str) -> float:
+        """Segundos até a chave poder liberar a próxima requisição"""
+        with self._cond:
+            slot = self._slots.get(key)
+            return max(slot.next_allowed - time.time(), 0.0) if slot else 0.0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Fila, requisições em andamento e atraso por chave"""
+        now = time.time()
+        with self._cond:
+            return {
+                key: {
+                    'queued': len(slot.queue),
+                    'in_flight': slot.in_flight,
+                    'max_in_flight': slot.max_in_flight,
+                    'min_interval': slot.min_interval,
+                    'jitter': slot.jitter,
+                    'next_allowed_in': round(max(slot.next_allowed - now, 0.0), 2),
+                    'dispatched': slot.dispatched
+                }
+                for key, slot in self._slots.items()
+            }
+
+    def _slot(self, key: str) -> _Slot:
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = _Slot(*self.defaults)
+        return slot
+
+    def _schedule(self, key: str, slot: _Slot, when: float):
+        self._seq += 1
+        heapq.heappush(self._heap, (when, self._seq, key))
+        slot.scheduled = True
+
+    def _ensure_started(self):
+        """Cria pool e despachante no processo atual (seguro após fork)"""
+        if self._pid == os.getpid() and self._dispatcher and self._dispatcher.is_alive():
+            return
+        if self._pid is not None and self._pid != os.getpid():
+            self._reset_after_fork()
+        with self._cond:
+            if self._pid == os.getpid() and self._dispatcher and self._dispatcher.is_alive():
+                return
+            self._pid = os.getpid()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f'{self.name}-fetch')
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name=f'{self.name}-scheduler', daemon=True)
+            self._dispatcher.start()
+
+    def _reset_after_fork(self):
+        """Descarta o estado herdado do processo pai (roda no filho logo após o fork).
+
+        Fila, heap, pool e despachante do pai não existem neste worker e o Condition pode
+        guardar waiters de threads mortas. A configuração das chaves (configure() no import,
+        com preload_app) é mantida.
+        """
+        self._cond = threading.Condition()
+        for slot in self._slots.values():
+            slot.reset()
+        self._heap.clear()
+        self._executor = None
+        self._dispatcher = None
+        self._pid = None
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                job, key = self._next_job()
+
+            future, fn, args, kwargs = job
+            if future.set_running_or_notify_cancel():
+                self._executor.submit(self._run, key, future, fn, args, kwargs)
+            else:
+                self._on_done(key)
+
+    def _next_job(self):
+        """Bloqueia (no Condition) até haver job liberado; chamado com o lock"""
+        while True:
+            if not self._heap:
+                self._cond.wait()
+                continue
+
+            when, _, key = self._heap[0]
+            now = time.time()
+            if when > now:
+                self._cond.wait(when - now)
+                continue
+
+            heapq.heappop(self._heap)
+            slot = self._slots[key]
+            slot.scheduled = False
+
+            if not slot.queue or slot.in_flight >= slot.max_in_flight:
+                continue  # reagendada quando um job da chave terminar
+            if slot.next_allowed > now:
+                self._schedule(key, slot, slot.next_allowed)  # backoff aplicado depois do agendamento
+                continue
+
+            job = slot.queue.popleft()
+            slot.in_flight += 1
+            slot.dispatched += 1
+            slot.next_allowed = now + slot.min_interval + random.uniform(0, slot.jitter)
+            if slot.queue and slot.in_flight < slot.max_in_flight:
+                self._schedule(key, slot, slot.next_allowed)
+            return job, key
+
+    def _run(self, key: str, future: Future, fn: Callable, args: tuple, kwargs: dict):
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            self._on_done(key)
+
+    def _on_done(self, key: str):
+        with self._cond:
+            slot = self._slots.get(key)
+            if slot is None:
+                return
+            slot.in_flight = max(slot.in_flight - 1, 0)
+            if slot.queue and not slot.scheduled:
+                self._schedule(key, slot, max(time.time(), slot.next_allowed))
+                self._cond.notify()
@@ -280,7 +280,7 @@ RETORNE APENAS JSON VÁLIDO:
 ```
 """
             
-            response = ai_manager.generate_analysis(prompt, max_tokens=2500)
+            response = ai_manager.generate_analysis(prompt, max_tokens=2500, task_type='pre_pitch')
             
             if response:
                 clean_response = response.strip()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Provider State
+Estado thread-safe dos provedores de IA com snapshot imutável para roteamento
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Tuple, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+class RoutingEntry(NamedTuple):
+    """Visão imutável de um provedor usada no roteamento"""
+    name: str
+    priority: int
+    consecutive_failures: int
+    max_errors: int
+    available: bool
+    configured: bool
+    disabled_at: Optional[float]
+
+class ProviderState:
+    """Estado de um provedor: mutações sob lock próprio, leituras via snapshot"""
+
+    def __init__(
+        self,
+        name: str,
+        priority: int,
+        max_errors: int = 2,
+        model: Optional[str] = None,
+        models: Optional[List[str]] = None,
+        max_output_tokens: int = 8192,
+        json_mode: bool = False
+    ):
+        self.name = name
+        self.priority = priority
+        self.max_errors = max_errors
+        self.model = model
+        self.models = list(models or [])
+        self.max_output_tokens = max_output_tokens
+
+        self.client = None
+        self._json_mode = json_mode
+        self.json_mode_disabled_until = 0.0
+        self.available = False
+        self.error_count = 0
+        self.consecutive_failures = 0
+        self.last_success: Optional[float] = None
+        self.disabled_at: Optional[float] = None
+        self._model_index = 0
+
+        self._lock = threading.Lock()
+        self._registry: Optional['ProviderRegistry'] = None
+
+    @property
+    def json_mode(self) -> bool:
+        """Modo JSON nativo configurado e não suspenso (ver disable_json_mode)"""
+        return self._json_mode and time.time() >= self.json_mode_disabled_until
+
+    @property
+    def configured(self) -> bool:
+        """Provedor tem cliente inicializado"""
+        return self.client is not None
+
+    def configure(self, client: Any):
+        """Associa cliente e habilita o provedor"""
+        with self._lock:
+            self.client = client
+            self.available = True
+            self.disabled_at = None
+        self._publish()
+
+    def record_success(self):
+        """Zera falhas consecutivas após sucesso"""
+        with self._lock:
+            changed = self.consecutive_failures != 0 or not self.available
+            self.consecutive_failures = 0
+            self.available = True
+            self.disabled_at = None
+            self.last_success = time.time()
+        if changed:
+            self._publish()
+
+    def record_failure(self) -> bool:
+        """Contabiliza falha; retorna True se o provedor foi desabilitado nesta chamada"""
+        with self._lock:
+            self.error_count += 1
+            self.consecutive_failures += 1
+            disabled_now = self.available and self.consecutive_failures >= self.max_errors
+            if disabled_now:
+                self.available = False
+                self.disabled_at = time.time()
+        self._publish()
+        return disabled_now
+
+    def reset(self):
+        """Zera contadores e reabilita se houver cliente configurado"""
+        with self._lock:
+            self.error_count = 0
+            self.consecutive_failures = 0
+            if self.client is not None:
+                self.available = True
+                self.disabled_at = None
+        self._publish()
+
+    def try_reenable(self, cooldown: float) -> bool:
+        """Reabilita após cooldown (apenas uma thread vence a corrida)"""
+        with self._lock:
+            if self.available:
+                return True
+            if self.client is None or not self.disabled_at or time.time() - self.disabled_at < cooldown:
+                return False
+            self.available = True
+            self.disabled_at = None
+            self.error_count = 0
+            self.consecutive_failures = 0
+        logger.info(f"🔄 Provedor {self.name} reabilitado após cooldown")
+        self._publish()
+        return True
+
+    def disable_json_mode(self, seconds: float):
+        """Suspende o modo JSON nativo por alguns segundos (SDK ou modelo recusou o parâmetro)"""
+        with self._lock:
+            self.json_mode_disabled_until = time.time() + seconds
+
+    def next_model_rotation(self) -> List[str]:
+        """Avança o índice de rotação atomicamente e retorna a ordem de modelos"""
+        with self._lock:
+            index = self._model_index
+            self._model_index = (index + 1) % max(len(self.models), 1)
+        return self.models[index:] + self.models[:index]
+
+    @property
+    def current_model_index(self) -> int:
+        return self._model_index
+
+    def routing_entry(self) -> RoutingEntry:
+        return RoutingEntry(
+            self.name, self.priority, self.consecutive_failures, self.max_errors,
+            self.available, self.client is not None, self.disabled_at
+        )
+
+    def to_status(self) -> Dict[str, Any]:
+        """Snapshot dos campos para relatórios de status"""
+        with self._lock:
+            return {
+                'available': self.available,
+                'priority': self.priority,
+                'error_count': self.error_count,
+                'consecutive_failures': self.consecutive_failures,
+                'last_success': self.last_success,
+                'max_errors': self.max_errors,
+                'model': self.model or 'N/A',
+                'json_mode': self.json_mode
+            }
+
+    def _publish(self):
+        if self._registry is not None:
+            self._registry.publish()
+
+class ProviderRegistry:
+    """Conjunto fixo de provedores com snapshot de roteamento lido sem lock"""
+
+    def __init__(self, providers: List[ProviderState], cooldown: float = 300.0):
+        self.cooldown = cooldown
+        self._providers: Dict[str, ProviderState] = {p.name: p for p in providers}
+        self._publish_lock = threading.Lock()
+        self._snapshot: Tuple[RoutingEntry, ...] = ()
+
+        for provider in providers:
+            provider._registry = self
+        self.publish()
+
+    def __getitem__(self, name: str) -> ProviderState:
+        return self._providers[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._providers
+
+    def get(self, name: str) -> Optional[ProviderState]:
+        return self._providers.get(name)
+
+    def items(self):
+        return self._providers.items()
+
+    def values(self):
+        return self._providers.values()
+
+    def publish(self):
+        """Recria o snapshot imutável; leitores veem a tupla antiga ou a nova, nunca parcial"""
+        with self._publish_lock:
+            self._snapshot = tuple(p.routing_entry() for p in self._providers.values())
+
+    def routing_candidates(self, exclude: Optional[List[str]] = None) -> List[RoutingEntry]:
+        """Provedores elegíveis ordenados por prioridade/falhas (leitura sem lock)"""
+        snapshot = self._snapshot
+        now = time.time()
+        excluded = set(exclude or ())
+
+        candidates = []
+        for entry in snapshot:
+            if entry.name in excluded or not entry.configured:
+                continue
+            healthy = entry.available and entry.consecutive_failures < entry.max_errors
+            recovered = (not entry.available and entry.disabled_at is not None
+                         and now - entry.disabled_at >= self.cooldown)
+            if healthy or recovered:
+                candidates.append(entry)
+
+        candidates.sort(key=lambda e: (e.priority, e.consecutive_failures))
+        return candidates
+
+    def reset_all(self):
+        """Zera contadores de todos os provedores"""
+        for provider in self._providers.values():
+            provider.reset()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Query Normalizer
+Normalização de queries de busca e índice de similaridade para o cache
+"""
+
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Set
+
+# Palavras de polaridade (com/sem, não) mudam o sentido da query: nunca são stopwords
+# e precisam coincidir para um hit aproximado
+POLARITY_WORDS = frozenset(['com', 'sem', 'nao', 'nem', 'nunca', 'with', 'without', 'not'])
+
+STOPWORDS = frozenset([
+    'a', 'o', 'as', 'os', 'ao', 'aos', 'de', 'da', 'do', 'das', 'dos', 'e', 'em', 'no', 'na',
+    'nos', 'nas', 'um', 'uma', 'uns', 'umas', 'para', 'pra', 'por', 'pelo', 'pela',
+    'que', 'se', 'ou', 'the', 'of', 'and', 'in', 'for', 'to', 'on'
+]) - POLARITY_WORDS
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+def query_tokens(query: str) -> FrozenSet[str]:
+    """Conjunto de tokens normalizados: minúsculas, sem acentos, sem pontuação e stopwords"""
+    if not query:
+        return frozenset()
+
+    decomposed = unicodedata.normalize('NFKD', query.lower())
+    without_accents = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    tokens = _NON_WORD.sub(' ', without_accents).split()
+
+    return frozenset(token for token in tokens if token not in STOPWORDS)
+
+def normalize_query(query: str) -> str:
+    """Forma canônica da query (tokens ordenados) - independe de caixa, acentos,
+    espaços, stopwords e ordem das palavras"""
+    tokens = query_tokens(query)
+    if not tokens:
+        return ' '.join((query or '').lower().split())
+    return ' '.join(sorted(tokens))
+
+def jaccard_similarity(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    """Similaridade de Jaccard entre conjuntos de tokens"""
+    if not first or not second:
+        return 0.0
+    intersection = len(first & second)
+    return intersection / (len(first) + len(second) - intersection)
+
+class QuerySimilarityIndex:
+    """Índice invertido token -> queries normalizadas, separado por namespace (provedor)"""
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, FrozenSet[str]]" = OrderedDict()
+        self._postings: Dict[tuple, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, namespace: str, normalized: str):
+        """Registra uma query normalizada"""
+        key = (namespace, normalized)
+        tokens = frozenset(normalized.split())
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+
+            self._entries[key] = tokens
+            for token in tokens:
+                self._postings.setdefault((namespace, token), set()).add(normalized)
+
+            while len(self._entries) > self.max_entries:
+                (old_namespace, old_normalized), old_tokens = self._entries.popitem(last=False)
+                for token in old_tokens:
+                    posting = self._postings.get((old_namespace, token))
+                    if posting is not None:
+                        posting.discard(old_normalized)
+                        if not posting:
+                            del self._postings[(old_namespace, token)]
+
+    def find_similar(self, namespace: str, normalized: str, threshold: float) -> Optional[str]:
+        """Query indexada mais parecida com similaridade >= threshold (exceto a própria)"""
+        tokens = frozenset(normalized.split())
+        if not tokens:
+            return None
+        polarity = tokens & POLARITY_WORDS
+
+        with self._lock:
+            overlap: Dict[str, int] = {}
+            for token in tokens:
+                for candidate in self._postings.get((namespace, token), ()):
+                    overlap[candidate] = overlap.get(candidate, 0) + 1
+
+            best, best_score = None, threshold
+            for candidate, shared in overlap.items():
+                if candidate == normalized:
+                    continue
+                candidate_tokens = self._entries.get((namespace, candidate), frozenset())
+                if candidate_tokens & POLARITY_WORDS != polarity:
+                    continue  # "franquia com royalties" ≠ "franquia sem royalties"
+                candidate_size = len(candidate_tokens)
+                score = shared / (len(tokens) + candidate_size - shared)
+                if score >= best_score:
+                    best, best_score = candidate, score
+
+        return best
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Rate Limiter
+Janelas deslizantes por provedor (minuto/hora/dia/mês) persistidas em SQLite compartilhado
+"""
+
+import os
+import time
+import logging
+from typing import Dict, Optional, Any
+
+from services.sqlite_store import SQLiteStore
+from services.single_flight import COORDINATION_DB
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = {
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400,
+    'month': 30 * 86400
+}
+
+class SlidingWindowRateLimiter:
+    """Limitador com janelas deslizantes em buckets.
+
+    Cada janela é dividida em um número fixo de buckets (contadores por intervalo),
+    então verificar e registrar custa O(buckets) independente do volume de requisições.
+    Um bucket só sai da janela quando todo o seu intervalo saiu, portanto o limite
+    nunca é excedido (no máximo fica conservador por um bucket). Os contadores ficam
+    em SQLite: sobrevivem a reinícios e são compartilhados entre workers.
+    """
+
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+            provider TEXT NOT NULL,
+            window TEXT NOT NULL,
+            bucket_start REAL NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (provider, window, bucket_start)
+        )
+        """
+    ]
+
+    def __init__(self, buckets_per_window: int = 60, db_path: str = COORDINATION_DB):
+        self.buckets_per_window = buckets_per_window
+        self.limits: Dict[str, Dict[str, int]] = {}
+        self._last_purge = 0.0
+        self.store = SQLiteStore(db_path, self.SCHEMA)
+
+    def configure(self, provider: str, limits: Dict[str, int]):
+        """Define limites por janela; SEARCH_RATE_LIMIT_<PROVEDOR>_<JANELA> sobrescreve"""
+        configured = {}
+        for window, limit in limits.items():
+            if window not in WINDOW_SECONDS:
+                raise ValueError(f"Janela de rate limit desconhecida: {window}")
+            env_name = f"SEARCH_RATE_LIMIT_{provider.upper()}_{window.upper()}"
+            configured[window] = int(os.getenv(env_name, limit))
+        self.limits[provider] = configured
+
+    def _bucket_size(self, window: str) -> float:
+        return WINDOW_SECONDS[window] / self.buckets_per_window
+
+    def _wait_for_window(self, conn, provider: str, window: str, limit: int, now: float) -> float:
+        """Segundos até a janela ter uma vaga (0.0 se já tem)"""
+        seconds = WINDOW_SECONDS[window]
+        bucket_size = self._bucket_size(window)
+
+        rows = conn.execute(
+            "SELECT bucket_start, count FROM rate_limit_buckets "
+            "WHERE provider = ? AND window = ? AND bucket_start > ? ORDER BY bucket_start",
+            (provider, window, now - seconds - bucket_size)
+        ).fetchall()
+
+        used = sum(count for _, count in rows)
+        if used < limit:
+            return 0.0
+
+        # Espera até buckets antigos suficientes saírem da janela
+        to_free = used - limit + 1
+        for bucket_start, count in rows:
+            to_free -= count
+            if to_free <= 0:
+                return max(bucket_start + bucket_size + seconds - now, 0.0)
+        return seconds
+
+    def acquire(self, provider: str) -> float:
+        """Tenta consumir uma vaga em todas as janelas do provedor.
+
+        Retorna 0.0 se a requisição foi registrada, ou os segundos até a próxima vaga
+        (nada é registrado nesse caso). Provedores sem limites configurados são livres.
+        """
+        limits = self.limits.get(provider)
+        if not limits:
+            return 0.0
+
+        now = time.time()
+        try:
+            with self.store.transaction(immediate=True) as conn:
+                wait = max(
+                    self._wait_for_window(conn, provider, window, limit, now)
+                    for window, limit in limits.items()
+                )
+                if wait > 0:
+                    return wait
+
+                for window in limits:
+                    bucket_size = self._bucket_size(window)
+                    bucket_start = now - (now % bucket_size)
+                    conn.execute(
+                        "INSERT INTO rate_limit_buckets (provider, window, bucket_start, count) VALUES (?, ?, ?, 1) "
+                        "ON CONFLICT(provider, window, bucket_start) DO UPDATE SET count = count + 1",
+                        (provider, window, bucket_start)
+                    )
+        except Exception as e:
+            # Falha do backend não deve derrubar a busca
+            logger.warning(f"⚠️ Rate limiter indisponível para {provider}: {e}")
+            return 0.0
+
+        self._purge_old(now)
+        return 0.0
+
+    def time_until_available(self, provider: str) -> float:
+        """Segundos até a próxima vaga, sem consumir"""
+        limits = self.limits.get(provider)
+        if not limits:
+            return 0.0
+
+        try:
+            conn = self.store.connection()
+            now = time.time()
+            return max(
+                self._wait_for_window(conn, provider, window, limit, now)
+                for window, limit in limits.items()
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Rate limiter indisponível para {provider}: {e}")
+            return 0.0
+
+    def usage(self, provider: str) -> Dict[str, Dict[str, Any]]:
+        """Uso atual por janela"""
+        now = time.time()
+        result = {}
+        for window, limit in self.limits.get(provider, {}).items():
+            seconds = WINDOW_SECONDS[window]
+            try:
+                row = self.store.execute(
+                    "SELECT COALESCE(SUM(count), 0) FROM rate_limit_buckets "
+                    "WHERE provider = ? AND window = ? AND bucket_start > ?",
+                    (provider, window, now - seconds - self._bucket_size(window))
+                ).fetchone()
+                used = row[0]
+            except Exception:
+                used = None
+            result[window] = {
+                'used': used,
+                'limit': limit,
+                'remaining': max(limit - used, 0) if used is not None else None
+            }
+        return result
+
+    def reset(self, provider: Optional[str] = None):
+        """Zera contadores (de um provedor ou de todos)"""
+        if provider:
+            self.store.execute("DELETE FROM rate_limit_buckets WHERE provider = ?", (provider,))
+        else:
+            self.store.execute("DELETE FROM rate_limit_buckets")
+
+    def _purge_old(self, now: float):
+        """Remove buckets fora de qualquer janela, no máximo uma vez por minuto"""
+        if now - self._last_purge < 60:
+            return
+        self._last_purge = now
+
+        try:
+            for window, seconds in WINDOW_SECONDS.items():
+                self.store.execute(
+                    "DELETE FROM rate_limit_buckets WHERE window = ? AND bucket_start <= ?",
+                    (window, now - seconds - self._bucket_size(window))
+                )
+        except Exception as e:
+            logger.debug(f"Falha ao limpar buckets de rate limit: {e}")
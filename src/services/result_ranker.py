@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Result Ranker
+Fusão de resultados de múltiplos provedores por Reciprocal Rank Fusion
+"""
+
+import os
+import logging
+from typing import Dict, List, Any
+from urllib.parse import urlparse
+
+from services.domain_yield import domain_yield_tracker, url_domain
+
+logger = logging.getLogger(__name__)
+
+def url_key(url: str) -> str:
+    """Chave de deduplicação: ignora esquema, www., fragmento e barra final"""
+    parsed = urlparse(url)
+    path = parsed.path.rstrip('/')
+    query = f"?{parsed.query}" if parsed.query else ''
+    return f"{url_domain(url)}{path}{query}"
+
+class ResultRanker:
+    """Ranqueia resultados mesclados.
+
+    score = Σ_provedores 1 / (k + posição)        (RRF)
+          × (1 + agreement_boost × (provedores_que_retornaram − 1))
+          × (0.5 + rendimento_do_domínio)            (0.5 neutro → fator 1.0)
+    """
+
+    def __init__(self, tracker=domain_yield_tracker):
+        self.tracker = tracker
+        self.k = float(os.getenv('SEARCH_RRF_K', 60))
+        self.agreement_boost = float(os.getenv('SEARCH_RRF_AGREEMENT_BOOST', 0.25))
+
+    def fuse(self, provider_results: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Mescla listas por provedor (já em ordem de ranking) em uma lista ordenada por score"""
+        fused: Dict[str, Dict[str, Any]] = {}
+
+        for provider_name, results in provider_results.items():
+            for rank, result in enumerate(results, start=1):
+                url = result.get('url')
+                if not url:
+                    continue
+                key = url_key(url)
+                entry = fused.get(key)
+                if entry is None:
+                    # Cópia: entradas do cache em memória são compartilhadas entre chamadas
+                    entry = fused[key] = {'result': dict(result), 'rrf': 0.0, 'providers': []}
+                if provider_name in entry['providers']:
+                    continue
+                entry['rrf'] += 1.0 / (self.k + rank)
+                entry['providers'].append(provider_name)
+
+        yields = self.tracker.get_yields(entry['result']['url'] for entry in fused.values())
+
+        ranked = []
+        for entry in fused.values():
+            result = entry['result']
+            agreement = 1.0 + self.agreement_boost * (len(entry['providers']) - 1)
+            domain_factor = 0.5 + yields.get(url_domain(result['url']), 0.5)
+            result['relevance_score'] = round(entry['rrf'] * agreement * domain_factor * 100, 4)
+            result['found_by'] = entry['providers']
+            ranked.append(result)
+
+        ranked.sort(key=lambda r: r['relevance_score'], reverse=True)
+        return ranked
+
+# Instância global
+result_ranker = ResultRanker()
@@ -5,14 +5,11 @@ ARQV30 Enhanced v2.0 - Robust Content Extractor
 Extrator multicamadas aprimorado com suporte a PDF e fallback robusto
 """
 
-import os
 import logging
 import time
-import requests
 from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import urljoin, urlparse
 import re
-import tempfile
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Imports condicionais para não quebrar se não estiver instalado
@@ -41,19 +38,15 @@ try:
 except ImportError:
     HAS_BEAUTIFULSOUP = False
 
-try:
-    import PyPDF2
-    HAS_PYPDF2 = True
-except ImportError:
-    HAS_PYPDF2 = False
-
-try:
-    import pdfplumber
-    HAS_PDFPLUMBER = True
-except ImportError:
-    HAS_PDFPLUMBER = False
-
 from services.url_resolver import url_resolver
+from services.single_flight import SingleFlight
+from services.domain_yield import domain_yield_tracker
+from services.content_cache import CachedContent, content_cache
+from services.fetch_engine import FetchRejected, FetchResponse, fetch_engine
+from services.pdf_extractor import HAS_PDFPLUMBER, HAS_PYPDF, pdf_extractor
+from services.negative_cache import (
+    LOCAL_CLASSES, RETRYABLE_CLASSES, classify_exception, looks_paywalled, negative_cache
+)
 
 logger = logging.getLogger(__name__)
 
@@ -61,17 +54,11 @@ class RobustContentExtractor:
     """Extrator de conteúdo multicamadas e robusto com suporte aprimorado a PDF"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        # Downloads pelo motor compartilhado (pool de conexões, keep-alive, cache de DNS)
+        self.fetch_engine = fetch_engine
         
         self.timeout = 30
+        self.extraction_flight = SingleFlight('extract', lease_timeout=180)
         self.min_content_length = 200  # Reduzido de 500 para 200
         self.max_content_length = 50000  # 50K chars max
         
@@ -81,7 +68,7 @@ class RobustContentExtractor:
             'readability': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_READABILITY},
             'newspaper': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_NEWSPAPER},
             'beautifulsoup': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_BEAUTIFULSOUP},
-            'pdf_pypdf2': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_PYPDF2},
+            'pdf_pypdf': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_PYPDF},
             'pdf_pdfplumber': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_PDFPLUMBER},
             'global': {
                 'total_extractions': 0,
@@ -98,196 +85,215 @@ class RobustContentExtractor:
         """
         Extrai conteúdo usando múltiplos extratores em ordem de prioridade
         Agora com suporte aprimorado a PDF e melhor fallback
+        Extrações concorrentes da mesma URL são coalescidas em uma só
         """
+        return self.extraction_flight.do(url, lambda: self._extract_and_record(url))
+
+    def _extract_and_record(self, url: str) -> Optional[str]:
+        """Extrai e alimenta o histórico de rendimento do domínio (usado no ranking de busca)"""
+        # Resolve URL de redirecionamento
+        resolved_url = url_resolver.resolve_redirect_url(url)
+        if resolved_url != url:
+            logger.info(f"🔄 URL resolvida: {url} -> {resolved_url}")
+            url = resolved_url
+        
+        if self._is_known_failure(url):
+            return None
+        
+        content, fetched = self._extract_content(url)
+        if fetched:
+            # Só conta extrações que foram à rede; cache fresco e 304 não dizem nada novo do domínio
+            domain_yield_tracker.record(url, content is not None)
+        return content
+
+    def _is_known_failure(self, url: str) -> bool:
+        """Falha recente da URL ou domínio com rendimento ruim: pula antes de baixar"""
+        failure = negative_cache.get(url)
+        if failure:
+            negative_cache.count('hits')
+            logger.info(f"⏭️ Pulando {url}: falha recente ({failure['error_class']})")
+            return True
+        if domain_yield_tracker.should_skip(url):
+            negative_cache.count('domain_skips')
+            logger.info(f"⏭️ Pulando {url}: domínio com baixo rendimento de extração")
+            return True
+        return False
+
+    def _extract_content(self, url: str) -> Tuple[Optional[str], bool]:
+        """Executa a extração (ver extract_content); retorna (conteúdo, se houve download novo)"""
         try:
             start_time = time.time()
             self.stats['global']['total_extractions'] += 1
             
             logger.info(f"🔍 Iniciando extração de: {url}")
             
-            # 1. Resolve URL de redirecionamento
-            resolved_url = url_resolver.resolve_redirect_url(url)
-            if resolved_url != url:
-                logger.info(f"🔄 URL resolvida: {url} -> {resolved_url}")
-                url = resolved_url
-            
-            # 2. Verifica se é PDF
-            if self._is_pdf_url(url):
-                logger.info("📄 Detectado PDF - usando extratores especializados")
-                content = self._extract_pdf_content(url)
-                if content and self._validate_content(content, url):
+            # 1. Cache de conteúdo: entrada fresca dispensa rede; obsoleta vira GET condicional
+            cached = content_cache.get(url)
+            if cached and cached.is_fresh:
+                content_cache.count('fresh_hits')
+                logger.info(f"💾 Conteúdo em cache ({cached.extractor}): {len(cached.content)} caracteres")
+                self.stats['global']['total_successes'] += 1
+                self._update_global_stats()
+                return cached.content, False
+            conditional_headers = cached.conditional_headers() if cached else {}
+            
+            # 2. Baixa o documento; o tipo vem do Content-Type e da assinatura do primeiro
+            #    chunk (fetch_engine.sniff_kind), não de 'pdf' aparecer na URL
+            response = self._fetch_document(url, conditional_headers)
+            if response is not None and response.status_code == 304:
+                return self._serve_revalidated(cached, response), False
+            # Sem entrada ou obsoleta sem 304: é miss, mesmo que o download ou a extração falhem
+            content_cache.count('misses')
+            if response is None or not response.content:
+                logger.error(f"❌ Falha ao baixar {url}")
+                self.stats['global']['total_failures'] += 1
+                self._update_global_stats()
+                return None, True
+            
+            # 3. PDF: extratores especializados direto, sem passar pela cascata HTML
+            if response.kind == 'pdf':
+                logger.info("📄 PDF detectado (Content-Type/assinatura) - usando extratores especializados")
+                content, extractor_name = self._extract_pdf_content(url, response.content)
+                if content and self._validate_content(content, url, is_pdf=True):
+                    self._store_content(url, content, extractor_name, True, response)
                     self.stats['global']['total_successes'] += 1
                     self._update_global_stats()
-                    return content
-            
-            # 3. Baixa conteúdo HTML
-            html_content = self._fetch_html(url)
-            if not html_content:
-                logger.error(f"❌ Falha ao baixar HTML para {url}")
+                    return content, True
+                negative_cache.record(url, 'extraction_failed')
                 self.stats['global']['total_failures'] += 1
                 self._update_global_stats()
-                return None
+                return None, True
             
+            html_content = response.text
+            if response.truncated:
+                # Corta a tag parcial no fim; o texto útil de páginas enormes fica no início
+                html_content = html_content[:html_content.rfind('>') + 1] or html_content
+                logger.info(f"✂️ HTML truncado no limite de download: {len(html_content)} caracteres")
             logger.info(f"📥 HTML baixado: {len(html_content)} caracteres")
             
-            # 4. Verifica se é página dinâmica (JavaScript-heavy)
-            if self._is_dynamic_page(html_content):
-                logger.warning(f"⚠️ Página dinâmica detectada: {url}")
-                # Tenta extração mais agressiva
-                content = self._extract_dynamic_content(html_content, url)
-                if content and self._validate_content(content, url):
-                    self.stats['global']['total_successes'] += 1
-                    self._update_global_stats()
-                    return content
-            
-            # 5. Tenta extratores em ordem de prioridade
-            extractors = [
-                ('trafilatura', self._extract_with_trafilatura),
-                ('readability', self._extract_with_readability),
-                ('newspaper', self._extract_with_newspaper),
-                ('beautifulsoup', self._extract_with_beautifulsoup)
-            ]
-            
-            for extractor_name, extractor_func in extractors:
-                if not self._is_extractor_available(extractor_name):
-                    continue
-                
-                try:
-                    logger.info(f"🔍 Tentando extração com {extractor_name}...")
-                    extractor_start = time.time()
-                    self.stats[extractor_name]['usage_count'] += 1
-                    
-                    content = extractor_func(html_content, url)
-                    extractor_time = time.time() - extractor_start
-                    
-                    if self._validate_content(content, url):
-                        self.stats[extractor_name]['success'] += 1
-                        self.stats[extractor_name]['total_time'] += extractor_time
-                        self.stats['global']['total_successes'] += 1
-                        self._update_global_stats()
-                        
-                        logger.info(f"✅ Extração bem-sucedida com {extractor_name}: {len(content)} caracteres em {extractor_time:.2f}s")
-                        return content
-                    else:
-                        self.stats[extractor_name]['failed'] += 1
-                        logger.warning(f"⚠️ Conteúdo insuficiente com {extractor_name}: {len(content) if content else 0} caracteres")
-                        
-                except Exception as e:
-                    self.stats[extractor_name]['failed'] += 1
-                    logger.error(f"❌ Erro com {extractor_name}: {str(e)}")
-                    continue
-            
-            # 6. Fallback final - extração agressiva
-            logger.warning(f"⚠️ Todos os extratores padrão falharam, tentando extração agressiva...")
-            content = self._aggressive_fallback_extraction(html_content, url)
-            if content and len(content) >= 100:  # Critério mais flexível para fallback
-                logger.info(f"✅ Extração agressiva bem-sucedida: {len(content)} caracteres")
+            # 4. HTML: extratores (dinâmico, cascata e fallback agressivo)
+            content, extractor_name, quality_ok = self._extract_from_html(html_content, url)
+            if content:
+                self._store_content(url, content, extractor_name, quality_ok, response)
                 self.stats['global']['total_successes'] += 1
                 self._update_global_stats()
-                return content
+                return content, True
             
             # Todos os extratores falharam
             logger.error(f"❌ FALHA CRÍTICA: Todos os extratores falharam para {url}")
+            negative_cache.record(url, 'paywall' if looks_paywalled(html_content) else 'extraction_failed')
             self.stats['global']['total_failures'] += 1
             self._update_global_stats()
-            return None
+            return None, True
             
+        except FetchRejected as e:
+            # Só chega aqui com LOCAL_CLASSES: nada foi baixado, o domínio não falhou
+            logger.warning(f"⏸️ Extração adiada de {url}: {str(e)}")
+            self.stats['global']['total_failures'] += 1
+            self._update_global_stats()
+            return None, False
         except Exception as e:
             logger.error(f"❌ Erro crítico na extração de {url}: {str(e)}")
             self.stats['global']['total_failures'] += 1
             self._update_global_stats()
-            return None
-    
-    def _is_pdf_url(self, url: str) -> bool:
-        """Verifica se a URL aponta para um PDF"""
-        return (url.lower().endswith('.pdf') or 
-                'pdf' in url.lower() or 
-                'application/pdf' in url.lower())
+            return None, True
     
-    def _extract_pdf_content(self, url: str) -> Optional[str]:
-        """Extrai conteúdo de PDF usando múltiplas estratégias"""
+    def _extract_from_html(self, html_content: str, url: str) -> Tuple[Optional[str], Optional[str], bool]:
+        """Aplica os extratores ao HTML; retorna (conteúdo, extrator, passou na validação)"""
+        
+        # Verifica se é página dinâmica (JavaScript-heavy)
+        if self._is_dynamic_page(html_content):
+            logger.warning(f"⚠️ Página dinâmica detectada: {url}")
+            # Tenta extração mais agressiva
+            content = self._extract_dynamic_content(html_content, url)
+            if content and self._validate_content(content, url):
+                return content, 'dynamic', True
+        
+        # Tenta extratores em ordem de prioridade
+        extractors = [
+            ('trafilatura', self._extract_with_trafilatura),
+            ('readability', self._extract_with_readability),
+            ('newspaper', self._extract_with_newspaper),
+            ('beautifulsoup', self._extract_with_beautifulsoup)
+        ]
         
-        try:
-            # Baixa o PDF
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            # Salva temporariamente
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-                temp_file.write(response.content)
-                temp_path = temp_file.name
+        for extractor_name, extractor_func in extractors:
+            if not self._is_extractor_available(extractor_name):
+                continue
             
             try:
-                # Tenta PDFPlumber primeiro (melhor para PDFs complexos)
-                if HAS_PDFPLUMBER:
-                    content = self._extract_pdf_with_pdfplumber(temp_path)
-                    if content and len(content) > 100:
-                        self.stats['pdf_pdfplumber']['success'] += 1
-                        logger.info(f"✅ PDF extraído com PDFPlumber: {len(content)} caracteres")
-                        return content
-                    else:
-                        self.stats['pdf_pdfplumber']['failed'] += 1
-                
-                # Fallback para PyPDF2
-                if HAS_PYPDF2:
-                    content = self._extract_pdf_with_pypdf2(temp_path)
-                    if content and len(content) > 100:
-                        self.stats['pdf_pypdf2']['success'] += 1
-                        logger.info(f"✅ PDF extraído com PyPDF2: {len(content)} caracteres")
-                        return content
-                    else:
-                        self.stats['pdf_pypdf2']['failed'] += 1
+                logger.info(f"🔍 Tentando extração com {extractor_name}...")
+                extractor_start = time.time()
+                self.stats[extractor_name]['usage_count'] += 1
                 
-                logger.error(f"❌ Falha na extração de PDF: {url}")
-                return None
+                content = extractor_func(html_content, url)
+                extractor_time = time.time() - extractor_start
                 
-            finally:
-                # Remove arquivo temporário
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
+                if self._validate_content(content, url):
+                    self.stats[extractor_name]['success'] += 1
+                    self.stats[extractor_name]['total_time'] += extractor_time
                     
-        except Exception as e:
-            logger.error(f"❌ Erro ao processar PDF {url}: {str(e)}")
-            return None
+                    logger.info(f"✅ Extração bem-sucedida com {extractor_name}: {len(content)} caracteres em {extractor_time:.2f}s")
+                    return content, extractor_name, True
+                else:
+                    self.stats[extractor_name]['failed'] += 1
+                    logger.warning(f"⚠️ Conteúdo insuficiente com {extractor_name}: {len(content) if content else 0} caracteres")
+                    
+            except Exception as e:
+                self.stats[extractor_name]['failed'] += 1
+                logger.error(f"❌ Erro com {extractor_name}: {str(e)}")
+                continue
+        
+        # Fallback final - extração agressiva
+        logger.warning(f"⚠️ Todos os extratores padrão falharam, tentando extração agressiva...")
+        content = self._aggressive_fallback_extraction(html_content, url)
+        if content and len(content) >= 100:  # Critério mais flexível para fallback
+            logger.info(f"✅ Extração agressiva bem-sucedida: {len(content)} caracteres")
+            return content, 'aggressive_fallback', False
+        
+        return None, None, False
     
-    def _extract_pdf_with_pdfplumber(self, pdf_path: str) -> Optional[str]:
-        """Extrai texto usando PDFPlumber"""
-        try:
-            import pdfplumber
-            
-            text = ""
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            
-            return self._clean_content(text) if text else None
-            
-        except Exception as e:
-            logger.error(f"Erro PDFPlumber: {e}")
-            return None
+    def _store_content(self, url: str, content: str, extractor_name: str, quality_ok: bool,
+                       response: FetchResponse):
+        """Grava o texto extraído no cache de conteúdo com os validadores da resposta"""
+        content_cache.set(
+            url, content, extractor_name, quality_ok,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        )
     
-    def _extract_pdf_with_pypdf2(self, pdf_path: str) -> Optional[str]:
-        """Extrai texto usando PyPDF2"""
-        try:
-            import PyPDF2
-            
-            text = ""
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            
-            return self._clean_content(text) if text else None
-            
-        except Exception as e:
-            logger.error(f"Erro PyPDF2: {e}")
-            return None
+    def _serve_revalidated(self, cached: CachedContent, response: FetchResponse) -> str:
+        """304: o documento não mudou, reaproveita o texto sem baixar nem re-extrair"""
+        content_cache.revalidated(cached, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        content_cache.count('revalidated')
+        logger.info(f"💾 Conteúdo revalidado (304, {cached.extractor}): {len(cached.content)} caracteres")
+        self.stats['global']['total_successes'] += 1
+        self._update_global_stats()
+        return cached.content
+    
+    def _extract_pdf_content(self, url: str, pdf_bytes: bytes) -> Tuple[Optional[str], Optional[str]]:
+        """Extrai conteúdo de PDF em memória no pool de processos; retorna (conteúdo, extrator)"""
+        start = time.time()
+        # Limite de caracteres: _clean_content descartaria o resto de qualquer forma
+        result = pdf_extractor.extract(pdf_bytes, max_chars=self.max_content_length)
+        extractor_name = f"pdf_{result['extractor']}" if result['extractor'] else None
+        
+        content = self._clean_content(result['text']) if result['text'] else None
+        if extractor_name:
+            self.stats[extractor_name]['usage_count'] += 1
+        if content and len(content) > 100:
+            self.stats[extractor_name]['success'] += 1
+            self.stats[extractor_name]['total_time'] += time.time() - start
+            logger.info(
+                f"✅ PDF extraído com {result['extractor']}: {len(content)} caracteres "
+                f"({result['pages_read']}/{result['total_pages']} páginas)"
+            )
+            return content, extractor_name
+        
+        if extractor_name:
+            self.stats[extractor_name]['failed'] += 1
+        logger.error(f"❌ Falha na extração de PDF: {url} {result['error'] or ''}")
+        return None, None
     
     def _is_dynamic_page(self, html: str) -> bool:
         """Verifica se é página dinâmica (JavaScript-heavy)"""
@@ -393,18 +399,20 @@ class RobustContentExtractor:
             logger.error(f"Erro na extração agressiva: {e}")
             return None
     
-    def _fetch_html(self, url: str) -> Optional[str]:
-        """Baixa conteúdo HTML da URL com retry"""
+    def _fetch_document(self, url: str, conditional_headers: Optional[Dict[str, str]] = None) -> Optional[FetchResponse]:
+        """Baixa o documento da URL (HTML ou PDF, ver FetchResponse.kind) com retry.
+        
+        Com conditional_headers (If-None-Match/If-Modified-Since) a resposta pode ser
+        304, devolvida sem corpo para o chamador reaproveitar o texto em cache."""
         max_retries = 3
         
         for attempt in range(max_retries):
             try:
-                response = self.session.get(
-                    url,
-                    timeout=self.timeout,
-                    verify=False,  # Para evitar problemas de SSL
-                    allow_redirects=True
-                )
+                # Sem verificação de SSL e seguindo redirects (FETCH_VERIFY_SSL)
+                response = self.fetch_engine.fetch(url, headers=conditional_headers or None, timeout=self.timeout)
+                
+                if response.status_code == 304:
+                    return response
                 
                 response.raise_for_status()
                 
@@ -412,26 +420,27 @@ class RobustContentExtractor:
                 if response.encoding is None:
                     response.encoding = 'utf-8'
                 
-                html = response.text
-                
-                if len(html) < 500:
-                    logger.warning(f"⚠️ HTML muito pequeno (tentativa {attempt + 1}): {len(html)} caracteres")
+                if response.kind != 'pdf' and len(response.text) < 500:
+                    logger.warning(f"⚠️ HTML muito pequeno (tentativa {attempt + 1}): {len(response.text)} caracteres")
                     if attempt < max_retries - 1:
                         time.sleep(2)  # Aguarda antes de tentar novamente
                         continue
                 
-                return html
+                return response
                 
-            except requests.exceptions.Timeout:
-                logger.warning(f"⏰ Timeout na tentativa {attempt + 1} para {url}")
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                    continue
             except Exception as e:
-                logger.error(f"❌ Erro ao baixar {url} (tentativa {attempt + 1}): {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                    continue
+                error_class = classify_exception(e)
+                if error_class in LOCAL_CLASSES:
+                    raise  # host em espera no motor: não é falha da URL (ver _extract_content)
+                if error_class == 'timeout':
+                    logger.warning(f"⏰ Timeout na tentativa {attempt + 1} para {url}")
+                else:
+                    logger.error(f"❌ Erro ao baixar {url} (tentativa {attempt + 1}): {str(e)}")
+                # 404/403/429 não mudam em 2s: só erros transitórios são repetidos
+                if error_class not in RETRYABLE_CLASSES or attempt == max_retries - 1:
+                    negative_cache.record(url, error_class, str(e))
+                    return None
+                time.sleep(2)
         
         return None
     
@@ -651,7 +660,7 @@ class RobustContentExtractor:
         
         return content
     
-    def _validate_content(self, content: str, url: str) -> bool:
+    def _validate_content(self, content: str, url: str, is_pdf: bool = False) -> bool:
         """Valida se o conteúdo extraído é válido com critérios aprimorados"""
         if not content:
             return False
@@ -660,7 +669,7 @@ class RobustContentExtractor:
         if len(content) < self.min_content_length:
             logger.warning(f"⚠️ Conteúdo pequeno para {url}: {len(content)} < {self.min_content_length}")
             # Para PDFs, aceita conteúdo menor
-            if self._is_pdf_url(url) and len(content) > 100:
+            if is_pdf and len(content) > 100:
                 logger.info(f"✅ PDF aceito com conteúdo menor: {len(content)} caracteres")
                 return True
             return False
@@ -737,15 +746,20 @@ class RobustContentExtractor:
                     stats['reason'] = 'Biblioteca newspaper3k não instalada'
                 elif extractor_name == 'beautifulsoup' and not HAS_BEAUTIFULSOUP:
                     stats['reason'] = 'Biblioteca beautifulsoup4 não instalada'
-                elif extractor_name == 'pdf_pypdf2' and not HAS_PYPDF2:
-                    stats['reason'] = 'Biblioteca PyPDF2 não instalada'
+                elif extractor_name == 'pdf_pypdf' and not HAS_PYPDF:
+                    stats['reason'] = 'Biblioteca pypdf não instalada'
                 elif extractor_name == 'pdf_pdfplumber' and not HAS_PDFPLUMBER:
                     stats['reason'] = 'Biblioteca pdfplumber não instalada'
     
     def get_extractor_stats(self) -> Dict[str, Any]:
         """Retorna estatísticas dos extratores"""
         self._update_global_stats()
-        return self.stats.copy()
+        stats = self.stats.copy()
+        stats['content_cache'] = content_cache.get_status()
+        stats['negative_cache'] = negative_cache.get_status()
+        stats['fetch_engine'] = self.fetch_engine.get_status()
+        stats['pdf_extractor'] = pdf_extractor.get_status()
+        return stats
     
     def reset_extractor_stats(self, extractor_name: Optional[str] = None):
         """Reset estatísticas dos extratores"""
@@ -831,12 +845,10 @@ class RobustContentExtractor:
         return result
     
     def clear_cache(self):
-        """Limpa cache de sessão"""
-        self.session.close()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        """Limpa cache de sessão, de conteúdo extraído e de falhas"""
+        content_cache.clear()
+        negative_cache.clear()
+        self.fetch_engine.close()
         logger.info("🧹 Cache de extração limpo")
 
 # Instância global
@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Search Cache
+Cache de busca em duas camadas: LRU em memória na frente de SQLite WAL persistente
+"""
+
+import os
+import json
+import time
+import atexit
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+from services.sqlite_store import CACHE_DIR, SQLiteStore
+from services.query_normalizer import normalize_query, QuerySimilarityIndex
+
+logger = logging.getLogger(__name__)
+
+class LRUCache:
+    """LRU limitado e thread-safe: chave -> (valor, expires_at)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def peek(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Como get, sem mexer na ordem de uso"""
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key: str, value: Any, expires_at: float):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class ProductionSearchCache:
+    """Cache de busca: LRU em processo + SQLite WAL compartilhado entre workers"""
+
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS search_cache_v2 (
+            cache_key TEXT PRIMARY KEY,
+            query TEXT NOT NULL,  -- forma normalizada (ver query_normalizer)
+            provider TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            codec TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            last_accessed REAL NOT NULL DEFAULT 0
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_search_cache_v2_expires ON search_cache_v2(expires_at)",
+        "CREATE INDEX IF NOT EXISTS idx_search_cache_v2_created ON search_cache_v2(created_at)",
+        """
+        CREATE TABLE IF NOT EXISTS search_cache_maintenance (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_run REAL NOT NULL
+        )
+        """
+    ]
+
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl: int = 3600):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.db_path = os.path.join(cache_dir, "search_cache.db")
+        self.codec = 'msgpack' if HAS_MSGPACK else 'json'
+
+        self.memory = LRUCache(int(os.getenv('SEARCH_CACHE_MEMORY_ENTRIES', 2000)))
+        self.flush_interval = float(os.getenv('SEARCH_CACHE_FLUSH_INTERVAL', 0.5))
+        self.batch_size = int(os.getenv('SEARCH_CACHE_BATCH_SIZE', 50))
+
+        self.store = SQLiteStore(self.db_path, self.SCHEMA)
+        self._migrate()
+
+        # Manutenção em background: expiração incremental, limite de tamanho com
+        # despejo LRU e VACUUM incremental (nunca em thread de requisição)
+        self.maintenance_interval = float(os.getenv('SEARCH_CACHE_MAINTENANCE_INTERVAL', 300))
+        self.maintenance_batch = int(os.getenv('SEARCH_CACHE_MAINTENANCE_BATCH', 500))
+        self.max_rows = int(os.getenv('SEARCH_CACHE_MAX_ROWS', 50000))
+        self.max_db_bytes = int(float(os.getenv('SEARCH_CACHE_MAX_DB_MB', 256)) * 1024 * 1024)
+        self.vacuum_pages = int(os.getenv('SEARCH_CACHE_VACUUM_PAGES', 1000))
+        self._maintenance: Optional[threading.Thread] = None
+        self._maintenance_pid: Optional[int] = None
+
+        # Correspondência aproximada: queries normalizadas com Jaccard de tokens >= limiar
+        self.fuzzy_enabled = os.getenv('SEARCH_CACHE_FUZZY_ENABLED', 'true').lower() == 'true'
+        self.similarity_threshold = float(os.getenv('SEARCH_CACHE_SIMILARITY_THRESHOLD', 0.85))
+        self.index_refresh_interval = float(os.getenv('SEARCH_CACHE_INDEX_REFRESH', 60))
+        self.index = QuerySimilarityIndex(int(os.getenv('SEARCH_CACHE_INDEX_ENTRIES', 5000)))
+        self._index_watermark = 0.0
+        self._index_synced_at = 0.0
+        self._index_lock = threading.Lock()
+
+        # Escritas pendentes para o SQLite (chave -> linha), gravadas em lote
+        self._pending: Dict[str, tuple] = {}
+        self._touches: Dict[str, float] = {}  # chave -> último acesso (para despejo LRU)
+        self._pending_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_pid: Optional[int] = None
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'memory_hits': 0, 'disk_hits': 0, 'fuzzy_hits': 0, 'misses': 0, 'expired': 0, 'sets': 0,
+            'flushes': 0, 'rows_written': 0, 'write_errors': 0,
+            'maintenance_runs': 0, 'expired_deleted': 0, 'evicted': 0, 'vacuum_runs': 0,
+            'memory_hit_time': 0.0, 'disk_hit_time': 0.0
+        }
+
+        atexit.register(self.flush)
+
+    def _migrate(self):
+        """Adiciona colunas/índices a bancos criados por versões anteriores"""
+        columns = {row[1] for row in self.store.execute("PRAGMA table_info(search_cache_v2)").fetchall()}
+        if 'last_accessed' not in columns:
+            self.store.execute("ALTER TABLE search_cache_v2 ADD COLUMN last_accessed REAL NOT NULL DEFAULT 0")
+            self.store.execute("UPDATE search_cache_v2 SET last_accessed = created_at")
+        self.store.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_v2_accessed ON search_cache_v2(last_accessed)"
+        )
+
+    def _enabled(self) -> bool:
+        return os.getenv('SEARCH_CACHE_ENABLED', 'true').lower() == 'true'
+
+    def _get_query_hash(self, query: str, provider: str = "") -> str:
+        """Gera hash da forma normalizada da query"""
+        return self._hash_normalized(normalize_query(query), provider)
+
+    @staticmethod
+    def _hash_normalized(normalized: str, provider: str) -> str:
+        combined = f"{normalized}:{provider}".encode('utf-8')
+        return hashlib.sha256(combined).hexdigest()
+
+    def _encode(self, results: Any) -> bytes:
+        if self.codec == 'msgpack':
+            return msgpack.packb(results, use_bin_type=True)
+        return json.dumps(results, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @staticmethod
+    def _decode(payload: bytes, codec: str) -> Any:
+        if codec == 'msgpack':
+            if not HAS_MSGPACK:
+                raise ValueError("Entrada msgpack sem biblioteca msgpack instalada")
+            return msgpack.unpackb(payload, raw=False)
+        return json.loads(payload)
+
+    def get(self, query: str, provider: str = "") -> Optional[List[Dict[str, Any]]]:
+        """Recupera resultados do cache (memória primeiro, depois SQLite); sem
+        acerto exato, tenta a query indexada mais parecida acima do limiar"""
+        if not self._enabled():
+            return None
+
+        start = time.perf_counter()
+        normalized = normalize_query(query)
+
+        value = self._lookup(self._hash_normalized(normalized, provider), start)
+        if value is not None:
+            return value
+
+        if self.fuzzy_enabled:
+            self._refresh_index()
+            similar = self.index.find_similar(provider, normalized, self.similarity_threshold)
+            if similar:
+                value = self._lookup(self._hash_normalized(similar, provider), start)
+                if value is not None:
+                    self._count('fuzzy_hits')
+                    logger.info(f"✅ Cache hit aproximado: '{normalized[:50]}' ~ '{similar[:50]}'")
+                    return value
+
+        self._count('misses')
+        return None
+
+    def contains(self, query: str, provider: str = "") -> bool:
+        """Se get serviria a query (exata ou aproximada), sem contar estatísticas,
+        promover para a memória nem decodificar; usado no planejamento de buscas"""
+        if not self._enabled():
+            return False
+
+        normalized = normalize_query(query)
+        if self._exists(self._hash_normalized(normalized, provider)):
+            return True
+
+        if self.fuzzy_enabled:
+            self._refresh_index()
+            similar = self.index.find_similar(provider, normalized, self.similarity_threshold)
+            if similar and self._exists(self._hash_normalized(similar, provider)):
+                return True
+        return False
+
+    def _exists(self, key: str) -> bool:
+        """Entrada válida para a chave em alguma camada, sem efeitos colaterais"""
+        now = time.time()
+
+        entry = self.memory.peek(key)
+        if entry is not None and entry[1] > now:
+            return True
+
+        with self._pending_lock:
+            pending = self._pending.get(key)
+        if pending is not None and pending[6] > now:
+            return True
+
+        try:
+            row = self.store.execute(
+                "SELECT 1 FROM search_cache_v2 WHERE cache_key = ? AND expires_at > ?",
+                (key, now)
+            ).fetchone()
+        except Exception as e:
+            logger.error(f"Erro ao consultar cache: {e}")
+            return False
+        return row is not None
+
+    def _lookup(self, key: str, start: float) -> Optional[List[Dict[str, Any]]]:
+        """Busca exata por chave nas camadas (memória, pendentes, SQLite)"""
+        now = time.time()
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > now:
+                self._count('memory_hits', 'memory_hit_time', time.perf_counter() - start)
+                self._touch(key, now)
+                return value
+            self.memory.delete(key)
+            self._count('expired')
+
+        with self._pending_lock:
+            pending = self._pending.get(key)
+        if pending is not None and pending[6] > now:
+            value = self._decode(pending[3], pending[4])
+            self.memory.set(key, value, pending[6])
+            self._count('memory_hits', 'memory_hit_time', time.perf_counter() - start)
+            return value
+
+        try:
+            row = self.store.execute(
+                "SELECT query, payload, codec, expires_at FROM search_cache_v2 WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+        except Exception as e:
+            logger.error(f"Erro ao recuperar cache: {e}")
+            return None
+
+        if row:
+            normalized, payload, codec, expires_at = row
+            # Entradas expiradas são removidas pela limpeza, nunca no caminho da requisição
+            if expires_at > now:
+                try:
+                    value = self._decode(payload, codec)
+                except Exception as e:
+                    logger.warning(f"⚠️ Entrada de cache ilegível ignorada: {e}")
+                    return None
+                self.memory.set(key, value, expires_at)
+                self._count('disk_hits', 'disk_hit_time', time.perf_counter() - start)
+                self._touch(key, now)
+                logger.info(f"✅ Cache hit para query: {normalized[:50]}...")
+                return value
+            self._count('expired')
+
+        return None
+
+    def _refresh_index(self):
+        """Incorpora ao índice de similaridade queries gravadas por outros workers"""
+        now = time.time()
+        if now - self._index_synced_at < self.index_refresh_interval:
+            return
+        if not self._index_lock.acquire(blocking=False):
+            return  # outra thread já está sincronizando
+
+        try:
+            self._index_synced_at = now
+            rows = self.store.execute("""
+                SELECT query, provider, created_at FROM search_cache_v2
+                WHERE created_at > ? AND expires_at > ?
+                ORDER BY created_at DESC LIMIT ?
+            """, (self._index_watermark, now, self.index.max_entries)).fetchall()
+
+            for normalized, provider, created_at in reversed(rows):
+                self.index.add(provider, normalized)
+                self._index_watermark = max(self._index_watermark, created_at)
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao sincronizar índice de similaridade: {e}")
+        finally:
+            self._index_lock.release()
+
+    def set(self, query: str, results: List[Dict[str, Any]], provider: str = "", ttl: Optional[int] = None):
+        """Armazena resultados (memória imediata, SQLite em lote)"""
+        if not self._enabled():
+            return
+
+        try:
+            normalized = normalize_query(query)
+            key = self._hash_normalized(normalized, provider)
+            now = time.time()
+            ttl = ttl if ttl is not None else int(os.getenv('SEARCH_CACHE_TTL', self.ttl))
+            expires_at = now + ttl
+
+            self.memory.set(key, results, expires_at)
+            row = (key, normalized, provider, self._encode(results), self.codec, now, expires_at, now)
+            self.index.add(provider, normalized)
+
+            with self._pending_lock:
+                self._pending[key] = row
+                pending_count = len(self._pending)
+
+            self._count('sets')
+            self._ensure_background()
+            if pending_count >= self.batch_size:
+                self._flush_event.set()
+
+            logger.info(f"💾 Cache salvo para query: {query[:50]}...")
+
+        except Exception as e:
+            logger.error(f"Erro ao salvar cache: {e}")
+
+    def _touch(self, key: str, now: float):
+        """Registra acesso; gravado em lote pela thread de escrita"""
+        with self._pending_lock:
+            self._touches[key] = now
+        self._ensure_background()
+
+    def flush(self):
+        """Grava escritas e acessos pendentes no SQLite em uma única transação"""
+        with self._pending_lock:
+            if not self._pending and not self._touches:
+                return
+            rows = list(self._pending.values())
+            touches = [(accessed, key) for key, accessed in self._touches.items()]
+            self._pending.clear()
+            self._touches.clear()
+
+        try:
+            with self.store.transaction() as conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO search_cache_v2
+                    (cache_key, query, provider, payload, codec, created_at, expires_at, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                conn.executemany(
+                    "UPDATE search_cache_v2 SET last_accessed = ? WHERE cache_key = ?",
+                    touches
+                )
+            with self._stats_lock:
+                self._stats['flushes'] += 1
+                self._stats['rows_written'] += len(rows)
+        except Exception as e:
+            logger.error(f"Erro ao gravar lote do cache: {e}")
+            self._count('write_errors')
+            # Devolve linhas não gravadas sem sobrescrever escritas mais novas
+            with self._pending_lock:
+                for row in rows:
+                    self._pending.setdefault(row[0], row)
+
+    def cleanup_expired(self, max_batches: Optional[int] = None) -> int:
+        """Remove entradas expiradas em lotes pequenos (cada lote é uma transação curta)"""
+        removed = 0
+        batches = 0
+        try:
+            while max_batches is None or batches < max_batches:
+                cursor = self.store.execute("""
+                    DELETE FROM search_cache_v2 WHERE cache_key IN (
+                        SELECT cache_key FROM search_cache_v2 WHERE expires_at <= ? LIMIT ?
+                    )
+                """, (time.time(), self.maintenance_batch))
+                batches += 1
+                removed += max(cursor.rowcount, 0)
+                if cursor.rowcount < self.maintenance_batch:
+                    break
+                time.sleep(0.05)  # libera o lock de escrita entre lotes
+
+            if removed > 0:
+                logger.info(f"🗑️ {removed} entradas expiradas removidas do cache")
+        except Exception as e:
+            logger.error(f"Erro na limpeza do cache: {e}")
+        return removed
+
+    def enforce_limits(self) -> int:
+        """Despeja as entradas menos acessadas até respeitar SEARCH_CACHE_MAX_ROWS e
+        SEARCH_CACHE_MAX_DB_MB"""
+        evicted = 0
+        try:
+            while True:
+                rows = self.store.execute("SELECT COUNT(*) FROM search_cache_v2").fetchone()[0]
+                used_bytes = self._db_used_bytes()
+
+                excess = rows - self.max_rows
+                if used_bytes > self.max_db_bytes and rows:
+                    # Estimativa pelo tamanho médio da linha, com folga de 10%
+                    excess = max(excess, int(rows * (1 - self.max_db_bytes / used_bytes) * 1.1) + 1)
+                if excess <= 0:
+                    break
+
+                cursor = self.store.execute("""
+                    DELETE FROM search_cache_v2 WHERE cache_key IN (
+                        SELECT cache_key FROM search_cache_v2 ORDER BY last_accessed LIMIT ?
+                    )
+                """, (min(excess, self.maintenance_batch),))
+                if cursor.rowcount <= 0:
+                    break
+                evicted += cursor.rowcount
+                time.sleep(0.05)
+
+            if evicted:
+                logger.info(f"🧹 {evicted} entradas despejadas do cache (LRU)")
+        except Exception as e:
+            logger.error(f"Erro ao aplicar limites do cache: {e}")
+        return evicted
+
+    def incremental_vacuum(self) -> bool:
+        """Devolve páginas livres ao sistema de arquivos sem VACUUM completo"""
+        try:
+            mode = self.store.execute("PRAGMA auto_vacuum").fetchone()[0]
+            if mode != 2:
+                # Conversão única para auto_vacuum=INCREMENTAL (exige um VACUUM completo)
+                self.store.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                self.store.execute("VACUUM")
+                logger.info("🧽 Cache convertido para auto_vacuum incremental")
+            self.store.execute(f"PRAGMA incremental_vacuum({self.vacuum_pages})").fetchall()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ VACUUM incremental do cache falhou: {e}")
+            return False
+
+    def run_maintenance(self, force: bool = False) -> Dict[str, Any]:
+        """Ciclo de manutenção; entre workers, apenas um executa por intervalo"""
+        claimed = self._claim_maintenance()
+        if not claimed and not force:
+            return {'skipped': True}
+
+        self.flush()
+        expired = self.cleanup_expired(max_batches=20)
+        evicted = self.enforce_limits()
+        vacuumed = self.incremental_vacuum()
+
+        with self._stats_lock:
+            self._stats['maintenance_runs'] += 1
+            self._stats['expired_deleted'] += expired
+            self._stats['evicted'] += evicted
+            self._stats['vacuum_runs'] += int(vacuumed)
+
+        return {'skipped': False, 'expired': expired, 'evicted': evicted, 'vacuumed': vacuumed}
+
+    def _claim_maintenance(self) -> bool:
+        now = time.time()
+        try:
+            with self.store.transaction(immediate=True) as conn:
+                row = conn.execute("SELECT last_run FROM search_cache_maintenance WHERE id = 1").fetchone()
+                if row and now - row[0] < self.maintenance_interval * 0.9:
+                    return False
+                conn.execute(
+                    "INSERT OR REPLACE INTO search_cache_maintenance (id, last_run) VALUES (1, ?)",
+                    (now,)
+                )
+            return True
+        except Exception as e:
+            logger.debug(f"Manutenção do cache não reservada: {e}")
+            return False
+
+    def _db_used_bytes(self) -> int:
+        page_size = self.store.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self.store.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self.store.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def clear(self):
+        """Limpa as duas camadas"""
+        with self._pending_lock:
+            self._pending.clear()
+            self._touches.clear()
+        self.memory.clear()
+        self.index = QuerySimilarityIndex(self.index.max_entries)
+        self._index_watermark = time.time()
+        self.store.execute("DELETE FROM search_cache_v2")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas de acerto e latência por camada"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        with self._pending_lock:
+            pending = len(self._pending)
+        try:
+            db_bytes = self._db_used_bytes()
+        except Exception:
+            db_bytes = None
+
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+
+        return {
+            'codec': self.codec,
+            'memory_entries': len(self.memory),
+            'memory_max_entries': self.memory.max_entries,
+            'pending_writes': pending,
+            'lookups': lookups,
+            'hit_rate': round(hits / lookups * 100, 1) if lookups else 0.0,
+            'memory_hits': stats['memory_hits'],
+            'disk_hits': stats['disk_hits'],
+            'fuzzy_hits': stats['fuzzy_hits'],
+            'fuzzy_enabled': self.fuzzy_enabled,
+            'similarity_threshold': self.similarity_threshold,
+            'indexed_queries': len(self.index),
+            'misses': stats['misses'],
+            'expired': stats['expired'],
+            'sets': stats['sets'],
+            'flushes': stats['flushes'],
+            'rows_written': stats['rows_written'],
+            'write_errors': stats['write_errors'],
+            'db_bytes': db_bytes,
+            'max_db_bytes': self.max_db_bytes,
+            'max_rows': self.max_rows,
+            'maintenance_runs': stats['maintenance_runs'],
+            'expired_deleted': stats['expired_deleted'],
+            'evicted': stats['evicted'],
+            'vacuum_runs': stats['vacuum_runs'],
+            'avg_memory_hit_ms': round(stats['memory_hit_time'] / stats['memory_hits'] * 1000, 3) if stats['memory_hits'] else 0.0,
+            'avg_disk_hit_ms': round(stats['disk_hit_time'] / stats['disk_hits'] * 1000, 3) if stats['disk_hits'] else 0.0
+        }
+
+    def _count(self, counter: str, time_counter: Optional[str] = None, elapsed: float = 0.0):
+        with self._stats_lock:
+            self._stats[counter] += 1
+            if time_counter:
+                self._stats[time_counter] += elapsed
+
+    def _ensure_background(self):
+        """Inicia as threads de escrita em lote e de manutenção no processo atual"""
+        pid = os.getpid()
+        if (self._writer and self._writer.is_alive() and self._writer_pid == pid
+                and self._maintenance and self._maintenance.is_alive() and self._maintenance_pid == pid):
+            return
+        with self._pending_lock:
+            if not (self._writer and self._writer.is_alive() and self._writer_pid == pid):
+                self._writer_pid = pid
+                self._writer = threading.Thread(target=self._writer_loop, name='search-cache-writer', daemon=True)
+                self._writer.start()
+            if not (self._maintenance and self._maintenance.is_alive() and self._maintenance_pid == pid):
+                self._maintenance_pid = pid
+                self._maintenance = threading.Thread(
+                    target=self._maintenance_loop, name='search-cache-maintenance', daemon=True
+                )
+                self._maintenance.start()
+
+    def _writer_loop(self):
+        while True:
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            self.flush()
+
+    def _maintenance_loop(self):
+        while True:
+            time.sleep(self.maintenance_interval)
+            try:
+                self.run_maintenance()
+            except Exception as e:
+                logger.error(f"Erro na manutenção do cache: {e}")
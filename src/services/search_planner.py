@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Search Planner
+Distribui um conjunto de queries entre provedores de busca respeitando as quotas restantes
+"""
+
+import os
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class QueryAssignment:
+    """Provedores escolhidos para uma query"""
+    query: str
+    providers: List[str]
+    cached_providers: List[str]
+    expected_results: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'query': self.query,
+            'providers': self.providers,
+            'cached_providers': self.cached_providers,
+            'expected_results': round(self.expected_results, 1)
+        }
+
+@dataclass
+class SearchPlan:
+    """Plano de execução com uso projetado de quota por provedor"""
+    assignments: List[QueryAssignment]
+    target_results: int
+    remaining_quota: Dict[str, Optional[int]]
+    budget: Dict[str, Optional[int]]
+    minute_headroom: Dict[str, Optional[int]] = field(default_factory=dict)
+    projected_usage: Dict[str, int] = field(default_factory=dict)
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @property
+    def underserved_queries(self) -> int:
+        """Queries cujo rendimento esperado fica abaixo do alvo"""
+        return sum(1 for a in self.assignments if a.expected_results < self.target_results)
+
+    def providers_for(self, query: str) -> Optional[List[str]]:
+        for assignment in self.assignments:
+            if assignment.query == query:
+                return assignment.providers
+        return None
+
+    def summary(self) -> str:
+        usage = ', '.join(
+            f"{name}={used}/{self.budget.get(name) if self.budget.get(name) is not None else '∞'}"
+            for name, used in self.projected_usage.items()
+        )
+        return f"{len(self.assignments)} queries | uso projetado: {usage or 'nenhum'} | abaixo do alvo: {self.underserved_queries}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'created_at': self.created_at,
+            'target_results': self.target_results,
+            'remaining_quota': self.remaining_quota,
+            'budget': self.budget,
+            'minute_headroom': self.minute_headroom,
+            'projected_usage': self.projected_usage,
+            'underserved_queries': self.underserved_queries,
+            'assignments': [a.to_dict() for a in self.assignments]
+        }
+
+class SearchPlanner:
+    """Atribui a cada query a combinação mais barata de provedores que atinge o alvo.
+
+    Provedores gratuitos (scraping) custam zero e entram primeiro; provedores com quota
+    recebem, por plano, no máximo max_share da quota restante (SEARCH_PLANNER_MAX_SHARE),
+    então o consumo encolhe gradualmente conforme a quota acaba em vez de zerar de uma vez.
+    Nenhum provedor recebe mais buscas do que cabem agora na sua janela por minuto do
+    rate limiter; o excedente seria recusado ou adiado por acquire.
+    Entre provedores pagos, o mais barato é o com mais quota restante. Queries anteriores
+    da lista têm precedência no orçamento pago.
+    """
+
+    def __init__(self, search_manager):
+        self.search_manager = search_manager
+        self.max_share = float(os.getenv('SEARCH_PLANNER_MAX_SHARE', 0.25))
+        self.target_results = int(os.getenv('SEARCH_PLANNER_TARGET_RESULTS', 15))
+
+    def plan(self, queries: List[str], target_results: Optional[int] = None,
+             max_share: Optional[float] = None, interactive: bool = True) -> SearchPlan:
+        """Monta o plano sem executar nenhuma busca.
+
+        max_share substitui o padrão; interactive=False (aquecimento de cache) nunca usa a
+        busca mínima garantida, deixando o fim da quota para as análises dos usuários.
+        """
+        target = target_results or self.target_results
+        share = self.max_share if max_share is None else max_share
+        manager = self.search_manager
+
+        providers = manager.get_plannable_providers()
+        remaining = {name: manager.get_remaining_quota(name) for name in providers}
+        budget = {
+            name: None if remaining[name] is None else int(remaining[name] * share)
+            for name in providers
+        }
+        # Quota quase no fim: análises interativas ainda fazem uma busca enquanto houver saldo
+        if interactive:
+            for name, value in budget.items():
+                if value == 0 and remaining[name]:
+                    budget[name] = 1
+        headroom = {name: manager.get_minute_headroom(name) for name in providers}
+        limit = {
+            name: min((v for v in (budget[name], headroom[name]) if v is not None), default=None)
+            for name in providers
+        }
+
+        usage = {name: 0 for name in providers}
+        assignments = []
+
+        for query in queries:
+            cached = [name for name in providers if manager.has_cached_results(query, name)]
+            expected = sum(manager.get_expected_yield(name) for name in cached)
+            chosen = []
+
+            for name in sorted(
+                (p for p in providers if p not in cached),
+                key=lambda p: self._cost(p, remaining, usage)
+            ):
+                if expected >= target:
+                    break
+                if limit[name] is not None and usage[name] >= limit[name]:
+                    continue
+                chosen.append(name)
+                usage[name] += 1
+                expected += manager.get_expected_yield(name)
+
+            assignments.append(QueryAssignment(query, chosen, cached, expected))
+
+        plan = SearchPlan(
+            assignments=assignments,
+            target_results=target,
+            remaining_quota=remaining,
+            budget=budget,
+            minute_headroom=headroom,
+            projected_usage={name: used for name, used in usage.items() if used}
+        )
+        logger.info(f"🧭 Plano de busca: {plan.summary()}")
+        return plan
+
+    @staticmethod
+    def _cost(provider: str, remaining: Dict[str, Optional[int]], usage: Dict[str, int]) -> float:
+        """Custo marginal: 0 para ilimitados, inverso da quota que sobraria para os demais"""
+        if remaining[provider] is None:
+            return 0.0
+        left = remaining[provider] - usage[provider]
+        return 1.0 / left if left > 0 else float('inf')
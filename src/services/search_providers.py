@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Search Providers
+Camada única de provedores de busca (Google, Serper, Bing, DuckDuckGo, Yahoo) com
+sessão HTTP, cache, rate limit e agendamento compartilhados
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, InvalidStateError, as_completed, TimeoutError as FuturesTimeoutError
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterable
+
+import requests
+
+from services.http_pool import get_provider_session
+from services.search_cache import ProductionSearchCache
+from services.rate_limiter import SlidingWindowRateLimiter
+from services.politeness_scheduler import PolitenessScheduler
+from services.result_ranker import result_ranker
+from services.serp_parser import parse_bing, parse_duckduckgo, parse_yahoo
+
+logger = logging.getLogger(__name__)
+
+# User agents rotativos para evitar detecção
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:121.0) Gecko/20100101 Firefox/121.0'
+]
+
+def browser_headers(referer: Optional[str] = None) -> Dict[str, str]:
+    """Headers de navegador com user agent rotativo (SEARCH_USER_AGENT_ROTATION)"""
+    headers = {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8,en-US;q=0.7',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Cache-Control': 'max-age=0'
+    }
+
+    if os.getenv('SEARCH_USER_AGENT_ROTATION', 'true').lower() == 'true':
+        headers['User-Agent'] = random.choice(USER_AGENTS)
+    else:
+        headers['User-Agent'] = USER_AGENTS[0]
+
+    if referer:
+        headers['Referer'] = referer
+        headers['Origin'] = referer.rstrip('/')
+    return headers
+
+class SearchProviderError(Exception):
+    """Falha tratável de um provedor.
+
+    backoff adia as próximas requisições do provedor (ex.: 429); disable_for o desliga
+    pelo tempo indicado (quota esgotada, chave inválida)."""
+
+    def __init__(self, message: str, backoff: float = 0.0, disable_for: Optional[float] = None):
+        super().__init__(message)
+        self.backoff = backoff
+        self.disable_for = disable_for
+
+class SearchProvider(ABC):
+    """Estratégia de um motor de busca: monta a requisição e interpreta a resposta.
+
+    Sessão, cache, rate limit, ritmo e contagem de erros ficam no registro: falhas do
+    provedor são contabilizadas em _fetch_now (record_error / desligamento) e o chamador
+    recebe lista vazia."""
+
+    name = ''
+    source = ''
+    priority = 99
+    rate_limits: Dict[str, int] = {}
+    quota_limited = False  # quota entra no orçamento do SearchPlanner
+    expected_yield = 5  # resultados por busca até haver histórico
+    scraping = False
+    cache_ttl = int(os.getenv('SEARCH_CACHE_TTL_SCRAPING', 21600))
+
+    def is_configured(self) -> bool:
+        return True
+
+    @abstractmethod
+    def fetch(self, session: requests.Session, query: str, max_results: int, timeout: float) -> List[Dict[str, str]]:
+        """Executa a busca; retorna [{'title', 'url', 'snippet'}] ou levanta SearchProviderError"""
+
+class GoogleCustomSearchProvider(SearchProvider):
+    """Google Custom Search JSON API.
+
+    Antes da camada única cada serviço montava a própria chamada (SearchManager e
+    DeepSearch: dateRestrict=m6, source 'google'/'google_real'; ProductionSearchManager:
+    dateRestrict=y1, sort=date, source 'google_custom'). Com cache e quota compartilhados
+    os parâmetros precisam ser únicos: valem os do ProductionSearchManager, que alimenta a
+    análise principal e o aquecimento de cache. GOOGLE_SEARCH_DATE_RESTRICT e
+    GOOGLE_SEARCH_SORT (vazio desliga) ajustam a janela e a ordenação.
+    """
+
+    name = 'google'
+    source = 'google_custom'
+    priority = 1
+    rate_limits = {'minute': 10, 'day': 100}
+    quota_limited = True
+    expected_yield = 10
+    cache_ttl = int(os.getenv('SEARCH_CACHE_TTL_API', 86400))  # API paga: resultados estáveis
+    url = "https://www.googleapis.com/customsearch/v1"
+
+    def is_configured(self) -> bool:
+        return bool(os.getenv('GOOGLE_SEARCH_KEY') and os.getenv('GOOGLE_CSE_ID'))
+
+    def fetch(self, session, query, max_results, timeout):
+        params = {
+            'key': os.getenv('GOOGLE_SEARCH_KEY'),
+            'cx': os.getenv('GOOGLE_CSE_ID'),
+            'q': query,
+            'num': min(max_results, 10),
+            'lr': 'lang_pt',
+            'gl': 'br',
+            'safe': 'off',
+            'fields': 'items(title,link,snippet,displayLink)'
+        }
+        date_restrict = os.getenv('GOOGLE_SEARCH_DATE_RESTRICT', 'y1')
+        sort = os.getenv('GOOGLE_SEARCH_SORT', 'date')
+        if date_restrict:
+            params['dateRestrict'] = date_restrict
+        if sort:
+            params['sort'] = sort
+        response = session.get(self.url, params=params, headers=browser_headers('https://www.google.com/'), timeout=timeout)
+        logger.info(f"🔍 Google API Response: {response.status_code}")
+
+        if response.status_code == 403:
+            raise SearchProviderError("Acesso negado (403) - verifique chaves e quotas", disable_for=3600)
+        if response.status_code == 429:
+            raise SearchProviderError("Rate limit (429)", disable_for=3600)
+        if response.status_code != 200:
+            raise SearchProviderError(f"Status {response.status_code}")
+
+        data = response.json()
+        if 'error' in data:
+            message = data['error'].get('message', 'Erro desconhecido')
+            if 'quota' in message.lower() or 'limit' in message.lower():
+                raise SearchProviderError(message, disable_for=86400)
+            raise SearchProviderError(message)
+
+        return [
+            {'title': item.get('title', ''), 'url': item.get('link', ''), 'snippet': item.get('snippet', '')}
+            for item in data.get('items', [])
+        ]
+
+class SerperProvider(SearchProvider):
+    """Serper (resultados do Google via API)"""
+
+    name = 'serper'
+    source = 'serper'
+    priority = 2
+    rate_limits = {'minute': 60, 'month': 2500}
+    quota_limited = True
+    expected_yield = 10
+    cache_ttl = int(os.getenv('SEARCH_CACHE_TTL_API', 86400))
+    url = "https://google.serper.dev/search"
+
+    def is_configured(self) -> bool:
+        api_key = os.getenv('SERPER_API_KEY')
+        return bool(api_key and len(api_key) >= 30)
+
+    def fetch(self, session, query, max_results, timeout):
+        headers = {
+            **browser_headers(),
+            'X-API-KEY': os.getenv('SERPER_API_KEY'),
+            'Content-Type': 'application/json'
+        }
+        payload = {'q': query, 'gl': 'br', 'hl': 'pt', 'num': max_results, 'autocorrect': True, 'page': 1}
+        response = session.post(self.url, json=payload, headers=headers, timeout=timeout)
+
+        if response.status_code == 429:
+            raise SearchProviderError("Rate limit (429)", disable_for=3600)
+        if response.status_code != 200:
+            raise SearchProviderError(f"Status {response.status_code}")
+
+        return [
+            {'title': item.get('title', ''), 'url': item.get('link', ''), 'snippet': item.get('snippet', '')}
+            for item in response.json().get('organic', [])
+        ]
+
+class BingProvider(SearchProvider):
+    """Bing via scraping"""
+
+    name = 'bing'
+    source = 'bing_scraping'
+    priority = 3
+    rate_limits = {'minute': 20, 'hour': 1000}
+    expected_yield = 8
+    scraping = True
+    url = "https://www.bing.com/search"
+
+    def fetch(self, session, query, max_results, timeout):
+        params = {'q': query, 'cc': 'br', 'setlang': 'pt-br', 'count': max_results, 'first': 1, 'FORM': 'PERE'}
+        response = session.get(self.url, params=params, headers=browser_headers('https://www.bing.com/'),
+                               timeout=timeout, allow_redirects=True)
+
+        if response.status_code == 429:
+            raise SearchProviderError("Rate limit detectado (429)", backoff=5)
+        if response.status_code != 200:
+            raise SearchProviderError(f"Status {response.status_code}")
+        return parse_bing(response.content, max_results)
+
+class DuckDuckGoProvider(SearchProvider):
+    """DuckDuckGo (versão HTML) via scraping"""
+
+    name = 'duckduckgo'
+    source = 'duckduckgo_scraping'
+    priority = 4
+    rate_limits = {'minute': 10, 'hour': 500}
+    expected_yield = 6
+    scraping = True
+    url = "https://html.duckduckgo.com/html/"
+
+    def fetch(self, session, query, max_results, timeout):
+        params = {'q': query, 'b': '', 'kl': 'br-pt', 'df': 'm'}
+        response = session.get(self.url, params=params, headers=browser_headers('https://duckduckgo.com/'), timeout=timeout)
+
+        if response.status_code == 202:
+            # Busca "em processamento": na prática, bloqueio temporário
+            raise SearchProviderError("Busca em processamento (202)", backoff=5)
+        if response.status_code != 200:
+            raise SearchProviderError(f"Status {response.status_code}")
+        return parse_duckduckgo(response.content, max_results)
+
+class YahooProvider(SearchProvider):
+    """Yahoo Brasil via scraping"""
+
+    name = 'yahoo'
+    source = 'yahoo_scraping'
+    priority = 5
+    rate_limits = {'minute': 10, 'hour': 500}
+    expected_yield = 6
+    scraping = True
+    url = "https://br.search.yahoo.com/search"
+
+    def fetch(self, session, query, max_results, timeout):
+        response = session.get(self.url, params={'p': query}, headers=browser_headers('https://br.search.yahoo.com/'),
+                               timeout=timeout)
+
+        if response.status_code == 429:
+            raise SearchProviderError("Rate limit detectado (429)", backoff=5)
+        if response.status_code != 200:
+            raise SearchProviderError(f"Status {response.status_code}")
+        return parse_yahoo(response.content, max_results)
+
+class SearchProviderRegistry:
+    """Provedores registrados e a infraestrutura que todos compartilham.
+
+    Toda busca passa por: cache por (query, provedor) → rate limit de janela deslizante
+    → agendador (intervalo/jitter por provedor, sem threads dormindo) → sessão HTTP
+    keep-alive única. Erros são contados por provedor; muitos erros ou quota esgotada
+    desligam o provedor até quota_reset.
+    """
+
+    MAX_ERRORS = 5
+
+    def __init__(self, providers: Iterable[SearchProvider] = ()):
+        self.cache = ProductionSearchCache()
+        self.rate_limiter = SlidingWindowRateLimiter()
+        self.rate_limit_max_wait = float(os.getenv('SEARCH_RATE_LIMIT_MAX_WAIT', 2.0))
+        self.request_timeout = int(os.getenv('REQUEST_TIMEOUT', 30))
+
+        # APIs só limitadas pelo rate limiter; scraping com ritmo e jitter próprios
+        self.scheduler = PolitenessScheduler(
+            'search',
+            max_workers=int(os.getenv('SEARCH_PROVIDER_WORKERS', 6)),
+            max_in_flight=int(os.getenv('SEARCH_API_MAX_IN_FLIGHT', 4))
+        )
+        self.scraping_min_interval = float(os.getenv('SEARCH_SCRAPING_MIN_INTERVAL', 1.0))
+        self.scraping_jitter = float(os.getenv('SEARCH_SCRAPING_JITTER', 1.0))
+        self.scraping_max_in_flight = int(os.getenv('SEARCH_SCRAPING_MAX_IN_FLIGHT', 2))
+
+        self._providers: Dict[str, SearchProvider] = {}
+        # Estado mutável por provedor (mesmo formato exposto em get_provider_status)
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        for provider in providers:
+            self.register(provider)
+
+    def register(self, provider: SearchProvider, min_interval: Optional[float] = None,
+                 jitter: Optional[float] = None):
+        """Registra um provedor (substitui outro de mesmo nome)"""
+        self._providers[provider.name] = provider
+        self.state[provider.name] = {
+            'enabled': provider.is_configured(),
+            'priority': provider.priority,
+            'rate_limits': dict(provider.rate_limits),
+            'error_count': 0,
+            'last_error': None,
+            'quota_reset': None,
+            'quota_limited': provider.quota_limited,
+            'expected_yield': provider.expected_yield,
+            'cache_ttl': provider.cache_ttl,
+            'scraping': provider.scraping
+        }
+        self.rate_limiter.configure(provider.name, provider.rate_limits)
+
+        if provider.scraping:
+            self.scheduler.configure(
+                provider.name,
+                min_interval=self.scraping_min_interval if min_interval is None else min_interval,
+                jitter=self.scraping_jitter if jitter is None else jitter,
+                max_in_flight=self.scraping_max_in_flight
+            )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._providers
+
+    def get(self, name: str) -> Optional[SearchProvider]:
+        return self._providers.get(name)
+
+    def names(self, available_only: bool = False) -> List[str]:
+        """Provedores em ordem de prioridade"""
+        names = sorted(self._providers, key=lambda n: self._providers[n].priority)
+        if available_only:
+            names = [name for name in names if self.is_available(name)]
+        return names
+
+    @property
+    def session(self) -> requests.Session:
+        """Sessão keep-alive compartilhada por todos os provedores (uma por processo)"""
+        return get_provider_session('search')
+
+    # ------------------------------------------------------------------ estado
+
+    def is_available(self, name: str) -> bool:
+        """Provedor habilitado (reabilitado se o prazo de desligamento passou) e com poucos erros"""
+        state = self.state[name]
+        if not state['enabled']:
+            self._reset_if_needed(name)
+        return state['enabled'] and state['error_count'] < self.MAX_ERRORS
+
+    def record_error(self, name: str, error: Exception):
+        """Conta erro do provedor; desliga por 1h ao atingir MAX_ERRORS"""
+        with self._lock:
+            state = self.state[name]
+            state['error_count'] += 1
+            state['last_error'] = str(error)
+            if state['error_count'] >= self.MAX_ERRORS:
+                logger.error(f"❌ Provedor {name} desabilitado temporariamente (muitos erros)")
+                self._disable(name, 3600)
+
+    def reset(self, name: Optional[str] = None):
+        """Zera erros e reabilita um provedor (ou todos)"""
+        with self._lock:
+            for provider_name in ([name] if name else list(self.state)):
+                if provider_name not in self.state:
+                    continue
+                state = self.state[provider_name]
+                state['error_count'] = 0
+                state['enabled'] = self._providers[provider_name].is_configured()
+                state['quota_reset'] = None
+
+    def _disable(self, name: str, seconds: float):
+        state = self.state[name]
+        state['enabled'] = False
+        state['quota_reset'] = time.time() + seconds
+
+    def _reset_if_needed(self, name: str):
+        with self._lock:
+            state = self.state[name]
+            if not state['enabled'] and state['quota_reset'] and time.time() > state['quota_reset']:
+                logger.info(f"🔄 Reabilitando provedor {name}")
+                state['enabled'] = self._providers[name].is_configured()
+                state['quota_reset'] = None
+                state['error_count'] = 0
+
+    def acquire(self, name: str) -> float:
+        """Consome uma vaga do rate limit sem esperar; retorna 0.0 ou os segundos até a próxima vaga"""
+        return self.rate_limiter.acquire(name)
+
+    # ------------------------------------------------------------------ busca
+
+    def fetch(self, name: str, query: str, max_results: int = 10,
+              timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Busca na rede em um provedor (sem cache), no ritmo do agendador; erros viram lista vazia"""
+        try:
+            return self.submit(name, query, max_results).result(timeout=timeout or self.request_timeout * 2)
+        except FuturesTimeoutError:
+            logger.warning(f"⏰ Timeout aguardando {name}")
+            return []
+
+    def _fetch_now(self, name: str, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Requisição ao provedor (vaga do rate limit já consumida)"""
+        provider = self._providers[name]
+        try:
+            items = provider.fetch(self.session, query, max_results, self.request_timeout)
+        except SearchProviderError as e:
+            logger.warning(f"⚠️ {name}: {e}")
+            if e.backoff:
+                self.scheduler.backoff(name, e.backoff)
+            if e.disable_for:
+                with self._lock:
+                    self.state[name]['last_error'] = str(e)
+                    self._disable(name, e.disable_for)
+            return []
+        except requests.exceptions.Timeout:
+            logger.error(f"⏰ Timeout na busca {name}")
+            return []
+        except Exception as e:
+            logger.error(f"❌ Erro na busca {name}: {e}")
+            self.record_error(name, e)
+            return []
+
+        now = datetime.now().isoformat()
+        results = []
+        for item in items:
+            url = item.get('url', '')
+            if url and item.get('title') and url.startswith('http'):
+                results.append({
+                    'title': item['title'],
+                    'url': url,
+                    'snippet': item.get('snippet', ''),
+                    'source': provider.source,
+                    'relevance_score': 0.0,
+                    'timestamp': now
+                })
+
+        logger.info(f"✅ {name}: {len(results)} resultados válidos")
+        return results
+
+    def submit(self, name: str, query: str, max_results: int = 10) -> Future:
+        """Agenda a busca no ritmo do provedor; retorna Future com a lista de resultados.
+
+        A espera do rate limit vira atraso no agendador (backoff), nunca sleep numa thread
+        do pool: esperas de até rate_limit_max_wait (ou qualquer espera, para scraping) são
+        reagendadas; esperas maiores em APIs resolvem com lista vazia.
+        """
+        future: Future = Future()
+        self._enqueue(name, query, max_results, future, time.time() + self.rate_limit_max_wait)
+        return future
+
+    def _enqueue(self, name: str, query: str, max_results: int, future: Future, deadline: float):
+        wait = self.rate_limiter.time_until_available(name)
+        if wait > 0 and self._providers[name].scraping:
+            deadline = max(deadline, time.time() + wait + self.rate_limit_max_wait)
+        if 0 < wait and time.time() + wait <= deadline:
+            self.scheduler.backoff(name, wait)
+        self.scheduler.submit(name, self._run_fetch, name, query, max_results, future, deadline)
+
+    def _run_fetch(self, name: str, query: str, max_results: int, future: Future, deadline: float):
+        """Job do agendador: consome a vaga do rate limit ou reagenda a busca"""
+        if future.done():
+            return  # cancelada pelo chamador
+        try:
+            if not self.is_available(name):
+                self._resolve(future, [])
+                return
+            wait = self.acquire(name)
+            if wait > 0 and time.time() + wait <= deadline:
+                self._enqueue(name, query, max_results, future, deadline)
+                return
+            if wait > 0:
+                logger.warning(f"⚠️ Rate limit atingido para {name} (próxima vaga em {wait:.0f}s)")
+                self._resolve(future, [])
+                return
+            self._resolve(future, self._fetch_now(name, query, max_results))
+        except BaseException as e:
+            try:
+                future.set_exception(e)
+            except InvalidStateError:
+                pass
+
+    @staticmethod
+    def _resolve(future: Future, results: List[Dict[str, Any]]):
+        try:
+            future.set_result(results)
+        except InvalidStateError:
+            pass  # cancelada enquanto buscava
+
+    def cached(self, name: str, query: str) -> Optional[List[Dict[str, Any]]]:
+        return self.cache.get(query, name)
+
+    def store(self, name: str, query: str, results: List[Dict[str, Any]]):
+        """Cacheia resultados (vazios não, para serem tentados de novo)"""
+        if results:
+            self.cache.set(query, results, name, ttl=self.state[name]['cache_ttl'])
+
+    def search(self, name: str, query: str, max_results: int = 10, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Busca em um provedor passando por cache, rate limit e agendador"""
+        if name not in self._providers:
+            return []
+        cached = self.cached(name, query)
+        if cached is not None:
+            return cached[:max_results]
+
+        results = self.fetch(name, query, max_results, timeout)
+        self.store(name, query, results)
+        return results
+
+    async def asearch(self, name: str, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """Versão assíncrona de search (o fetch roda no pool do agendador)"""
+        if name not in self._providers:
+            return []
+        cached = self.cached(name, query)
+        if cached is not None:
+            return cached[:max_results]
+
+        results = await asyncio.wrap_future(self.submit(name, query, max_results))
+        self.store(name, query, results)
+        return results
+
+    def search_many(self, query: str, names: Optional[List[str]] = None, max_results: int = 10,
+                    timeout: float = 60) -> Dict[str, List[Dict[str, Any]]]:
+        """Busca em vários provedores em paralelo; retorna resultados por provedor"""
+        names = names if names is not None else self.names(available_only=True)
+        provider_results: Dict[str, List[Dict[str, Any]]] = {}
+
+        futures = {}
+        for name in names:
+            if name not in self._providers:
+                continue
+            cached = self.cached(name, query)
+            if cached is not None:
+                provider_results[name] = cached[:max_results]
+            elif self.is_available(name):
+                futures[self.submit(name, query, max_results)] = name
+
+        for future in as_completed_within(futures, timeout):
+            name = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.error(f"❌ Erro em {name}: {e}")
+                continue
+            self.store(name, query, results)
+            if results:
+                provider_results[name] = results
+
+        return provider_results
+
+    def multi_search(self, query: str, names: Optional[List[str]] = None, max_results: int = 10,
+                     per_provider: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Busca em vários provedores e mescla por RRF (ver ResultRanker)"""
+        provider_results = self.search_many(query, names, per_provider or max_results)
+        return result_ranker.fuse(provider_results)[:max_results]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado, uso do rate limit e fila por provedor"""
+        scheduler_status = self.scheduler.get_status()
+        status = {}
+        for name in self.names():
+            state = self.state[name]
+            status[name] = {
+                **{key: value for key, value in state.items() if key != 'rate_limits'},
+                'rate_limited': (state.get('quota_reset') or 0) > time.time(),
+                'rate_limits': self.rate_limiter.usage(name),
+                'next_slot_in': round(self.rate_limiter.time_until_available(name), 1)
+            }
+            if name in scheduler_status:
+                status[name]['scheduler'] = scheduler_status[name]
+        return status
+
+def as_completed_within(futures, timeout: float):
+    """as_completed que, no timeout, cancela o que ainda está na fila em vez de propagar erro"""
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            yield future
+    except FuturesTimeoutError:
+        pending = [str(futures[f]) for f in futures if not f.done()]
+        for future in futures:
+            future.cancel()
+        logger.warning(f"⏰ Timeout aguardando: {', '.join(pending)}")
+
+# Instância global
+search_provider_registry = SearchProviderRegistry([
+    GoogleCustomSearchProvider(),
+    SerperProvider(),
+    BingProvider(),
+    DuckDuckGoProvider(),
+    YahooProvider()
+])
+search_provider_registry.scheduler.configure('duckduckgo', min_interval=1.5, jitter=1.5)
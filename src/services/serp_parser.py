@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - SERP Parser
+Parsing de páginas de resultado (Bing, DuckDuckGo, Yahoo) com lxml e XPaths pré-compilados
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+from urllib.parse import parse_qs, unquote
+
+from bs4 import BeautifulSoup, UnicodeDammit
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+logger = logging.getLogger(__name__)
+
+def _has_class(name: str) -> str:
+    """Predicado XPath equivalente ao seletor CSS .name"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+@dataclass(frozen=True)
+class SerpLayout:
+    """Seletores de uma SERP: CSS (fallback BeautifulSoup) e XPath equivalente, na
+    mesma ordem de preferência. Para itens vale a primeira regra com resultado; para
+    título e snippet, o primeiro elemento encontrado (ordem do documento)."""
+    items_css: tuple
+    items_xpath: tuple
+    title_css: tuple
+    title_xpath: tuple
+    snippet_css: tuple
+    snippet_xpath: tuple
+
+BING = SerpLayout(
+    items_css=('li.b_algo', '.b_algo', 'li[class*="algo"]', '.b_webResult'),
+    items_xpath=(
+        f"//li[{_has_class('b_algo')}]",
+        f"//*[{_has_class('b_algo')}]",
+        "//li[contains(@class, 'algo')]",
+        f"//*[{_has_class('b_webResult')}]"
+    ),
+    title_css=('h2 a', 'h2', '.b_title a', 'a[href]'),
+    title_xpath=(
+        "(.//h2//a)[1]",
+        "(.//h2)[1]",
+        f"(.//*[{_has_class('b_title')}]//a)[1]",
+        "(.//a[@href])[1]"
+    ),
+    snippet_css=('.b_caption p', 'p', '.b_snippet', '[class*="caption"]'),
+    snippet_xpath=(
+        f"(.//*[{_has_class('b_caption')}]//p)[1]",
+        "(.//p)[1]",
+        f"(.//*[{_has_class('b_snippet')}])[1]",
+        "(.//*[contains(@class, 'caption')])[1]"
+    )
+)
+
+DUCKDUCKGO = SerpLayout(
+    items_css=('.result', 'div[class*="result"]', '.web-result', '.results_links'),
+    items_xpath=(
+        f"//*[{_has_class('result')}]",
+        "//div[contains(@class, 'result')]",
+        f"//*[{_has_class('web-result')}]",
+        f"//*[{_has_class('results_links')}]"
+    ),
+    title_css=('.result__a', 'a.result__title', 'h2 a', 'a[href*="uddg"]'),
+    title_xpath=(
+        f"(.//*[{_has_class('result__a')}])[1]",
+        f"(.//a[{_has_class('result__title')}])[1]",
+        "(.//h2//a)[1]",
+        "(.//a[contains(@href, 'uddg')])[1]"
+    ),
+    snippet_css=('.result__snippet', '.snippet', 'p'),
+    snippet_xpath=(
+        f"(.//*[{_has_class('result__snippet')}])[1]",
+        f"(.//*[{_has_class('snippet')}])[1]",
+        "(.//p)[1]"
+    )
+)
+
+YAHOO = SerpLayout(
+    items_css=('div.Sr', '.algo', 'li div.dd'),
+    items_xpath=(
+        f"//div[{_has_class('Sr')}]",
+        f"//*[{_has_class('algo')}]",
+        f"//li//div[{_has_class('dd')}]"
+    ),
+    title_css=('h3 a', 'a[href]'),
+    title_xpath=(
+        "(.//h3//a)[1]",
+        "(.//a[@href])[1]"
+    ),
+    snippet_css=('span.fz-ms', '.compText', 'p'),
+    snippet_xpath=(
+        f"(.//span[{_has_class('fz-ms')}])[1]",
+        f"(.//*[{_has_class('compText')}])[1]",
+        "(.//p)[1]"
+    )
+)
+
+class _CompiledLayout:
+    """XPaths do layout compilados uma única vez"""
+
+    def __init__(self, layout: SerpLayout):
+        self.items = [etree.XPath(x) for x in layout.items_xpath]
+        self.title = [etree.XPath(x) for x in layout.title_xpath]
+        self.snippet = [etree.XPath(x) for x in layout.snippet_xpath]
+        self.text = etree.XPath(".//text()")
+
+_COMPILED: Dict[str, '_CompiledLayout'] = {}
+if HAS_LXML:
+    _COMPILED = {
+        'bing': _CompiledLayout(BING),
+        'duckduckgo': _CompiledLayout(DUCKDUCKGO),
+        'yahoo': _CompiledLayout(YAHOO)
+    }
+
+_LAYOUTS = {'bing': BING, 'duckduckgo': DUCKDUCKGO, 'yahoo': YAHOO}
+
+Markup = Union[str, bytes]
+
+def parse_bing(markup: Markup, max_results: int = 10) -> List[Dict[str, str]]:
+    """Resultados orgânicos do Bing: [{'title', 'url', 'snippet'}]"""
+    return parse_serp('bing', markup, max_results)
+
+def parse_duckduckgo(markup: Markup, max_results: int = 10) -> List[Dict[str, str]]:
+    """Resultados do DuckDuckGo HTML (URLs /l/?uddg= já decodificadas)"""
+    results = parse_serp('duckduckgo', markup, max_results, validate=False)
+    for result in results:
+        result['url'] = _decode_uddg(result['url'])
+    return [r for r in results if r['url'] and r['title'] and r['url'].startswith('http')]
+
+def parse_yahoo(markup: Markup, max_results: int = 10) -> List[Dict[str, str]]:
+    """Resultados do Yahoo (URLs de r.search.yahoo.com/.../RU=<url>/ já decodificadas)"""
+    results = parse_serp('yahoo', markup, max_results)
+    for result in results:
+        result['url'] = _decode_yahoo(result['url'])
+    return results
+
+def parse_serp(engine: str, markup: Markup, max_results: int = 10, validate: bool = True,
+               use_lxml: Optional[bool] = None) -> List[Dict[str, str]]:
+    """Extrai título/URL/snippet dos primeiros max_results itens da SERP.
+
+    use_lxml=None escolhe lxml quando instalado; BeautifulSoup(html.parser) é o fallback
+    e produz o mesmo resultado."""
+    if use_lxml is None:
+        use_lxml = HAS_LXML
+
+    if use_lxml:
+        try:
+            results = _parse_lxml(_COMPILED[engine], markup, max_results)
+        except (etree.ParserError, ValueError) as e:
+            logger.debug(f"lxml falhou na SERP {engine}, usando BeautifulSoup: {e}")
+            results = _parse_bs4(_LAYOUTS[engine], markup, max_results)
+    else:
+        results = _parse_bs4(_LAYOUTS[engine], markup, max_results)
+
+    if validate:
+        results = [r for r in results if r['url'] and r['title'] and r['url'].startswith('http')]
+    return results
+
+def _parse_lxml(compiled: _CompiledLayout, markup: Markup, max_results: int) -> List[Dict[str, str]]:
+    if isinstance(markup, bytes):
+        # Mesma detecção de encoding do BeautifulSoup
+        markup = UnicodeDammit(markup, is_html=True).unicode_markup
+    root = lxml.html.document_fromstring(markup)
+
+    items = []
+    for xpath in compiled.items:
+        items = xpath(root)
+        if items:
+            break
+
+    results = []
+    for item in items[:max_results]:
+        title_elem = _first(compiled.title, item)
+        if title_elem is None:
+            continue
+        snippet_elem = _first(compiled.snippet, item)
+        results.append({
+            'title': _text(compiled, title_elem),
+            'url': title_elem.get('href', ''),
+            'snippet': _text(compiled, snippet_elem) if snippet_elem is not None else ''
+        })
+    return results
+
+def _first(xpaths, item):
+    for xpath in xpaths:
+        found = xpath(item)
+        if found:
+            return found[0]
+    return None
+
+def _text(compiled: _CompiledLayout, element) -> str:
+    """Equivalente a get_text(strip=True) do BeautifulSoup"""
+    return ''.join(piece.strip() for piece in compiled.text(element) if piece.strip())
+
+def _parse_bs4(layout: SerpLayout, markup: Markup, max_results: int) -> List[Dict[str, str]]:
+    soup = BeautifulSoup(markup, 'html.parser')
+
+    items = []
+    for selector in layout.items_css:
+        items = soup.select(selector)
+        if items:
+            break
+
+    results = []
+    for item in items[:max_results]:
+        title_elem = _first_css(layout.title_css, item)
+        if not title_elem:
+            continue
+        snippet_elem = _first_css(layout.snippet_css, item)
+        results.append({
+            'title': title_elem.get_text(strip=True),
+            'url': title_elem.get('href', ''),
+            'snippet': snippet_elem.get_text(strip=True) if snippet_elem else ''
+        })
+    return results
+
+def _first_css(selectors, item):
+    for selector in selectors:
+        found = item.select_one(selector)
+        if found:
+            return found
+    return None
+
+def _decode_uddg(url: str) -> str:
+    """DuckDuckGo usa URLs redirecionadas: /l/?uddg=<url real>"""
+    if url.startswith('/l/?uddg='):
+        parsed = parse_qs(url.split('?')[1])
+        if 'uddg' in parsed:
+            return unquote(parsed['uddg'][0])
+    return url
+
+def _decode_yahoo(url: str) -> str:
+    """Yahoo redireciona por r.search.yahoo.com/<params>/RU=<url real>/RK=..."""
+    if 'r.search.yahoo.com' in url and '/RU=' in url:
+        return unquote(url.split('/RU=', 1)[1].split('/', 1)[0])
+    return url
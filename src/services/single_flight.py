@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Single Flight
+Coalescência de chamadas idênticas concorrentes entre threads e entre workers
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from services.sqlite_store import CACHE_DIR, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+COORDINATION_DB = os.getenv('COORDINATION_DB_PATH', os.path.join(CACHE_DIR, 'coordination.db'))
+
+_MISSING = object()
+
+class _Call:
+    """Chamada em andamento no processo atual"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+class SingleFlight:
+    """Executa fn uma única vez por chave; chamadas concorrentes aguardam o resultado.
+
+    Dentro do processo os seguidores esperam um Event. Entre workers, o líder reserva
+    a chave em uma tabela SQLite compartilhada (lease com expiração) e publica ali o
+    resultado serializado em JSON por result_ttl segundos; seguidores de outros
+    processos consultam a linha até o resultado aparecer ou o lease expirar.
+    """
+
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS single_flight (
+            flight_key TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            state TEXT NOT NULL,
+            result TEXT,
+            expires_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_single_flight_expires ON single_flight(expires_at)"
+    ]
+
+    def __init__(self, namespace: str, lease_timeout: float = 120.0, result_ttl: float = 30.0,
+                 db_path: str = COORDINATION_DB):
+        self.namespace = namespace
+        self.lease_timeout = lease_timeout
+        self.result_ttl = result_ttl
+        self.poll_interval = float(os.getenv('SINGLE_FLIGHT_POLL_INTERVAL', 0.25))
+        self.shared = os.getenv('SINGLE_FLIGHT_SHARED', 'true').lower() == 'true'
+
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self._store: Optional[SQLiteStore] = None
+
+        if self.shared:
+            try:
+                self._store = SQLiteStore(db_path, self.SCHEMA)
+            except Exception as e:
+                logger.warning(f"⚠️ Single flight '{namespace}' sem coordenação entre workers: {e}")
+
+        self._stats_lock = threading.Lock()
+        self._stats = {'leader': 0, 'local_followers': 0, 'shared_followers': 0, 'shared_fallbacks': 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Executa fn para a chave ou aguarda a execução já em andamento"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            self._count('local_followers')
+            # Se o líder travar além do lease, segue por conta própria
+            if not call.done.wait(self.lease_timeout):
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_shared(key, fn)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.result
+
+    def _run_shared(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Coordena a chave com outros workers (ou executa direto sem backend)"""
+        if self._store is None:
+            self._count('leader')
+            return fn()
+
+        flight_key = f"{self.namespace}:{key}"
+        owner = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        try:
+            acquired, shared_result = self._acquire(flight_key, owner)
+        except Exception as e:
+            logger.debug(f"Single flight sem backend compartilhado: {e}")
+            self._count('leader')
+            return fn()
+
+        if shared_result is not _MISSING:
+            self._count('shared_followers')
+            return shared_result
+
+        if not acquired:
+            shared_result = self._wait_shared(flight_key)
+            if shared_result is not _MISSING:
+                self._count('shared_followers')
+                return shared_result
+            # Líder remoto falhou ou expirou: executa localmente
+            self._count('shared_fallbacks')
+            try:
+                acquired, _ = self._acquire(flight_key, owner)
+            except Exception:
+                acquired = False
+
+        self._count('leader')
+        try:
+            result = fn()
+        except BaseException:
+            if acquired:
+                self._release(flight_key, owner)
+            raise
+
+        if acquired:
+            self._publish(flight_key, owner, result)
+        return result
+
+    def _acquire(self, flight_key: str, owner: str) -> Tuple[bool, Any]:
+        """Reserva a chave; retorna (líder?, resultado publicado ou _MISSING)"""
+        now = time.time()
+        with self._store.transaction(immediate=True) as conn:
+            row = conn.execute(
+                "SELECT state, result, expires_at FROM single_flight WHERE flight_key = ?",
+                (flight_key,)
+            ).fetchone()
+
+            if row and row[2] > now:
+                state, result, _ = row
+                if state == 'done':
+                    return False, json.loads(result)
+                return False, _MISSING
+
+            conn.execute(
+                "INSERT OR REPLACE INTO single_flight (flight_key, owner, state, result, expires_at) "
+                "VALUES (?, ?, 'running', NULL, ?)",
+                (flight_key, owner, now + self.lease_timeout)
+            )
+        return True, _MISSING
+
+    def _wait_shared(self, flight_key: str) -> Any:
+        """Aguarda o líder de outro worker publicar o resultado"""
+        deadline = time.time() + self.lease_timeout
+        interval = self.poll_interval
+
+        while time.time() < deadline:
+            time.sleep(interval)
+            interval = min(interval * 1.5, 2.0)
+
+            try:
+                row = self._store.execute(
+                    "SELECT state, result, expires_at FROM single_flight WHERE flight_key = ?",
+                    (flight_key,)
+                ).fetchone()
+            except Exception as e:
+                logger.debug(f"Falha ao consultar chave single flight: {e}")
+                return _MISSING
+            if not row or row[2] <= time.time():
+                return _MISSING
+            if row[0] == 'done':
+                return json.loads(row[1])
+
+        return _MISSING
+
+    def _publish(self, flight_key: str, owner: str, result: Any):
+        """Publica o resultado para seguidores de outros workers"""
+        try:
+            payload = json.dumps(result, ensure_ascii=False, default=str)
+            self._store.execute(
+                "UPDATE single_flight SET state = 'done', result = ?, expires_at = ? "
+                "WHERE flight_key = ? AND owner = ?",
+                (payload, time.time() + self.result_ttl, flight_key, owner)
+            )
+            self._purge_expired()
+        except Exception as e:
+            logger.debug(f"Falha ao publicar resultado single flight: {e}")
+            self._release(flight_key, owner)
+
+    def _release(self, flight_key: str, owner: str):
+        try:
+            self._store.execute(
+                "DELETE FROM single_flight WHERE flight_key = ? AND owner = ?",
+                (flight_key, owner)
+            )
+        except Exception as e:
+            logger.debug(f"Falha ao liberar chave single flight: {e}")
+
+    def _purge_expired(self):
+        """Remove linhas expiradas no máximo uma vez por minuto"""
+        now = time.time()
+        if now - self._last_purge < 60:
+            return
+        self._last_purge = now
+        self._store.execute("DELETE FROM single_flight WHERE expires_at <= ?", (now,))
+
+    def _count(self, counter: str):
+        with self._stats_lock:
+            self._stats[counter] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de líderes e seguidores coalescidos"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        with self._lock:
+            stats['in_flight'] = len(self._calls)
+        stats['shared'] = self._store is not None
+        return stats
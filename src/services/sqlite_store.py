@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - SQLite Store
+Backend SQLite compartilhado (WAL + conexões por thread) para cache e estado entre workers
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bancos padrão ficam em <projeto>/cache, qualquer que seja o diretório de trabalho
+# (run_production.py roda o gunicorn com --chdir src)
+CACHE_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'cache'))
+
+class _ThreadConnection:
+    """Conexão de uma thread; o threading.local a descarta quando a thread termina"""
+    __slots__ = ('conn', 'pid', '__weakref__')
+
+    def __init__(self, conn: sqlite3.Connection, pid: int):
+        self.conn = conn
+        self.pid = pid
+
+def _close_connection(conn: sqlite3.Connection, pid: int, registry: Dict[int, Tuple[sqlite3.Connection, int]],
+                      lock: threading.Lock):
+    """Fecha a conexão de uma thread encerrada; herdadas de outro processo (fork) só são esquecidas"""
+    with lock:
+        registry.pop(id(conn), None)
+    if pid != os.getpid():
+        return
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+class SQLiteStore:
+    """Banco SQLite em modo WAL com uma conexão reaproveitada por thread"""
+
+    def __init__(self, db_path: str, schema: Optional[Iterable[str]] = None, busy_timeout_ms: int = 5000):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: Dict[int, Tuple[sqlite3.Connection, int]] = {}
+        self._connections_lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if schema:
+            with self.transaction() as conn:
+                for statement in schema:
+                    conn.execute(statement)
+
+    def connection(self) -> sqlite3.Connection:
+        """Conexão da thread atual (recriada após fork, fechada quando a thread termina)"""
+        holder = getattr(self._local, 'holder', None)
+        pid = os.getpid()
+        if holder is not None and holder.pid == pid:
+            return holder.conn
+
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            isolation_level=None,  # autocommit; transações explícitas via transaction()
+            check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+
+        holder = _ThreadConnection(conn, pid)
+        weakref.finalize(holder, _close_connection, conn, pid, self._connections, self._connections_lock)
+        self._local.holder = holder
+        with self._connections_lock:
+            self._connections[id(conn)] = (conn, pid)
+        return conn
+
+    def execute(self, sql: str, params: Iterable = ()) -> sqlite3.Cursor:
+        """Executa comando isolado em autocommit"""
+        return self.connection().execute(sql, tuple(params))
+
+    @contextmanager
+    def transaction(self, immediate: bool = False):
+        """Transação explícita; immediate=True reserva o lock de escrita no início
+        (necessário para leitura-e-escrita atômica entre processos)"""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    def close_all(self):
+        """Fecha todas as conexões abertas por este processo (herdadas do pai após fork ficam intactas)"""
+        pid = os.getpid()
+        with self._connections_lock:
+            for conn, owner in self._connections.values():
+                if owner != pid:
+                    continue
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Structured Output
+Parsing e validação de saídas JSON das IAs contra um schema de saída
+"""
+
+import re
+import json
+import logging
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+class SchemaValidationError(Exception):
+    """Saída da IA não corresponde ao schema esperado"""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__(f"JSON fora do schema: {'; '.join(errors[:5])}")
+
+_JSON_TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str,
+    'boolean': bool,
+    'null': type(None)
+}
+
+def parse_json_strict(text: str) -> Any:
+    """Parse direto - usado para provedores com modo JSON nativo"""
+    return json.loads(text)
+
+def parse_json_tolerant(text: str) -> Optional[Any]:
+    """Parse tolerante para provedores sem modo JSON (markdown, texto ao redor, vírgulas finais)"""
+    if not text:
+        return None
+
+    clean_text = text.strip()
+
+    # Remove blocos markdown
+    if "```json" in clean_text:
+        start = clean_text.find("```json") + 7
+        end = clean_text.rfind("```")
+        clean_text = clean_text[start:end if end > start else None].strip()
+    elif "```" in clean_text:
+        start = clean_text.find("```") + 3
+        end = clean_text.rfind("```")
+        clean_text = clean_text[start:end if end > start else None].strip()
+
+    candidates = [clean_text]
+
+    # Recorta do primeiro '{' / '[' até o último '}' / ']'
+    for opener, closer in (('{', '}'), ('[', ']')):
+        start = clean_text.find(opener)
+        end = clean_text.rfind(closer)
+        if start != -1 and end > start:
+            candidates.append(clean_text[start:end + 1])
+
+    for candidate in candidates:
+        for attempt in (candidate, re.sub(r',\s*([}\]])', r'\1', candidate)):
+            try:
+                return json.loads(attempt)
+            except json.JSONDecodeError:
+                continue
+
+    return None
+
+def validate_schema(data: Any, schema: Optional[Dict[str, Any]], path: str = "$") -> List[str]:
+    """Valida dados contra um subconjunto de JSON Schema (type, required, properties,
+    items, enum, minItems, minLength). Retorna a lista de erros encontrados."""
+    if not schema:
+        return []
+
+    errors = []
+    expected_type = schema.get('type')
+
+    if expected_type:
+        types = expected_type if isinstance(expected_type, list) else [expected_type]
+        if not any(_matches_type(data, t) for t in types):
+            return [f"{path}: esperado {'/'.join(types)}, recebido {type(data).__name__}"]
+
+    if 'enum' in schema and data not in schema['enum']:
+        errors.append(f"{path}: valor fora de {schema['enum']}")
+
+    if isinstance(data, dict):
+        for key in schema.get('required', []):
+            if key not in data:
+                errors.append(f"{path}: campo obrigatório ausente '{key}'")
+        for key, sub_schema in schema.get('properties', {}).items():
+            if key in data:
+                errors.extend(validate_schema(data[key], sub_schema, f"{path}.{key}"))
+
+    elif isinstance(data, list):
+        if len(data) < schema.get('minItems', 0):
+            errors.append(f"{path}: mínimo de {schema['minItems']} itens")
+        if 'items' in schema:
+            for index, item in enumerate(data):
+                errors.extend(validate_schema(item, schema['items'], f"{path}[{index}]"))
+
+    elif isinstance(data, str):
+        if len(data) < schema.get('minLength', 0):
+            errors.append(f"{path}: mínimo de {schema['minLength']} caracteres")
+
+    return errors
+
+def _matches_type(data: Any, json_type: str) -> bool:
+    """Verifica tipo JSON (bool não conta como número)"""
+    if json_type == 'integer':
+        return isinstance(data, int) and not isinstance(data, bool)
+    if json_type == 'number':
+        return isinstance(data, (int, float)) and not isinstance(data, bool)
+    expected = _JSON_TYPES.get(json_type)
+    return expected is None or isinstance(data, expected)
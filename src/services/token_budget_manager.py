@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Token Budget Manager
+Orçamento adaptativo de max_tokens por tipo de tarefa baseado no histórico real de saída
+"""
+
+import os
+import json
+import math
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional, Any
+
+from services.sqlite_store import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+class TokenBudgetManager:
+    """Calcula max_tokens por tarefa a partir do histórico de tokens gerados.
+
+    O histórico é mantido por tarefa (agregado) e por tarefa e provedor ("tarefa:provedor"):
+    provedores geram saídas de tamanhos diferentes para o mesmo prompt, então o orçamento
+    usa o histórico do provedor quando ele já tem amostras suficientes.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        """Inicializa o gerenciador de orçamento de tokens"""
+        self.history_size = int(os.getenv('AI_TOKEN_HISTORY_SIZE', 200))
+        self.quantile = float(os.getenv('AI_TOKEN_BUDGET_QUANTILE', 0.95))
+        self.headroom = float(os.getenv('AI_TOKEN_BUDGET_HEADROOM', 1.25))
+        self.min_samples = int(os.getenv('AI_TOKEN_MIN_SAMPLES', 5))
+        self.min_budget = int(os.getenv('AI_TOKEN_MIN_BUDGET', 256))
+        self.bump_factor = float(os.getenv('AI_TOKEN_BUMP_FACTOR', 2.0))
+        self.persist_every = int(os.getenv('AI_TOKEN_PERSIST_EVERY', 10))
+
+        self.stats_path = os.path.join(cache_dir, "token_stats.json")
+        self.history: Dict[str, deque] = {}
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self._pending_writes = 0
+        self._lock = threading.Lock()
+        self._persist_lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+        logger.info(f"📏 Token Budget Manager inicializado com {len(self.history)} tipos de tarefa no histórico")
+
+    @staticmethod
+    def estimate_tokens(text: Optional[str]) -> int:
+        """Estima tokens de um texto quando o provedor não informa o uso (~4 caracteres por token)"""
+        if not text:
+            return 0
+        return max(1, len(text) // 4)
+
+    @staticmethod
+    def _keys(task_type: str, provider: Optional[str]):
+        """Chaves de histórico afetadas: agregado da tarefa e, se houver, tarefa:provedor"""
+        return (task_type, f"{task_type}:{provider}") if provider else (task_type,)
+
+    def get_budget(self, task_type: str, ceiling: int, provider: Optional[str] = None) -> int:
+        """Retorna max_tokens para a tarefa: quantil alto do histórico + folga, limitado ao teto"""
+        with self._lock:
+            samples = list(self.history.get(self._keys(task_type, provider)[-1], ()))
+            if len(samples) < self.min_samples:
+                samples = list(self.history.get(task_type, ()))
+
+        if len(samples) < self.min_samples:
+            return ceiling
+
+        budget = int(math.ceil(self._quantile(samples, self.quantile) * self.headroom))
+        return max(min(budget, ceiling), min(self.min_budget, ceiling))
+
+    def next_budget(self, budget: int, ceiling: int) -> Optional[int]:
+        """Retorna o orçamento ampliado após truncamento, ou None se o teto já foi usado"""
+        if budget >= ceiling:
+            return None
+        return min(int(budget * self.bump_factor), ceiling)
+
+    def record_output(self, task_type: str, output_tokens: int, budget: int, truncated: bool = False,
+                      provider: Optional[str] = None):
+        """Registra a quantidade real de tokens gerados para a tarefa (e provedor)"""
+        with self._lock:
+            for key in self._keys(task_type, provider):
+                history = self.history.setdefault(key, deque(maxlen=self.history_size))
+                counters = self.counters.setdefault(key, self._empty_counters())
+
+                # Saída truncada no teto é um limite inferior do tamanho real - ainda útil
+                history.append(int(output_tokens))
+
+                counters['calls'] += 1
+                counters['total_output_tokens'] += int(output_tokens)
+                counters['total_budget_tokens'] += int(budget)
+                if truncated:
+                    counters['truncations'] += 1
+
+            self._pending_writes += 1
+            should_persist = self._pending_writes >= self.persist_every
+
+        if should_persist:
+            self._persist()
+
+    def record_retry(self, task_type: str, provider: Optional[str] = None):
+        """Registra um retry por truncamento"""
+        with self._lock:
+            for key in self._keys(task_type, provider):
+                self.counters.setdefault(key, self._empty_counters())['retries'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas de tokens por tipo de tarefa"""
+        with self._lock:
+            snapshot = {name: list(samples) for name, samples in self.history.items()}
+            counters = {name: dict(values) for name, values in self.counters.items()}
+
+        stats = {}
+        for task_type in set(snapshot) | set(counters):
+            samples = snapshot.get(task_type, [])
+            task_counters = counters.get(task_type, self._empty_counters())
+            calls = task_counters['calls']
+
+            stats[task_type] = {
+                'samples': len(samples),
+                'p50_output_tokens': self._quantile(samples, 0.5) if samples else 0,
+                'p95_output_tokens': self._quantile(samples, 0.95) if samples else 0,
+                'max_output_tokens': max(samples) if samples else 0,
+                'avg_output_tokens': round(task_counters['total_output_tokens'] / calls, 1) if calls else 0,
+                'avg_budget_tokens': round(task_counters['total_budget_tokens'] / calls, 1) if calls else 0,
+                'calls': calls,
+                'truncations': task_counters['truncations'],
+                'retries': task_counters['retries'],
+                'adaptive': len(samples) >= self.min_samples
+            }
+
+        return stats
+
+    def reset(self, task_type: Optional[str] = None):
+        """Limpa histórico de uma tarefa (inclusive por provedor) ou de todas"""
+        with self._lock:
+            if task_type:
+                for key in [key for key in self.history.keys() | self.counters.keys()
+                            if key == task_type or key.startswith(f"{task_type}:")]:
+                    self.history.pop(key, None)
+                    self.counters.pop(key, None)
+            else:
+                self.history.clear()
+                self.counters.clear()
+        self._persist()
+
+    @staticmethod
+    def _quantile(samples, q: float) -> int:
+        """Quantil por interpolação linear"""
+        ordered = sorted(samples)
+        if len(ordered) == 1:
+            return ordered[0]
+        position = (len(ordered) - 1) * q
+        lower = int(math.floor(position))
+        upper = int(math.ceil(position))
+        value = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+        return int(round(value))
+
+    @staticmethod
+    def _empty_counters() -> Dict[str, int]:
+        return {'calls': 0, 'truncations': 0, 'retries': 0, 'total_output_tokens': 0, 'total_budget_tokens': 0}
+
+    def _load(self):
+        """Carrega histórico persistido"""
+        try:
+            if os.path.exists(self.stats_path):
+                with open(self.stats_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for task_type, samples in data.get('history', {}).items():
+                    self.history[task_type] = deque(samples, maxlen=self.history_size)
+                for task_type, counters in data.get('counters', {}).items():
+                    self.counters[task_type] = {**self._empty_counters(), **counters}
+        except Exception as e:
+            logger.warning(f"⚠️ Não foi possível carregar histórico de tokens: {e}")
+
+    def _persist(self):
+        """Persiste histórico em disco (escrita atômica, uma por vez no processo)"""
+        with self._persist_lock:
+            with self._lock:
+                data = {
+                    'history': {name: list(samples) for name, samples in self.history.items()},
+                    'counters': {name: dict(values) for name, values in self.counters.items()}
+                }
+                self._pending_writes = 0
+
+            try:
+                temp_path = f"{self.stats_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(temp_path, self.stats_path)
+            except Exception as e:
+                logger.warning(f"⚠️ Não foi possível salvar histórico de tokens: {e}")
+
+# Instância global
+token_budget_manager = TokenBudgetManager()
@@ -14,7 +14,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from services.ai_manager import ai_manager
-from services.production_search_manager import production_search_manager
+from services.production_search_manager import production_search_manager, search_planner
 from services.robust_content_extractor import robust_content_extractor
 from services.mental_drivers_architect import mental_drivers_architect
 from services.visual_proofs_generator import visual_proofs_generator
@@ -171,6 +171,11 @@ class UltraDetailedAnalysisEngine:
 
         # Gera queries inteligentes EXPANDIDAS
         queries = self._generate_expanded_intelligent_queries(data)
+
+        # Planeja provedores por query conforme quotas restantes antes de executar
+        search_plan = search_planner.plan(queries)
+        if progress_callback:
+            progress_callback(2, f"🧭 Plano de busca: {search_plan.summary()}")
         
         all_results = []
         extracted_content = []
@@ -185,7 +190,9 @@ class UltraDetailedAnalysisEngine:
                     progress_callback(2, f"🔍 Pesquisando em paralelo: {query[:50]}...", 
                                     f"Query {i+1}/{len(queries)}")
                 
-                future = executor.submit(self._execute_single_query_research, query)
+                future = executor.submit(
+                    self._execute_single_query_research, query, search_plan.providers_for(query)
+                )
                 future_to_query[future] = query
 
             # Coleta resultados conforme completam
@@ -216,7 +223,8 @@ class UltraDetailedAnalysisEngine:
             'extracted_content': unique_content,
             'sources': [{'url': item['url'], 'title': item['title']} for item in unique_content],
             'research_timestamp': datetime.now().isoformat(),
-            'research_quality': 'ULTRA_EXPANDED'
+            'research_quality': 'ULTRA_EXPANDED',
+            'search_plan': search_plan.to_dict()
         }
 
         logger.info(f"✅ Pesquisa massiva expandida: {len(unique_content)} páginas, {total_content_length:,} caracteres")
@@ -276,12 +284,18 @@ class UltraDetailedAnalysisEngine:
 
         return base_queries[:20]  # Expandido para 20 queries
 
-    def _execute_single_query_research(self, query: str) -> Optional[Dict[str, Any]]:
-        """Executa pesquisa para uma única query"""
+    def _execute_single_query_research(
+        self,
+        query: str,
+        providers: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Executa pesquisa para uma única query (providers: provedores definidos no plano)"""
         
         try:
             # Busca com múltiplos provedores
-            search_results = production_search_manager.search_with_fallback(query, max_results=20)
+            search_results = production_search_manager.search_with_fallback(
+                query, max_results=20, providers=providers
+            )
             
             if not search_results:
                 return None
@@ -421,22 +435,61 @@ class UltraDetailedAnalysisEngine:
             {
                 'name': 'avatar_analysis',
                 'prompt': self._build_avatar_analysis_prompt(data, search_context),
-                'focus': 'Avatar ultra-detalhado e perfil psicográfico'
+                'focus': 'Avatar ultra-detalhado e perfil psicográfico',
+                'response_schema': {
+                    'type': 'object',
+                    'required': ['avatar_ultra_detalhado'],
+                    'properties': {
+                        'avatar_ultra_detalhado': {
+                            'type': 'object',
+                            'required': ['perfil_demografico', 'perfil_psicografico', 'dores_viscerais', 'desejos_secretos', 'objecoes_reais'],
+                            'properties': {
+                                'dores_viscerais': {'type': 'array', 'minItems': 1},
+                                'desejos_secretos': {'type': 'array', 'minItems': 1},
+                                'objecoes_reais': {'type': 'array', 'minItems': 1}
+                            }
+                        }
+                    }
+                }
             },
             {
                 'name': 'market_analysis', 
                 'prompt': self._build_market_analysis_prompt(data, search_context),
-                'focus': 'Análise de mercado e concorrência'
+                'focus': 'Análise de mercado e concorrência',
+                'response_schema': {
+                    'type': 'object',
+                    'required': ['analise_concorrencia_detalhada', 'gaps_oportunidade'],
+                    'properties': {
+                        'analise_concorrencia_detalhada': {'type': 'array', 'minItems': 1, 'items': {'type': 'object'}},
+                        'gaps_oportunidade': {'type': 'array'}
+                    }
+                }
             },
             {
                 'name': 'strategy_analysis',
                 'prompt': self._build_strategy_analysis_prompt(data, search_context),
-                'focus': 'Estratégias e posicionamento'
+                'focus': 'Estratégias e posicionamento',
+                'response_schema': {
+                    'type': 'object',
+                    'required': ['escopo_posicionamento', 'estrategia_palavras_chave', 'metricas_performance_detalhadas'],
+                    'properties': {
+                        'escopo_posicionamento': {'type': 'object'},
+                        'estrategia_palavras_chave': {'type': 'object'},
+                        'metricas_performance_detalhadas': {'type': 'object'}
+                    }
+                }
             },
             {
                 'name': 'future_analysis',
                 'prompt': self._build_future_analysis_prompt(data, search_context),
-                'focus': 'Predições e tendências futuras'
+                'focus': 'Predições e tendências futuras',
+                'response_schema': {
+                    'type': 'object',
+                    'required': ['predicoes_futuro_completas'],
+                    'properties': {
+                        'predicoes_futuro_completas': {'type': 'object'}
+                    }
+                }
             }
         ]
 
@@ -453,7 +506,9 @@ class UltraDetailedAnalysisEngine:
                 future = executor.submit(
                     ai_manager.generate_analysis, 
                     task['prompt'], 
-                    max_tokens=8192
+                    max_tokens=8192,
+                    task_type=task['name'],
+                    response_schema=task['response_schema']
                 )
                 future_to_task[future] = task
 
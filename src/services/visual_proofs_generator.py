@@ -365,7 +365,7 @@ RETORNE APENAS JSON VÁLIDO:
 ```
 """
             
-            response = ai_manager.generate_analysis(prompt, max_tokens=2000)
+            response = ai_manager.generate_analysis(prompt, max_tokens=2000, task_type='visual_proofs')
             
             if response:
                 # Extrai JSON da resposta
@@ -8,14 +8,21 @@ Navegação web REAL sem cache ou simulação - DADOS 100% REAIS
 import os
 import logging
 import time
-import requests
-from typing import Dict, List, Optional, Any
-from urllib.parse import quote_plus, urljoin
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import urljoin
 import json
 import re
 from datetime import datetime
 from bs4 import BeautifulSoup
 import random
+from concurrent.futures import ThreadPoolExecutor
+
+from services.search_providers import search_provider_registry
+from services.crawl_frontier import CrawlFrontier, CrawlTask
+from services.politeness_scheduler import PolitenessScheduler
+from services.domain_yield import domain_yield_tracker, url_domain
+from services.negative_cache import classify_exception, classify_status, negative_cache
+from services.http_pool import get_provider_session
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +36,7 @@ class WebSailorAgent:
         self.jina_api_key = os.getenv("JINA_API_KEY")
         self.google_cse_id = os.getenv("GOOGLE_CSE_ID")
         
-        # URLs das APIs
-        self.google_search_url = "https://www.googleapis.com/customsearch/v1"
+        # Buscas passam pela camada de provedores (sessão, cache e rate limit compartilhados)
         self.jina_reader_url = "https://r.jina.ai/"
         
         # Headers REAIS para requisições
@@ -44,6 +50,19 @@ class WebSailorAgent:
             "Upgrade-Insecure-Requests": "1"
         }
         
+        # Crawl: pool limitado de fetches e ritmo por domínio (sem sleeps entre páginas)
+        self.fetch_scheduler = PolitenessScheduler(
+            'websailor',
+            max_workers=int(os.getenv('WEBSAILOR_FETCH_WORKERS', 6)),
+            min_interval=float(os.getenv('WEBSAILOR_DOMAIN_INTERVAL', 1.0)),
+            jitter=float(os.getenv('WEBSAILOR_DOMAIN_JITTER', 0.5)),
+            max_in_flight=1
+        )
+        self.crawl_timeout = float(os.getenv('WEBSAILOR_CRAWL_TIMEOUT', 180))
+        # Relevância a partir da qual uma página é considerada boa para expandir links
+        self.relevance_reference = float(os.getenv('WEBSAILOR_RELEVANCE_REFERENCE', 10))
+        self.last_crawl_stats: Dict[str, Any] = {}
+        
         # SEM CACHE - TUDO REAL!
         logger.info(f"WebSailor Agent REAL initialized - Enabled: {self.enabled}")
     
@@ -51,6 +70,9 @@ class WebSailorAgent:
         """Verifica se o WebSailor está disponível"""
         return self.enabled
     
+    # Peso da relevância por origem da página (mesmos fatores da navegação sequencial)
+    SOURCE_WEIGHTS = {"real_search": 1.0, "internal_link": 0.8, "related_query": 0.7}
+
     def navigate_and_research(
         self, 
         query: str, 
@@ -59,7 +81,13 @@ class WebSailorAgent:
         depth: int = 3,
         aggressive_mode: bool = True
     ) -> Dict[str, Any]:
-        """Navega e pesquisa informações REAIS com profundidade máxima"""
+        """Navega e pesquisa informações REAIS com profundidade máxima
+
+        Buscas (motores e queries relacionadas) rodam em paralelo e alimentam uma
+        fronteira de crawl ordenada por relevância esperada. Orçamentos: max_pages
+        resultados por motor, 2 × max_pages páginas aceitas e links internos até
+        depth - 1 níveis abaixo dos resultados de busca.
+        """
         
         if not self.is_available():
             logger.warning("WebSailor não está disponível")
@@ -71,90 +99,85 @@ class WebSailorAgent:
             
             all_page_contents = []
             
-            # 1. BUSCA REAL MÚLTIPLA
-            search_engines = [
-                self._google_search_real,
-                self._bing_search_real,
-                self._duckduckgo_search_real,
-                self._yahoo_search_real
-            ]
-            
-            for search_engine in search_engines:
-                try:
-                    results = search_engine(query, max_pages)
-                    if results:
-                        logger.info(f"✅ {search_engine.__name__}: {len(results)} resultados REAIS")
-                        
-                        # Extrai conteúdo REAL de cada página
-                        for result in results[:10]:  # Top 10 por engine
-                            content = self._extract_real_page_content(result["url"])
-                            if content and len(content) > 100:  # Só conteúdo substancial
-                                all_page_contents.append({
-                                    "url": result["url"],
-                                    "title": result["title"],
-                                    "content": content,
-                                    "relevance_score": self._calculate_real_relevance(content, query, context),
-                                    "source_type": "real_search",
-                                    "search_engine": search_engine.__name__
-                                })
-                                
-                                # Delay para não sobrecarregar
-                                time.sleep(0.5)
-                    
-                except Exception as e:
-                    logger.warning(f"Erro em {search_engine.__name__}: {str(e)}")
-                    continue
-            
-            # 2. PESQUISA EM PROFUNDIDADE REAL
-            if depth > 1 and all_page_contents:
-                logger.info(f"🔍 PESQUISA EM PROFUNDIDADE REAL (nível {depth})...")
-                top_pages = sorted(all_page_contents, key=lambda x: x["relevance_score"], reverse=True)[:5]
-                
-                for page in top_pages:
-                    internal_links = self._extract_real_internal_links(page["url"], page["content"])
-                    for link in internal_links[:3]:  # Top 3 links internos
-                        internal_content = self._extract_real_page_content(link)
-                        if internal_content and len(internal_content) > 100:
-                            all_page_contents.append({
-                                "url": link,
-                                "title": f"Link interno de {page['title']}",
-                                "content": internal_content,
-                                "relevance_score": self._calculate_real_relevance(internal_content, query, context) * 0.8,
-                                "source_type": "internal_link",
-                                "parent_url": page["url"]
-                            })
-                            time.sleep(0.3)
+            frontier = CrawlFrontier(
+                self.fetch_scheduler,
+                lambda task: self._fetch_crawl_task(task, want_links=task.depth < frontier.max_depth),
+                max_pages=max_pages * 2,
+                max_depth=max(depth - 1, 0),
+                max_in_flight=self.fetch_scheduler.max_workers,
+                timeout=self.crawl_timeout
+            )
             
-            # 3. PESQUISA DE QUERIES RELACIONADAS REAIS
+            # 1. BUSCA REAL MÚLTIPLA (+ QUERIES RELACIONADAS) EM PARALELO
+            searches = [
+                (engine, query, max_pages, "real_search")
+                for engine in (self._google_search_real, self._bing_search_real,
+                               self._duckduckgo_search_real, self._yahoo_search_real)
+            ]
             if aggressive_mode:
                 logger.info("🎯 PESQUISA AGRESSIVA COM QUERIES RELACIONADAS REAIS...")
-                related_queries = self._generate_real_related_queries(query, context)
-                
-                for related_query in related_queries[:3]:
+                searches.extend(
+                    (self._google_search_real, related_query, 5, "related_query")
+                    for related_query in self._generate_real_related_queries(query, context)[:3]
+                )
+            
+            with ThreadPoolExecutor(max_workers=len(searches)) as executor:
+                futures = [
+                    (executor.submit(engine, search_query, limit), engine, search_query, source_type)
+                    for engine, search_query, limit, source_type in searches
+                ]
+                for future, engine, search_query, source_type in futures:
                     try:
-                        related_results = self._google_search_real(related_query, 5)
-                        for result in related_results:
-                            content = self._extract_real_page_content(result["url"])
-                            if content and len(content) > 100:
-                                all_page_contents.append({
-                                    "url": result["url"],
-                                    "title": result["title"],
-                                    "content": content,
-                                    "relevance_score": self._calculate_real_relevance(content, query, context) * 0.7,
-                                    "source_type": "related_query",
-                                    "original_query": related_query
-                                })
-                                time.sleep(0.4)
+                        results = (future.result() or [])[:10]  # Top 10 por engine
                     except Exception as e:
-                        logger.warning(f"Erro em query relacionada '{related_query}': {str(e)}")
+                        logger.warning(f"Erro em {engine.__name__} ('{search_query}'): {str(e)}")
                         continue
+                    if results:
+                        logger.info(f"✅ {engine.__name__}: {len(results)} resultados REAIS")
+                    self._seed_frontier(frontier, results, engine.__name__, search_query, source_type)
+            
+            # 2. CRAWL PRIORIZADO: extração concorrente + links internos como novos candidatos
+            def on_page(task: CrawlTask, page: Optional[Dict[str, Any]]) -> bool:
+                if not page or not page["content"] or len(page["content"]) <= 100:  # Só conteúdo substancial
+                    return False
+                weight = self.SOURCE_WEIGHTS[task.meta["source_type"]]
+                relevance = self._calculate_real_relevance(page["content"], query, context) * weight
+                entry = {
+                    "url": task.url,
+                    "title": task.meta["title"],
+                    "content": page["content"],
+                    "relevance_score": relevance,
+                    "source_type": task.meta["source_type"]
+                }
+                for key in ("search_engine", "original_query", "parent_url"):
+                    if key in task.meta:
+                        entry[key] = task.meta[key]
+                all_page_contents.append(entry)
+                
+                # Links herdam a expectativa da página, ajustada pela relevância medida
+                quality = min(relevance / self.relevance_reference, 2.0)
+                for link in page["links"][:3]:  # Top 3 links internos
+                    frontier.add(
+                        link,
+                        task.expected_relevance * self.SOURCE_WEIGHTS["internal_link"] * quality,
+                        depth=task.depth + 1,
+                        title=f"Link interno de {task.meta['title']}",
+                        source_type="internal_link",
+                        parent_url=task.url
+                    )
+                return True
             
-            # 4. FILTRA E ORDENA POR RELEVÂNCIA REAL
+            logger.info(f"🔍 PESQUISA EM PROFUNDIDADE REAL (nível {depth}, {len(frontier)} URLs na fronteira)...")
+            self.last_crawl_stats = frontier.run(on_page)
+            
+            # 3. FILTRA E ORDENA POR RELEVÂNCIA REAL
             all_page_contents = [p for p in all_page_contents if p["relevance_score"] > 1.0]
             all_page_contents.sort(key=lambda x: x["relevance_score"], reverse=True)
             
-            # 5. CONSOLIDA INFORMAÇÕES REAIS
+            # 4. CONSOLIDA INFORMAÇÕES REAIS
             research_result = self._consolidate_real_research(all_page_contents, query, context)
+            if isinstance(research_result.get("metadata"), dict):
+                research_result["metadata"]["crawl"] = self.last_crawl_stats
             
             end_time = time.time()
             logger.info(f"✅ PESQUISA REAL CONCLUÍDA em {end_time - start_time:.2f} segundos")
@@ -166,208 +189,100 @@ class WebSailorAgent:
             logger.error(f"❌ ERRO CRÍTICO na pesquisa real: {str(e)}", exc_info=True)
             return self._generate_emergency_real_research(query, context)
     
+    def _seed_frontier(
+        self,
+        frontier: CrawlFrontier,
+        results: List[Dict[str, Any]],
+        engine_name: str,
+        search_query: str,
+        source_type: str
+    ):
+        """Adiciona resultados de busca à fronteira.
+
+        Relevância esperada = peso da origem × (0.5 + rendimento do domínio) / (1 + 0.1 × posição)
+        """
+        yields = domain_yield_tracker.get_yields(r.get("url", "") for r in results)
+        weight = self.SOURCE_WEIGHTS[source_type]
+        
+        for rank, result in enumerate(results):
+            url = result.get("url", "")
+            # Falha recente ou domínio sabidamente ruim: nem entra na fronteira
+            if negative_cache.get(url) or domain_yield_tracker.should_skip(url):
+                continue
+            expected = weight * (0.5 + yields.get(url_domain(url), 0.5)) / (1 + 0.1 * rank)
+            meta = {"title": result.get("title", ""), "source_type": source_type, "search_engine": engine_name}
+            if source_type == "related_query":
+                meta["original_query"] = search_query
+            frontier.add(url, expected, depth=0, **meta)
+    
+    def _fetch_crawl_task(self, task: CrawlTask, want_links: bool) -> Optional[Dict[str, Any]]:
+        """Fetch de uma página da fronteira: conteúdo e, se ainda houver profundidade, links internos"""
+        if negative_cache.get(task.url):
+            return None
+        content, links = self._fetch_page(task.url, want_links)
+        domain_yield_tracker.record(task.url, bool(content and len(content) > 100))
+        if content is None:
+            return None
+        return {"content": content, "links": links}
+    
     def _google_search_real(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Busca REAL usando Google Custom Search API"""
-        
-        if not self.google_search_key or not self.google_cse_id:
+        if not search_provider_registry.is_available('google'):
             logger.warning("Google Search API não configurada")
             return []
-        
-        try:
-            enhanced_query = self._enhance_search_query_real(query)
-            
-            params = {
-                "key": self.google_search_key,
-                "cx": self.google_cse_id,
-                "q": enhanced_query,
-                "num": min(max_results, 10),
-                "lr": "lang_pt",
-                "gl": "br",
-                "safe": "off",
-                "dateRestrict": "m6",  # Últimos 6 meses
-                "sort": "date"
-            }
-            
-            response = requests.get(
-                self.google_search_url,
-                params=params,
-                headers=self.headers,
-                timeout=15
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                results = []
-                
-                for item in data.get("items", []):
-                    results.append({
-                        "title": item.get("title", ""),
-                        "url": item.get("link", ""),
-                        "snippet": item.get("snippet", ""),
-                        "source": "google_real"
-                    })
-                
-                logger.info(f"🔍 Google Search REAL: {len(results)} resultados")
-                return results
-            else:
-                logger.warning(f"Google Search falhou: {response.status_code}")
-                return []
-                
-        except Exception as e:
-            logger.error(f"Erro no Google Search REAL: {str(e)}")
-            return []
-    
+        return search_provider_registry.search('google', self._enhance_search_query_real(query), max_results)
+
     def _bing_search_real(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Busca REAL usando Bing"""
-        
-        try:
-            # Bing search via scraping
-            search_url = f"https://www.bing.com/search?q={quote_plus(query)}&cc=br&setlang=pt-br"
-            
-            response = requests.get(
-                search_url,
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                results = []
-                
-                # Extrai resultados do Bing
-                result_items = soup.find_all('li', class_='b_algo')
-                
-                for item in result_items[:max_results]:
-                    title_elem = item.find('h2')
-                    if title_elem:
-                        link_elem = title_elem.find('a')
-                        if link_elem:
-                            title = title_elem.get_text(strip=True)
-                            url = link_elem.get('href', '')
-                            
-                            snippet_elem = item.find('p')
-                            snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-                            
-                            if url and title:
-                                results.append({
-                                    "title": title,
-                                    "url": url,
-                                    "snippet": snippet,
-                                    "source": "bing_real"
-                                })
-                
-                logger.info(f"🔍 Bing Search REAL: {len(results)} resultados")
-                return results
-                
-        except Exception as e:
-            logger.error(f"Erro no Bing Search REAL: {str(e)}")
-            return []
-    
+        return search_provider_registry.search('bing', query, max_results)
+
     def _duckduckgo_search_real(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Busca REAL usando DuckDuckGo"""
-        
-        try:
-            search_url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
-            
-            response = requests.get(
-                search_url,
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                results = []
-                
-                result_divs = soup.find_all('div', class_='result')
-                
-                for div in result_divs[:max_results]:
-                    title_elem = div.find('a', class_='result__a')
-                    snippet_elem = div.find('a', class_='result__snippet')
-                    
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
-                        url = title_elem.get('href', '')
-                        snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-                        
-                        if url and title and url.startswith('http'):
-                            results.append({
-                                "title": title,
-                                "url": url,
-                                "snippet": snippet,
-                                "source": "duckduckgo_real"
-                            })
-                
-                logger.info(f"🔍 DuckDuckGo Search REAL: {len(results)} resultados")
-                return results
-                
-        except Exception as e:
-            logger.error(f"Erro no DuckDuckGo Search REAL: {str(e)}")
-            return []
-    
+        return search_provider_registry.search('duckduckgo', query, max_results)
+
     def _yahoo_search_real(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Busca REAL usando Yahoo"""
-        
-        try:
-            search_url = f"https://br.search.yahoo.com/search?p={quote_plus(query)}"
-            
-            response = requests.get(
-                search_url,
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                results = []
-                
-                result_items = soup.find_all('div', class_='Sr')
-                
-                for item in result_items[:max_results]:
-                    title_elem = item.find('h3')
-                    if title_elem:
-                        link_elem = title_elem.find('a')
-                        if link_elem:
-                            title = title_elem.get_text(strip=True)
-                            url = link_elem.get('href', '')
-                            
-                            snippet_elem = item.find('span', class_='fz-ms')
-                            snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-                            
-                            if url and title and url.startswith('http'):
-                                results.append({
-                                    "title": title,
-                                    "url": url,
-                                    "snippet": snippet,
-                                    "source": "yahoo_real"
-                                })
-                
-                logger.info(f"🔍 Yahoo Search REAL: {len(results)} resultados")
-                return results
-                
-        except Exception as e:
-            logger.error(f"Erro no Yahoo Search REAL: {str(e)}")
-            return []
-    
-    def _extract_real_page_content(self, url: str) -> Optional[str]:
-        """Extrai conteúdo REAL de uma página web"""
+        return search_provider_registry.search('yahoo', query, max_results)
+
+    def _fetch_page(self, url: str, want_links: bool = False) -> Tuple[Optional[str], List[str]]:
+        """Conteúdo da página e links internos com uma única requisição ao site"""
         
         if not url or not url.startswith("http"):
-            return None
+            return None, []
         
         try:
             # Tenta primeiro com Jina Reader se disponível
             if self.jina_api_key:
                 content = self._extract_with_jina_real(url)
                 if content:
-                    return content
+                    links = self._extract_real_internal_links(url, content) if want_links else []
+                    return content, links
             
             # Fallback para extração direta
-            return self._extract_direct_real(url)
+            response = self._session.get(url, headers=self.headers, timeout=20, allow_redirects=True)
+            if response.status_code != 200:
+                logger.warning(f"Falha ao acessar {url}: {response.status_code}")
+                negative_cache.record(url, classify_status(response.status_code) or 'client_error')
+                return None, []
+            
+            soup = BeautifulSoup(response.content, "html.parser")
+            links = self._internal_links_from_soup(url, soup) if want_links else []
+            text = self._soup_to_text(soup)
+            logger.info(f"✅ Extração direta REAL: {len(text)} caracteres de {url}")
+            return text, links
                 
         except Exception as e:
             logger.error(f"Erro ao extrair conteúdo REAL de {url}: {str(e)}")
-            return None
+            negative_cache.record(url, classify_exception(e), str(e))
+            return None, []
+    
+    def _extract_real_page_content(self, url: str) -> Optional[str]:
+        """Extrai conteúdo REAL de uma página web"""
+        return self._fetch_page(url)[0]
+    
+    @property
+    def _session(self):
+        return get_provider_session('websailor')
     
     def _extract_with_jina_real(self, url: str) -> Optional[str]:
         """Extrai conteúdo REAL usando Jina Reader API"""
@@ -380,7 +295,7 @@ class WebSailorAgent:
             
             jina_url = f"{self.jina_reader_url}{url}"
             
-            response = requests.get(
+            response = self._session.get(
                 jina_url,
                 headers=headers,
                 timeout=30
@@ -402,78 +317,66 @@ class WebSailorAgent:
             logger.error(f"Erro no Jina Reader REAL para {url}: {str(e)}")
             return None
     
-    def _extract_direct_real(self, url: str) -> Optional[str]:
-        """Extração REAL direta usando requests + BeautifulSoup"""
+    @staticmethod
+    def _soup_to_text(soup: BeautifulSoup) -> str:
+        """Texto principal limpo (remove navegação, scripts e afins; trunca em 10000)"""
         
-        try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                timeout=20,
-                allow_redirects=True
-            )
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, "html.parser")
-                
-                # Remove elementos desnecessários
-                for element in soup(["script", "style", "nav", "footer", "header", "form", "aside", "iframe", "noscript"]):
-                    element.decompose()
-                
-                # Extrai texto principal
-                main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile(r'content|main|article'))
-                
-                if main_content:
-                    text = main_content.get_text()
-                else:
-                    text = soup.get_text()
-                
-                # Limpa o texto
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = " ".join(chunk for chunk in chunks if chunk and len(chunk) > 3)
-                
-                if len(text) > 10000:
-                    text = text[:10000] + "... [conteúdo truncado para otimização]"
-                
-                logger.info(f"✅ Extração direta REAL: {len(text)} caracteres de {url}")
-                return text
-            else:
-                logger.warning(f"Falha ao acessar {url}: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Erro na extração direta REAL para {url}: {str(e)}")
-            return None
+        # Remove elementos desnecessários
+        for element in soup(["script", "style", "nav", "footer", "header", "form", "aside", "iframe", "noscript"]):
+            element.decompose()
+        
+        # Extrai texto principal
+        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile(r'content|main|article'))
+        
+        if main_content:
+            text = main_content.get_text()
+        else:
+            text = soup.get_text()
+        
+        # Limpa o texto
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        text = " ".join(chunk for chunk in chunks if chunk and len(chunk) > 3)
+        
+        if len(text) > 10000:
+            text = text[:10000] + "... [conteúdo truncado para otimização]"
+        
+        return text
     
     def _extract_real_internal_links(self, base_url: str, content: str) -> List[str]:
         """Extrai links internos REAIS de uma página"""
         
-        links = []
         try:
             # Faz nova requisição para obter HTML completo
-            response = requests.get(base_url, headers=self.headers, timeout=10)
+            response = self._session.get(base_url, headers=self.headers, timeout=10)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, "html.parser")
-                base_domain = base_url.split('/')[2]
-                
-                for a_tag in soup.find_all("a", href=True):
-                    href = a_tag["href"]
-                    full_url = urljoin(base_url, href)
-                    
-                    # Filtra apenas links do mesmo domínio
-                    if (full_url.startswith('http') and 
-                        base_domain in full_url and 
-                        "#" not in full_url and 
-                        full_url != base_url and
-                        not any(ext in full_url.lower() for ext in ['.pdf', '.jpg', '.png', '.gif', '.zip'])):
-                        links.append(full_url)
-                
-                logger.info(f"🔗 {len(links)} links internos REAIS encontrados em {base_url}")
+                return self._internal_links_from_soup(base_url, BeautifulSoup(response.content, "html.parser"))
         except Exception as e:
             logger.warning(f"Erro ao extrair links internos REAIS de {base_url}: {str(e)}")
         
-        return list(set(links))[:10]  # Remove duplicatas e limita
+        return []
+    
+    @staticmethod
+    def _internal_links_from_soup(base_url: str, soup: BeautifulSoup) -> List[str]:
+        """Links do mesmo domínio, sem âncoras nem arquivos binários (na ordem da página)"""
+        
+        links = []
+        base_domain = base_url.split('/')[2]
+        
+        for a_tag in soup.find_all("a", href=True):
+            full_url = urljoin(base_url, a_tag["href"])
+            
+            # Filtra apenas links do mesmo domínio
+            if (full_url.startswith('http') and 
+                base_domain in full_url and 
+                "#" not in full_url and 
+                full_url != base_url and
+                full_url not in links and
+                not any(ext in full_url.lower() for ext in ['.pdf', '.jpg', '.png', '.gif', '.zip'])):
+                links.append(full_url)
+        
+        logger.info(f"🔗 {len(links)} links internos REAIS encontrados em {base_url}")
+        return links[:10]  # Remove duplicatas e limita
     
     def _calculate_real_relevance(
         self, 
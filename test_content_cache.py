@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Teste do Cache de Conteúdo
+URL canônica e revalidação condicional (ETag / Last-Modified)
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Adiciona o diretório src ao path; bancos de coordenação em diretório temporário
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('COORDINATION_DB_PATH', os.path.join(tempfile.mkdtemp(), 'coordination.db'))
+os.environ.setdefault('CONTENT_CACHE_DB_PATH', os.path.join(tempfile.mkdtemp(), 'content_cache.db'))
+
+import pytest
+
+from services.content_cache import ContentCache, canonical_url
+
+@pytest.fixture
+def cache(tmp_path):
+    return ContentCache(db_path=str(tmp_path / 'content.db'))
+
+def test_canonical_url_drops_tracking_params_and_sorts_query():
+    expected = canonical_url('https://exemplo.com/noticia?id=7&pagina=2')
+    assert canonical_url('https://www.exemplo.com/noticia/?pagina=2&id=7&utm_source=news&gclid=abc') == expected
+    assert canonical_url('http://exemplo.com/noticia?id=7&pagina=2#comentarios') == expected
+    assert canonical_url('https://exemplo.com/noticia?id=8&pagina=2') != expected
+
+def test_tracking_variant_hits_the_same_entry(cache):
+    cache.set('https://exemplo.com/artigo', 'texto do artigo', 'trafilatura', True)
+    entry = cache.get('https://www.exemplo.com/artigo/?utm_campaign=x')
+    assert entry is not None
+    assert entry.content == 'texto do artigo'
+    assert entry.is_fresh
+
+def test_stale_entry_offers_conditional_headers(cache):
+    cache.ttl = 0
+    cache.set('https://exemplo.com/a', 'texto', 'readability', True,
+              etag='"v1"', last_modified='Wed, 01 Oct 2025 10:00:00 GMT')
+    entry = cache.get('https://exemplo.com/a')
+
+    assert not entry.is_fresh
+    assert entry.has_validators
+    assert entry.conditional_headers() == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': 'Wed, 01 Oct 2025 10:00:00 GMT'
+    }
+
+def test_entry_without_validators_has_no_conditional_headers(cache):
+    cache.set('https://exemplo.com/b', 'texto', 'beautifulsoup', False)
+    entry = cache.get('https://exemplo.com/b')
+    assert not entry.has_validators
+    assert entry.conditional_headers() == {}
+
+def test_revalidation_renews_expiry_and_validators(cache):
+    cache.ttl = 0
+    cache.set('https://exemplo.com/c', 'texto', 'trafilatura', True, etag='"v1"')
+    stale = cache.get('https://exemplo.com/c')
+    assert not stale.is_fresh
+
+    cache.ttl = 3600
+    cache.revalidated(stale, etag='"v2"')
+    renewed = cache.get('https://exemplo.com/c')
+
+    assert renewed.is_fresh
+    assert renewed.expires_at > time.time() + 3000
+    assert renewed.etag == '"v2"'
+    # 304 sem validadores novos mantém os anteriores; o texto não muda
+    cache.revalidated(renewed)
+    assert cache.get('https://exemplo.com/c').etag == '"v2"'
+    assert cache.get('https://exemplo.com/c').content == 'texto'
+
+def test_hit_rate_counts_every_lookup_outcome(cache):
+    for outcome in ('fresh_hits', 'revalidated', 'misses', 'misses'):
+        cache.count(outcome)
+    assert cache.get_status()['hit_rate'] == 0.5
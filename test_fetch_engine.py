@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Teste do Fetch Engine
+Classificação do tipo de documento pelo Content-Type e pela assinatura do corpo
+"""
+
+import os
+import sys
+import tempfile
+
+# Adiciona o diretório src ao path; bancos de coordenação em diretório temporário
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('COORDINATION_DB_PATH', os.path.join(tempfile.mkdtemp(), 'coordination.db'))
+
+import pytest
+
+from services.fetch_engine import content_kind, sniff_kind
+
+@pytest.mark.parametrize('content_type, expected', [
+    ('', 'html'),
+    ('text/html; charset=utf-8', 'html'),
+    ('application/xhtml+xml', 'html'),
+    ('application/rss+xml', 'html'),
+    ('TEXT/XML', 'html'),
+    ('application/pdf', 'pdf'),
+    ('application/x-pdf; qs=0.001', 'pdf'),
+    ('text/plain', 'text'),
+    ('application/json', 'text'),
+    ('application/ld+json', 'text'),
+    ('image/png', 'binary'),
+    ('application/octet-stream', 'binary'),
+    ('application/zip', 'binary')
+])
+def test_content_kind(content_type, expected):
+    assert content_kind(content_type) == expected
+
+def test_pdf_signature_wins_over_header():
+    """PDF servido como octet-stream ou text/html continua sendo PDF"""
+    assert sniff_kind('application/octet-stream', b'%PDF-1.7\n%\xe2\xe3') == 'pdf'
+    assert sniff_kind('text/html', b'\r\n%PDF-1.4 ...') == 'pdf'
+
+def test_declared_pdf_with_markup_is_html():
+    """Página de erro ou login entregue com Content-Type de PDF"""
+    assert sniff_kind('application/pdf', b'  <!DOCTYPE html><html><body>Acesso negado') == 'html'
+
+def test_binary_with_html_markup_is_html():
+    assert sniff_kind('application/octet-stream', b'<html><head><title>x</title>') == 'html'
+    # Marcação que não é HTML continua binária (ex.: SVG)
+    assert sniff_kind('application/octet-stream', b'<svg xmlns="http://www.w3.org/2000/svg">') == 'binary'
+
+def test_declared_kind_is_kept_without_signature():
+    assert sniff_kind('text/html', b'<html>') == 'html'
+    assert sniff_kind('application/pdf', b'\x00\x01binario') == 'pdf'
+    assert sniff_kind('image/jpeg', b'\xff\xd8\xff\xe0') == 'binary'
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Teste do Cache Negativo
+Classificação de falhas de download e validade por classe de erro
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Adiciona o diretório src ao path; bancos de coordenação em diretório temporário
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('COORDINATION_DB_PATH', os.path.join(tempfile.mkdtemp(), 'coordination.db'))
+os.environ.setdefault('CONTENT_CACHE_DB_PATH', os.path.join(tempfile.mkdtemp(), 'content_cache.db'))
+
+import pytest
+import requests
+
+from services.fetch_engine import FetchRejected
+from services.negative_cache import (
+    DEFAULT_TTLS, LOCAL_CLASSES, RETRYABLE_CLASSES, NegativeCache, classify_exception, classify_status,
+    looks_paywalled
+)
+
+def _http_error(status_code: int) -> requests.exceptions.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(f"{status_code} Error", response=response)
+
+@pytest.mark.parametrize('status_code, expected', [
+    (200, None), (304, None),
+    (404, 'not_found'), (410, 'not_found'),
+    (401, 'forbidden'), (403, 'forbidden'),
+    (402, 'paywall'),
+    (429, 'rate_limited'),
+    (400, 'client_error'), (451, 'client_error'),
+    (500, 'server_error'), (503, 'server_error')
+])
+def test_classify_status(status_code, expected):
+    assert classify_status(status_code) == expected
+
+def test_classify_exception():
+    assert classify_exception(_http_error(404)) == 'not_found'
+    assert classify_exception(_http_error(503)) == 'server_error'
+    assert classify_exception(requests.exceptions.HTTPError('sem resposta')) == 'connection'
+    assert classify_exception(requests.exceptions.ReadTimeout()) == 'timeout'
+    assert classify_exception(requests.exceptions.ConnectionError()) == 'connection'
+    assert classify_exception(FetchRejected('zip', 'unsupported_content')) == 'unsupported_content'
+    assert classify_exception(FetchRejected('fila cheia', 'host_busy')) == 'host_busy'
+
+def test_only_transient_classes_are_retried():
+    assert RETRYABLE_CLASSES == {'timeout', 'connection', 'server_error'}
+    # Espera do próprio motor nunca vira retry nem cache negativo
+    assert not LOCAL_CLASSES & RETRYABLE_CLASSES
+    assert not LOCAL_CLASSES & set(DEFAULT_TTLS)
+
+def test_looks_paywalled():
+    assert looks_paywalled('<div>Conteúdo exclusivo para ASSINANTES</div>')
+    assert not looks_paywalled('<p>Matéria aberta sobre o mercado</p>')
+
+def test_record_uses_ttl_of_error_class(tmp_path):
+    cache = NegativeCache(db_path=str(tmp_path / 'coord.db'))
+    cache.record('https://exemplo.com/sumiu?utm_source=x', 'not_found', '404')
+    cache.record('https://exemplo.com/lento', 'timeout')
+
+    failure = cache.get('https://www.exemplo.com/sumiu/')
+    assert failure['error_class'] == 'not_found'
+    assert failure['expires_at'] == pytest.approx(time.time() + DEFAULT_TTLS['not_found'], abs=5)
+    assert cache.get('https://exemplo.com/lento')['expires_at'] == pytest.approx(
+        time.time() + DEFAULT_TTLS['timeout'], abs=5
+    )
+
+def test_repeated_failures_are_counted_and_expire(tmp_path):
+    cache = NegativeCache(db_path=str(tmp_path / 'coord.db'))
+    cache.record('https://exemplo.com/x', 'server_error')
+    cache.record('https://exemplo.com/x', 'server_error')
+    assert cache.get('https://exemplo.com/x')['failures'] == 2
+
+    cache.ttls['server_error'] = 0
+    cache.record('https://exemplo.com/x', 'server_error')
+    assert cache.get('https://exemplo.com/x') is None
+    assert cache.purge_expired() == 1
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Teste do Normalizador de Queries
+Forma canônica das queries e correspondência aproximada por Jaccard
+"""
+
+import os
+import sys
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from services.query_normalizer import (
+    QuerySimilarityIndex, jaccard_similarity, normalize_query, query_tokens
+)
+
+def test_normalize_ignores_case_accents_stopwords_and_order():
+    expected = normalize_query('mercado de franquias alimentação')
+    assert normalize_query('Franquias  ALIMENTAÇÃO mercado') == expected
+    assert normalize_query('o mercado das franquias, alimentacao!') == expected
+
+def test_polarity_words_are_kept():
+    """'com' e 'sem' mudam o sentido: não são stopwords"""
+    assert 'com' in query_tokens('franquia com royalties')
+    assert 'sem' in query_tokens('franquia sem royalties')
+    assert normalize_query('franquia com royalties') != normalize_query('franquia sem royalties')
+
+def test_normalize_falls_back_when_only_stopwords():
+    assert normalize_query('  De  A  ') == 'de a'
+    assert normalize_query('') == ''
+
+def test_jaccard_similarity():
+    first = frozenset(['mercado', 'pet', 'brasil'])
+    assert jaccard_similarity(first, first) == 1.0
+    assert jaccard_similarity(first, frozenset(['mercado', 'pet'])) == 2 / 3
+    assert jaccard_similarity(first, frozenset()) == 0.0
+
+def test_find_similar_respects_threshold_and_namespace():
+    index = QuerySimilarityIndex()
+    stored = normalize_query('tendencias mercado pet brasil 2024')
+    index.add('serper', stored)
+
+    query = normalize_query('tendencias mercado pet brasil')
+    assert index.find_similar('serper', query, 0.8) == stored
+    assert index.find_similar('serper', query, 0.9) is None
+    assert index.find_similar('bing', query, 0.5) is None
+    # A própria query não conta como similar
+    assert index.find_similar('serper', stored, 0.5) is None
+
+def test_find_similar_requires_same_polarity():
+    index = QuerySimilarityIndex()
+    index.add('serper', normalize_query('franquia barata com royalties baixos brasil'))
+    query = normalize_query('franquia barata sem royalties baixos brasil')
+    assert index.find_similar('serper', query, 0.5) is None
+
+def test_index_evicts_oldest_entries():
+    index = QuerySimilarityIndex(max_entries=2)
+    for query in ('mercado pet', 'mercado fitness', 'mercado moda'):
+        index.add('bing', normalize_query(query))
+
+    assert len(index) == 2
+    # 'mercado pet' (a mais antiga) saiu: nada passa do limiar
+    assert index.find_similar('bing', normalize_query('mercado pet sp'), 0.3) is None
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Teste do Rate Limiter
+Janelas deslizantes em buckets compartilhadas via SQLite
+"""
+
+import os
+import sys
+import tempfile
+
+# Adiciona o diretório src ao path; bancos de coordenação em diretório temporário
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('COORDINATION_DB_PATH', os.path.join(tempfile.mkdtemp(), 'coordination.db'))
+
+import pytest
+
+from services import rate_limiter as rate_limiter_module
+from services.rate_limiter import SlidingWindowRateLimiter
+
+class FakeClock:
+    """Substitui o módulo time do rate limiter por um relógio controlado"""
+
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter_module, 'time', fake)
+    return fake
+
+@pytest.fixture
+def limiter(tmp_path):
+    return SlidingWindowRateLimiter(db_path=str(tmp_path / 'coord.db'))
+
+def test_unconfigured_provider_is_free(limiter, clock):
+    assert all(limiter.acquire('livre') == 0.0 for _ in range(100))
+    assert limiter.time_until_available('livre') == 0.0
+
+def test_limit_is_enforced_within_the_window(limiter, clock):
+    limiter.configure('serper', {'minute': 3})
+    assert [limiter.acquire('serper') for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    wait = limiter.acquire('serper')
+    assert 0 < wait <= 60 + 1  # no máximo a janela mais um bucket
+    assert limiter.usage('serper')['minute'] == {'used': 3, 'limit': 3, 'remaining': 0}
+
+def test_time_until_available_does_not_consume(limiter, clock):
+    limiter.configure('serper', {'minute': 1})
+    for _ in range(5):
+        assert limiter.time_until_available('serper') == 0.0
+    assert limiter.acquire('serper') == 0.0
+    assert limiter.time_until_available('serper') > 0
+
+def test_window_slides(limiter, clock):
+    """A vaga volta quando o bucket da requisição antiga sai da janela"""
+    limiter.configure('bing', {'minute': 2})
+    limiter.acquire('bing')
+    clock.now += 30
+    limiter.acquire('bing')
+    wait = limiter.acquire('bing')
+    assert wait > 0
+
+    clock.now += wait
+    assert limiter.acquire('bing') == 0.0
+    # A segunda requisição (30s depois) ainda ocupa a janela
+    assert limiter.acquire('bing') > 0
+
+def test_tightest_window_wins(limiter, clock):
+    limiter.configure('google', {'minute': 10, 'day': 2})
+    limiter.acquire('google')
+    limiter.acquire('google')
+    clock.now += 120  # janela por minuto já livre
+
+    wait = limiter.acquire('google')
+    assert wait > 3600  # bloqueado pela janela diária
+    usage = limiter.usage('google')
+    assert usage['minute']['remaining'] == 10
+    assert usage['day']['remaining'] == 0
+
+def test_counts_are_shared_between_instances(tmp_path, clock):
+    """Dois workers com o mesmo banco dividem a mesma quota"""
+    db_path = str(tmp_path / 'coord.db')
+    first = SlidingWindowRateLimiter(db_path=db_path)
+    second = SlidingWindowRateLimiter(db_path=db_path)
+    for limiter in (first, second):
+        limiter.configure('serper', {'minute': 2})
+
+    assert first.acquire('serper') == 0.0
+    assert second.acquire('serper') == 0.0
+    assert first.acquire('serper') > 0
+
+def test_unknown_window_is_rejected(limiter):
+    with pytest.raises(ValueError):
+        limiter.configure('serper', {'semana': 10})
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Teste do Result Ranker
+Fusão por Reciprocal Rank Fusion com concordância entre provedores e rendimento do domínio
+"""
+
+import os
+import sys
+import tempfile
+
+# Adiciona o diretório src ao path; bancos de coordenação em diretório temporário
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('COORDINATION_DB_PATH', os.path.join(tempfile.mkdtemp(), 'coordination.db'))
+
+import pytest
+
+from services.domain_yield import url_domain
+from services.result_ranker import ResultRanker, url_key
+
+class FakeTracker:
+    """Rendimento por domínio fixo (0.5 = neutro)"""
+
+    def __init__(self, yields=None):
+        self.yields = yields or {}
+
+    def get_yields(self, urls):
+        return {url_domain(url): self.yields[url_domain(url)] for url in urls if url_domain(url) in self.yields}
+
+def _result(url, title='t'):
+    return {'url': url, 'title': title, 'snippet': ''}
+
+@pytest.fixture
+def ranker():
+    ranker = ResultRanker(tracker=FakeTracker())
+    ranker.k = 60
+    ranker.agreement_boost = 0.25
+    return ranker
+
+def test_url_key_ignores_scheme_www_fragment_and_trailing_slash():
+    assert url_key('https://www.exemplo.com/a/') == url_key('http://exemplo.com/a#topo')
+    assert url_key('https://exemplo.com/a?p=1') != url_key('https://exemplo.com/a?p=2')
+
+def test_single_provider_keeps_its_order(ranker):
+    ranked = ranker.fuse({'bing': [_result('https://a.com/1'), _result('https://b.com/2'), _result('https://c.com/3')]})
+    assert [r['url'] for r in ranked] == ['https://a.com/1', 'https://b.com/2', 'https://c.com/3']
+    assert ranked[0]['relevance_score'] == round(1 / 61 * 100, 4)
+
+def test_agreement_between_providers_wins(ranker):
+    """Resultado em 2º lugar em dois provedores supera o 1º lugar de um só"""
+    ranked = ranker.fuse({
+        'bing': [_result('https://sozinho.com/x'), _result('https://comum.com/y')],
+        'serper': [_result('https://outro.com/z'), _result('https://www.comum.com/y/')]
+    })
+
+    assert ranked[0]['url'] == 'https://comum.com/y'
+    assert ranked[0]['found_by'] == ['bing', 'serper']
+    assert ranked[0]['relevance_score'] == round(2 / 62 * 1.25 * 100, 4)
+    assert len(ranked) == 3
+
+def test_duplicates_within_one_provider_count_once(ranker):
+    ranked = ranker.fuse({'bing': [_result('https://a.com/1'), _result('https://a.com/1/')]})
+    assert len(ranked) == 1
+    assert ranked[0]['found_by'] == ['bing']
+    assert ranked[0]['relevance_score'] == round(1 / 61 * 100, 4)
+
+def test_domain_yield_reorders_results():
+    ranker = ResultRanker(tracker=FakeTracker({'paywall.com': 0.0, 'aberto.com': 1.0}))
+    ranked = ranker.fuse({'bing': [_result('https://paywall.com/1'), _result('https://aberto.com/2')]})
+    assert [r['url'] for r in ranked] == ['https://aberto.com/2', 'https://paywall.com/1']
+
+def test_inputs_are_not_mutated(ranker):
+    """Listas vindas do cache em memória são compartilhadas: o ranking trabalha em cópias"""
+    cached = [_result('https://a.com/1')]
+    ranker.fuse({'bing': cached})
+    assert 'relevance_score' not in cached[0]
+    assert 'found_by' not in cached[0]
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Teste do Cache de Busca
+Expiração e despejo do cache em duas camadas (memória LRU + SQLite)
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Adiciona o diretório src ao path; bancos de coordenação em diretório temporário
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('COORDINATION_DB_PATH', os.path.join(tempfile.mkdtemp(), 'coordination.db'))
+
+from services.search_cache import LRUCache, ProductionSearchCache
+
+RESULTS = [{'title': 'Franquias', 'url': 'https://exemplo.com/a', 'snippet': ''}]
+
+def test_lru_evicts_least_recently_used():
+    """Acesso recente protege a entrada do despejo"""
+    lru = LRUCache(2)
+    lru.set('a', 1, time.time() + 60)
+    lru.set('b', 2, time.time() + 60)
+    lru.get('a')
+    lru.set('c', 3, time.time() + 60)
+
+    assert lru.get('b') is None
+    assert lru.get('a')[0] == 1
+    assert lru.get('c')[0] == 3
+
+def test_memory_hit_and_expiry(tmp_path):
+    """Entrada vencida na memória não é servida e conta como expirada"""
+    cache = ProductionSearchCache(cache_dir=str(tmp_path))
+    cache.set('franquia de café', RESULTS, 'serper', ttl=60)
+    assert cache.get('franquia de café', 'serper') == RESULTS
+
+    cache.set('franquia de café', RESULTS, 'serper', ttl=0)
+    cache.flush()
+    assert cache.get('franquia de café', 'serper') is None
+    assert cache.get_stats()['expired'] >= 1
+
+def test_disk_tier_serves_after_memory_is_cleared(tmp_path):
+    """Depois do flush a entrada sobrevive à perda da memória (outro worker, reinício)"""
+    cache = ProductionSearchCache(cache_dir=str(tmp_path))
+    cache.set('mercado pet', RESULTS, 'bing', ttl=60)
+    cache.flush()
+    cache.memory.clear()
+
+    assert cache.get('mercado pet', 'bing') == RESULTS
+    assert cache.get_stats()['disk_hits'] == 1
+    # Promovida para a memória no acerto em disco
+    assert len(cache.memory) == 1
+
+def test_cleanup_removes_only_expired_rows(tmp_path):
+    cache = ProductionSearchCache(cache_dir=str(tmp_path))
+    cache.set('vencida', RESULTS, 'bing', ttl=0)
+    cache.set('valida', RESULTS, 'bing', ttl=60)
+    cache.flush()
+
+    assert cache.cleanup_expired() == 1
+    rows = cache.store.execute("SELECT query FROM search_cache_v2").fetchall()
+    assert [row[0] for row in rows] == ['valida']
+
+def test_enforce_limits_evicts_least_recently_accessed(tmp_path):
+    """Acima de max_rows sai a linha com last_accessed mais antigo"""
+    cache = ProductionSearchCache(cache_dir=str(tmp_path))
+    cache.max_rows = 2
+    for query in ('primeira', 'segunda', 'terceira'):
+        cache.set(query, RESULTS, 'bing', ttl=60)
+    cache.flush()
+    cache.store.execute("UPDATE search_cache_v2 SET last_accessed = 0 WHERE query = 'segunda'")
+
+    assert cache.enforce_limits() == 1
+    remaining = {row[0] for row in cache.store.execute("SELECT query FROM search_cache_v2").fetchall()}
+    assert remaining == {'primeira', 'terceira'}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Teste do Search Planner
+Orçamento de quota e folga da janela por minuto na distribuição de queries
+"""
+
+import os
+import sys
+import tempfile
+
+# Adiciona o diretório src ao path; bancos de coordenação em diretório temporário
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('COORDINATION_DB_PATH', os.path.join(tempfile.mkdtemp(), 'coordination.db'))
+
+from services.search_planner import SearchPlanner
+
+class FakeSearchManager:
+    """Manager mínimo com quotas, folgas e cache controlados pelo teste"""
+
+    def __init__(self, remaining, headroom=None, cached=(), yields=None):
+        self.remaining = remaining
+        self.headroom = headroom or {}
+        self.cached = set(cached)
+        self.yields = yields or {}
+
+    def get_plannable_providers(self):
+        return list(self.remaining)
+
+    def get_remaining_quota(self, name):
+        return self.remaining[name]
+
+    def get_minute_headroom(self, name):
+        return self.headroom.get(name)
+
+    def get_expected_yield(self, name):
+        return self.yields.get(name, 5)
+
+    def has_cached_results(self, query, name):
+        return (query, name) in self.cached
+
+def _queries(count):
+    return [f'query {i}' for i in range(count)]
+
+def test_free_providers_come_first():
+    manager = FakeSearchManager({'serper': 100, 'bing': None})
+    plan = SearchPlanner(manager).plan(['mercado pet'], target_results=5)
+    assert plan.providers_for('mercado pet') == ['bing']
+
+def test_paid_usage_is_capped_by_quota_share():
+    manager = FakeSearchManager({'serper': 20})
+    plan = SearchPlanner(manager).plan(_queries(10), target_results=5, max_share=0.25)
+
+    assert plan.budget == {'serper': 5}
+    assert plan.projected_usage == {'serper': 5}
+    assert plan.underserved_queries == 5
+
+def test_interactive_plan_keeps_one_call_at_the_end_of_quota():
+    manager = FakeSearchManager({'serper': 2})
+    planner = SearchPlanner(manager)
+
+    assert planner.plan(_queries(3), target_results=5, max_share=0.25).projected_usage == {'serper': 1}
+    assert planner.plan(_queries(3), target_results=5, max_share=0.25, interactive=False).projected_usage == {}
+
+def test_minute_headroom_caps_every_provider():
+    """Nem provedores sem quota recebem mais buscas do que cabem na janela por minuto"""
+    manager = FakeSearchManager({'serper': 1000, 'bing': None}, headroom={'serper': 2, 'bing': 3})
+    plan = SearchPlanner(manager).plan(_queries(6), target_results=10, max_share=1.0)
+
+    assert plan.projected_usage == {'serper': 2, 'bing': 3}
+    assert plan.minute_headroom == {'serper': 2, 'bing': 3}
+
+def test_cached_providers_are_not_planned_again():
+    manager = FakeSearchManager({'serper': 100, 'bing': None}, cached=[('mercado pet', 'bing')])
+    plan = SearchPlanner(manager).plan(['mercado pet'], target_results=5)
+
+    assignment = plan.assignments[0]
+    assert assignment.cached_providers == ['bing']
+    assert assignment.providers == []
+    assert assignment.expected_results == 5
+
+def test_cache_peek_has_no_side_effects(tmp_path):
+    """O planejamento consulta o cache (contains) sem contar hits/misses nem promover entradas"""
+    from services.search_cache import ProductionSearchCache
+
+    cache = ProductionSearchCache(cache_dir=str(tmp_path))
+    cache.set('tendencias mercado pet brasil 2024 racao premium', [{'url': 'https://exemplo.com'}], 'serper', ttl=60)
+    cache.flush()
+    cache.memory.clear()
+    before = cache.get_stats()
+
+    assert cache.contains('tendencias mercado pet brasil 2024 racao premium', 'serper')
+    assert cache.contains('Tendências mercado pet Brasil ração premium', 'serper')  # aproximada
+    assert not cache.contains('franquias de moda', 'serper')
+    assert cache.get_stats() == before
+    assert len(cache.memory) == 0
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Teste do Single Flight
+Coalescência de chamadas concorrentes (threads e workers via SQLite)
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+
+# Adiciona o diretório src ao path; bancos de coordenação em diretório temporário
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('COORDINATION_DB_PATH', os.path.join(tempfile.mkdtemp(), 'coordination.db'))
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+def _run_concurrently(flight, key, fn, count):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do(key, fn))) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+def test_concurrent_calls_run_once(tmp_path):
+    flight = SingleFlight('teste', db_path=str(tmp_path / 'coord.db'))
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return ['resultado']
+
+    results = _run_concurrently(flight, 'mercado pet', slow, 5)
+
+    assert len(calls) == 1
+    assert results == [['resultado']] * 5
+    stats = flight.get_stats()
+    assert stats['leader'] == 1
+    assert stats['local_followers'] == 4
+
+def test_different_keys_are_not_coalesced(tmp_path):
+    flight = SingleFlight('teste', db_path=str(tmp_path / 'coord.db'))
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('b', lambda: 2) == 2
+    assert flight.get_stats()['leader'] == 2
+
+def test_leader_error_reaches_followers(tmp_path):
+    flight = SingleFlight('teste', db_path=str(tmp_path / 'coord.db'))
+    started = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        time.sleep(0.2)
+        raise ValueError('falhou')
+
+    def follower():
+        started.wait(1)
+        try:
+            flight.do('chave', lambda: 'não deveria rodar')
+        except ValueError as e:
+            errors.append(str(e))
+
+    thread = threading.Thread(target=follower)
+    thread.start()
+    with pytest.raises(ValueError):
+        flight.do('chave', failing)
+    thread.join(5)
+
+    assert errors == ['falhou']
+    # Falha não fica publicada: a próxima chamada executa de novo
+    assert flight.do('chave', lambda: 'ok') == 'ok'
+
+def test_result_is_shared_between_workers(tmp_path):
+    """Outra instância (outro worker) com o mesmo banco recebe o resultado publicado"""
+    db_path = str(tmp_path / 'coord.db')
+    first = SingleFlight('busca', db_path=db_path)
+    second = SingleFlight('busca', db_path=db_path)
+
+    assert first.do('franquias', lambda: {'total': 3}) == {'total': 3}
+    assert second.do('franquias', lambda: {'total': 99}) == {'total': 3}
+    assert second.get_stats()['shared_followers'] == 1